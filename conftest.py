@@ -9,29 +9,49 @@ Includes pytest-html report customization hooks.
 import os
 import html as html_lib
 from datetime import datetime
+from functools import lru_cache
 
 import pytest
 from playwright.sync_api import Page
+from pytest_html import extras as pytest_extras
 
 from pages.register_page import RegisterPage
 from pages.login_page import LoginPage
 from pages.forgot_password_page import ForgotPasswordPage
 from pages.dashboard_page import DashboardPage
 from utils.test_data import random_email
+from plugins.metadata import item_bug_id, item_category, item_description, item_doc
+
+pytest_plugins = [
+    "plugins.history",
+    "plugins.selection",
+    "plugins.incremental",
+    "plugins.journal",
+    "plugins.stream_report",
+    "plugins.capture",
+    "plugins.report_extras",
+    "plugins.journeys",
+    "plugins.tracing",
+    "plugins.screenshots",
+    "plugins.timing",
+    "plugins.timeouts",
+    "plugins.devices",
+    "plugins.stand_in",
+    "plugins.soak",
+    "plugins.caching",
+    "plugins.profiling",
+    "plugins.memory",
+    "plugins.browser_server",
+    "plugins.watch",
+    "plugins.impact",
+    "plugins.tabs",
+    "plugins.matrix",
+    "plugins.fleet",
+    "plugins.shard",
+]
 
 BASE_URL = "https://qa-test-web-app.vercel.app"
 
-# Category mapping from test file to display name
-CATEGORY_MAP = {
-    "test_registration": "Registration",
-    "test_login": "Login",
-    "test_forgot_password": "Forgot Password",
-    "test_dashboard": "Dashboard",
-    "test_responsive": "Responsive Design",
-    "test_api": "API",
-    "test_security": "Security",
-}
-
 
 # ──────────────────────────────────────────────
 # PYTEST-HTML REPORT CUSTOMIZATION
@@ -39,9 +59,13 @@ CATEGORY_MAP = {
 
 
 def pytest_configure(config):
-    """Auto-create reports directory and set timestamped report filename."""
+    """Auto-create reports directory and set timestamped report filename.
+
+    Only the default report path from pytest.ini is timestamped; an explicit
+    --html path (e.g. a fleet worker's) is kept.
+    """
     os.makedirs("reports", exist_ok=True)
-    if hasattr(config.option, "htmlpath") and config.option.htmlpath:
+    if getattr(config.option, "htmlpath", None) == "reports/report.html":
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         config.option.htmlpath = f"reports/report_{timestamp}.html"
 
@@ -51,43 +75,41 @@ def pytest_html_report_title(report):
     report.title = "QA Test Application - Test Report"
 
 
+@lru_cache(maxsize=None)
+def _doc_extra_html(doc: str) -> str:
+    """Escaped "Test Details" block, built once per distinct docstring."""
+    return (
+        '<div class="test-doc">'
+        "<strong>Test Details:</strong><br>"
+        f"<pre>{html_lib.escape(doc)}</pre>"
+        "</div>"
+    )
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Extract test docstring and category for report columns."""
     outcome = yield
     report = outcome.get_result()
 
-    # Extract docstring
-    doc = getattr(item.function, "__doc__", "") or ""
-    first_line = doc.strip().split("\n")[0] if doc.strip() else ""
-    report.description = first_line
+    # Extract docstring (parsed once per test function, see plugins.metadata)
+    doc = item_doc(item)
+    report.description = item_description(item)
 
     # Store full docstring for expanded detail
-    report.description_full = doc.strip() if doc.strip() else ""
+    report.description_full = doc
 
-    # Extract category from file name
-    file_name = item.location[0] if hasattr(item, "location") else ""
-    for key, label in CATEGORY_MAP.items():
-        if key in str(file_name):
-            report.category = label
-            break
-    else:
-        report.category = "Other"
+    # Extract category from file name (see plugins.metadata.CATEGORY_MAP)
+    report.category = item_category(item)
 
-    # Add full docstring as extra HTML in the expanded section
-    if report.when == "call" and doc.strip():
-        from pytest_html import extras as pytest_extras
+    # Extract BUG catalog id referenced by the test, if any
+    report.bug_id = item_bug_id(item)
 
+    # Add full docstring as extra HTML in the expanded section
+    # (not needed when pytest-html is off, e.g. in --report-stream mode)
+    if report.when == "call" and doc and item.config.option.htmlpath:
         extra_list = getattr(report, "extras", [])
-        escaped_doc = html_lib.escape(doc.strip())
-        extra_list.append(
-            pytest_extras.html(
-                '<div class="test-doc">'
-                "<strong>Test Details:</strong><br>"
-                f"<pre>{escaped_doc}</pre>"
-                "</div>"
-            )
-        )
+        extra_list.append(pytest_extras.html(_doc_extra_html(doc)))
         report.extras = extra_list
 
 
@@ -0,0 +1,44 @@
+from playwright.async_api import Page
+
+from pages.base_page import LOAD_METRICS_SCRIPT
+
+
+def locators_of(sync_class):
+    """Class decorator: share URL and locator constants with the sync page object."""
+
+    def decorate(cls):
+        for name, value in vars(sync_class).items():
+            if name.isupper():
+                setattr(cls, name, value)
+        return cls
+
+    return decorate
+
+
+class BasePage:
+    """Async base page object with common methods."""
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    async def navigate(self, url: str):
+        await self.page.goto(url)
+        await self.page.wait_for_load_state("networkidle")
+
+    async def get_title(self) -> str:
+        return await self.page.title()
+
+    async def get_url(self) -> str:
+        return self.page.url
+
+    async def get_element_text(self, selector: str) -> str:
+        return await self.page.locator(selector).text_content() or ""
+
+    async def is_visible(self, selector: str) -> bool:
+        return await self.page.locator(selector).is_visible()
+
+    async def wait_for_url(self, url_pattern: str, timeout: int = 5000):
+        await self.page.wait_for_url(url_pattern, timeout=timeout)
+
+    async def get_load_metrics(self) -> dict:
+        return await self.page.evaluate(LOAD_METRICS_SCRIPT)
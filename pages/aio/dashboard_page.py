@@ -0,0 +1,53 @@
+"""Async page object for the Dashboard page (dashboard.html)."""
+
+from pages.dashboard_page import DashboardPage as SyncDashboardPage
+from pages.aio.base_page import BasePage, locators_of
+
+
+@locators_of(SyncDashboardPage)
+class DashboardPage(BasePage):
+    """Async counterpart of pages.dashboard_page.DashboardPage."""
+
+    async def open(self):
+        await self.navigate(self.URL)
+        return self
+
+    async def get_user_name(self) -> str:
+        return await self.get_element_text(self.USER_NAME)
+
+    async def get_last_login(self) -> str:
+        return await self.get_element_text(self.LAST_LOGIN)
+
+    async def click_logout(self):
+        await self.page.click(self.LOGOUT_BUTTON)
+        await self.page.wait_for_timeout(500)
+
+    async def get_stat_card_count(self) -> int:
+        return await self.page.locator(self.STAT_CARDS).count()
+
+    async def get_action_button_count(self) -> int:
+        return await self.page.locator(self.ACTION_BUTTONS).count()
+
+    async def get_activity_count(self) -> int:
+        return await self.page.locator(self.ACTIVITY_LIST).count()
+
+    async def get_notifications_count(self) -> str:
+        return await self.get_element_text(self.NOTIFICATIONS)
+
+    async def click_action_button(self, index: int):
+        await self.page.locator(self.ACTION_BUTTONS).nth(index).click()
+        await self.page.wait_for_timeout(500)
+
+    async def get_toast_message(self) -> str:
+        return await self.get_element_text(self.DASHBOARD_MESSAGE)
+
+    async def is_toast_visible(self) -> bool:
+        return await self.is_visible(self.DASHBOARD_MESSAGE)
+
+    async def get_session_storage_keys(self) -> list[str]:
+        """Get all sessionStorage keys via JavaScript."""
+        return await self.page.evaluate("() => Object.keys(sessionStorage)")
+
+    async def get_local_storage_keys(self) -> list[str]:
+        """Get all localStorage keys via JavaScript."""
+        return await self.page.evaluate("() => Object.keys(localStorage)")
@@ -0,0 +1,57 @@
+"""Async page object for the Forgot Password page (forgot-password.html)."""
+
+from pages.forgot_password_page import ForgotPasswordPage as SyncForgotPasswordPage
+from pages.aio.base_page import BasePage, locators_of
+
+
+@locators_of(SyncForgotPasswordPage)
+class ForgotPasswordPage(BasePage):
+    """Async counterpart of pages.forgot_password_page.ForgotPasswordPage."""
+
+    async def open(self):
+        await self.navigate(self.URL)
+        return self
+
+    async def fill_email(self, value: str):
+        await self.page.fill(self.RESET_EMAIL, value)
+        return self
+
+    async def select_security_question(self, value: str):
+        await self.page.select_option(self.SECURITY_QUESTION, value)
+        return self
+
+    async def fill_security_answer(self, value: str):
+        await self.page.fill(self.SECURITY_ANSWER, value)
+        return self
+
+    async def click_send_reset(self):
+        await self.page.click(self.SUBMIT_BUTTON)
+        await self.page.wait_for_timeout(500)
+        return self
+
+    async def click_login_link(self):
+        await self.page.click(self.LOGIN_LINK)
+
+    async def click_register_link(self):
+        await self.page.click(self.REGISTER_LINK)
+
+    async def get_message(self) -> str:
+        return await self.get_element_text(self.FORGOT_PASSWORD_MESSAGE)
+
+    async def has_success_message(self) -> bool:
+        msg = self.page.locator(self.FORGOT_PASSWORD_MESSAGE)
+        return await msg.is_visible() and "success" in (await msg.get_attribute("class") or "")
+
+    async def has_error_message(self) -> bool:
+        msg = self.page.locator(self.FORGOT_PASSWORD_MESSAGE)
+        return await msg.is_visible() and "error" in (await msg.get_attribute("class") or "")
+
+    async def get_email_error(self) -> str:
+        return await self.get_element_text(self.RESET_EMAIL_ERROR)
+
+    async def get_email_input_type(self) -> str:
+        return await self.page.locator(self.RESET_EMAIL).get_attribute("type") or ""
+
+    async def get_security_question_options(self) -> list[str]:
+        """Return all option values from the security question dropdown."""
+        return await self.page.locator(f"{self.SECURITY_QUESTION} option").all_text_contents()
@@ -0,0 +1,60 @@
+"""Async page object for the Login page (index.html)."""
+
+from pages.login_page import LoginPage as SyncLoginPage
+from pages.aio.base_page import BasePage, locators_of
+
+
+@locators_of(SyncLoginPage)
+class LoginPage(BasePage):
+    """Async counterpart of pages.login_page.LoginPage."""
+
+    async def open(self):
+        await self.navigate(self.URL)
+        return self
+
+    async def fill_email(self, value: str):
+        await self.page.fill(self.LOGIN_EMAIL, value)
+        return self
+
+    async def fill_password(self, value: str):
+        await self.page.fill(self.LOGIN_PASSWORD, value)
+        return self
+
+    async def check_remember_me(self):
+        await self.page.check(self.REMEMBER_ME)
+        return self
+
+    async def click_login(self):
+        await self.page.click(self.LOGIN_BUTTON)
+        await self.page.wait_for_timeout(500)
+        return self
+
+    async def click_forgot_password(self):
+        await self.page.click(self.FORGOT_PASSWORD_LINK)
+
+    async def click_register(self):
+        await self.page.click(self.REGISTER_LINK)
+
+    async def login(self, email: str, password: str):
+        """Fill credentials and submit login form."""
+        await self.fill_email(email)
+        await self.fill_password(password)
+        await self.click_login()
+        return self
+
+    async def get_login_message(self) -> str:
+        return await self.get_element_text(self.LOGIN_MESSAGE)
+
+    async def has_success_message(self) -> bool:
+        msg = self.page.locator(self.LOGIN_MESSAGE)
+        return await msg.is_visible() and "success" in (await msg.get_attribute("class") or "")
+
+    async def has_error_message(self) -> bool:
+        msg = self.page.locator(self.LOGIN_MESSAGE)
+        return await msg.is_visible() and "error" in (await msg.get_attribute("class") or "")
+
+    async def get_email_error(self) -> str:
+        return await self.get_element_text(self.LOGIN_EMAIL_ERROR)
+
+    async def get_email_input_type(self) -> str:
+        return await self.page.locator(self.LOGIN_EMAIL).get_attribute("type") or ""
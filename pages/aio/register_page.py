@@ -0,0 +1,146 @@
+"""Async page object for the Registration page (register.html)."""
+
+from pages.register_page import RegisterPage as SyncRegisterPage
+from pages.aio.base_page import BasePage, locators_of
+
+
+@locators_of(SyncRegisterPage)
+class RegisterPage(BasePage):
+    """Async counterpart of pages.register_page.RegisterPage."""
+
+    async def open(self):
+        await self.navigate(self.URL)
+        return self
+
+    async def fill_first_name(self, value: str):
+        await self.page.fill(self.FIRST_NAME, value)
+        return self
+
+    async def fill_last_name(self, value: str):
+        await self.page.fill(self.LAST_NAME, value)
+        return self
+
+    async def fill_email(self, value: str):
+        await self.page.fill(self.EMAIL, value)
+        return self
+
+    async def fill_phone(self, value: str):
+        await self.page.fill(self.PHONE, value)
+        return self
+
+    async def fill_address(self, value: str):
+        await self.page.fill(self.ADDRESS, value)
+        return self
+
+    async def fill_city(self, value: str):
+        await self.page.fill(self.CITY, value)
+        return self
+
+    async def fill_zip_code(self, value: str):
+        await self.page.fill(self.ZIP_CODE, value)
+        return self
+
+    async def fill_password(self, value: str):
+        await self.page.fill(self.PASSWORD, value)
+        return self
+
+    async def fill_confirm_password(self, value: str):
+        await self.page.fill(self.CONFIRM_PASSWORD, value)
+        return self
+
+    async def check_terms(self):
+        await self.page.check(self.TERMS_CHECKBOX)
+        return self
+
+    async def uncheck_terms(self):
+        await self.page.uncheck(self.TERMS_CHECKBOX)
+        return self
+
+    async def check_newsletter(self):
+        await self.page.check(self.NEWSLETTER_CHECKBOX)
+        return self
+
+    async def click_submit(self):
+        await self.page.click(self.SUBMIT_BUTTON)
+        return self
+
+    async def click_login_link(self):
+        await self.page.click(self.LOGIN_LINK)
+
+    async def fill_registration_form(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str,
+        phone: str,
+        address: str,
+        city: str,
+        zip_code: str,
+        password: str,
+        confirm_password: str,
+        accept_terms: bool = True,
+        subscribe_newsletter: bool = False,
+    ):
+        await self.fill_first_name(first_name)
+        await self.fill_last_name(last_name)
+        await self.fill_email(email)
+        await self.fill_phone(phone)
+        await self.fill_address(address)
+        await self.fill_city(city)
+        await self.fill_zip_code(zip_code)
+        await self.fill_password(password)
+        await self.fill_confirm_password(confirm_password)
+        if accept_terms:
+            await self.check_terms()
+        if subscribe_newsletter:
+            await self.check_newsletter()
+        return self
+
+    async def submit_registration(self):
+        await self.click_submit()
+        await self.page.wait_for_timeout(500)
+        return self
+
+    # Getters for error messages
+    async def get_email_error(self) -> str:
+        return await self.get_element_text(self.EMAIL_ERROR)
+
+    async def get_phone_error(self) -> str:
+        return await self.get_element_text(self.PHONE_ERROR)
+
+    async def get_zip_error(self) -> str:
+        return await self.get_element_text(self.ZIP_ERROR)
+
+    async def get_password_error(self) -> str:
+        return await self.get_element_text(self.PASSWORD_ERROR)
+
+    async def get_confirm_password_error(self) -> str:
+        return await self.get_element_text(self.CONFIRM_PASSWORD_ERROR)
+
+    async def get_register_message(self) -> str:
+        return await self.get_element_text(self.REGISTER_MESSAGE)
+
+    async def is_register_message_visible(self) -> bool:
+        return await self.is_visible(self.REGISTER_MESSAGE)
+
+    async def has_success_message(self) -> bool:
+        msg = self.page.locator(self.REGISTER_MESSAGE)
+        return await msg.is_visible() and "success" in (await msg.get_attribute("class") or "")
+
+    async def has_error_message(self) -> bool:
+        msg = self.page.locator(self.REGISTER_MESSAGE)
+        return await msg.is_visible() and "error" in (await msg.get_attribute("class") or "")
+
+    async def get_field_validation_message(self, field_selector: str) -> str:
+        return await self.page.locator(field_selector).evaluate(
+            "el => el.validationMessage"
+        )
+
+    async def is_field_required(self, field_selector: str) -> bool:
+        return await self.page.locator(field_selector).evaluate("el => el.required")
+
+    async def get_email_input_type(self) -> str:
+        return await self.page.locator(self.EMAIL).get_attribute("type") or ""
+
+    async def get_password_input_type(self) -> str:
+        return await self.page.locator(self.PASSWORD).get_attribute("type") or ""
@@ -1,5 +1,20 @@
 from playwright.sync_api import Page
 
+# Navigation + Resource Timing of the current document. transferSize is 0
+# for a response served from the HTTP cache (and for cross-origin
+# resources without Timing-Allow-Origin, whose body size is 0 as well).
+LOAD_METRICS_SCRIPT = """() => {
+    const [navigation] = performance.getEntriesByType("navigation");
+    const entries = [navigation, ...performance.getEntriesByType("resource")].filter(Boolean);
+    return {
+        requests: entries.length,
+        transferred: entries.reduce((sum, entry) => sum + entry.transferSize, 0),
+        from_cache: entries.filter(entry => entry.transferSize === 0 && entry.decodedBodySize > 0).length,
+        dcl_ms: navigation ? Math.round(navigation.domContentLoadedEventEnd - navigation.startTime) : null,
+        load_ms: navigation ? Math.round(navigation.loadEventEnd - navigation.startTime) : null,
+    };
+}"""
+
 
 class BasePage:
     """Base page object with common methods."""
@@ -25,3 +40,7 @@ class BasePage:
 
     def wait_for_url(self, url_pattern: str, timeout: int = 5000):
         self.page.wait_for_url(url_pattern, timeout=timeout)
+
+    def get_load_metrics(self) -> dict:
+        """Requests, transferred bytes, cache hits and load timings of the current page."""
+        return self.page.evaluate(LOAD_METRICS_SCRIPT)
@@ -0,0 +1,224 @@
+"""
+Concurrency autotuning for the tab runner (`--tabs auto`).
+
+Instead of a fixed number of concurrent tabs, the run starts low and
+climbs one tab at a time. Each step is measured over a window of
+finished tests:
+
+    throughput     tests finished per second
+    latency        mean duration of those tests
+    failure rate   share of those tests that failed
+    CPU            busy share of all cores (/proc/stat, or the load average)
+    memory         available share of RAM (/proc/meminfo)
+
+The level goes up while throughput keeps improving, and back down when
+throughput drops, CPU or memory run out, or more tests fail than at the
+lowest level (a sign of timeouts from an overloaded machine). After a
+step back the best level - the highest throughput among the windows
+that did not overload - is kept for the rest of the run, as it is once
+`TUNE_SHARE` of the tests have finished. The chosen level and all
+windows go in the summary and the HTML report.
+"""
+
+import html
+import os
+import time
+
+START_LEVEL = 2
+
+# Stop tuning and hold the best level after this share of the tests
+TUNE_SHARE = 0.5
+
+# A window needs this many finished tests per tab, and at least MIN_WINDOW seconds
+WINDOW_TESTS_PER_TAB = 2
+MIN_WINDOW = 2.0
+
+# Relative throughput change that counts as better or worse
+THROUGHPUT_MARGIN = 0.05
+
+MAX_CPU = 0.90
+MIN_MEMORY = 0.10
+
+# Failure rate allowed above the lowest level's before backing off
+FAILURE_MARGIN = 0.10
+
+
+def default_max_level() -> int:
+    return max(2, (os.cpu_count() or 2) * 2)
+
+
+class ResourceSampler:
+    """CPU busy share since the last sample and available memory share."""
+
+    def __init__(self):
+        self.last = self._cpu_times()
+
+    @staticmethod
+    def _cpu_times() -> tuple[int, int] | None:
+        try:
+            with open("/proc/stat", encoding="ascii") as f:
+                fields = [int(v) for v in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        # idle + iowait
+        return sum(fields), fields[3] + (fields[4] if len(fields) > 4 else 0)
+
+    def cpu(self) -> float | None:
+        current = self._cpu_times()
+        if current is None:
+            try:
+                return min(1.0, os.getloadavg()[0] / (os.cpu_count() or 1))
+            except (OSError, AttributeError):
+                return None
+        previous, self.last = self.last, current
+        total = current[0] - previous[0]
+        return (total - (current[1] - previous[1])) / total if total > 0 else None
+
+    @staticmethod
+    def memory_available() -> float | None:
+        values = {}
+        try:
+            with open("/proc/meminfo", encoding="ascii") as f:
+                for line in f:
+                    key, value = line.split(":", 1)
+                    values[key] = int(value.split()[0])
+        except (OSError, ValueError):
+            return None
+        if "MemAvailable" not in values or not values.get("MemTotal"):
+            return None
+        return values["MemAvailable"] / values["MemTotal"]
+
+
+class Window:
+    def __init__(self, level: int, started: float):
+        self.level = level
+        self.started = started
+        self.durations = []
+        self.failures = 0
+        self.elapsed = 0.0
+        self.cpu = None
+        self.memory = None
+        self.decision = ""
+
+    @property
+    def throughput(self) -> float:
+        return len(self.durations) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def latency(self) -> float:
+        return sum(self.durations) / len(self.durations) if self.durations else 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / len(self.durations) if self.durations else 0.0
+
+
+class ConcurrencyTuner:
+    """Hill-climbs the concurrency level on measured windows of finished tests."""
+
+    def __init__(self, total: int, max_level: int, sampler: ResourceSampler | None = None, clock=time.monotonic):
+        self.total = total
+        self.max_level = max_level
+        self.level = min(START_LEVEL, max_level)
+        self.sampler = sampler or ResourceSampler()
+        self.clock = clock
+        self.windows = []
+        self.window = Window(self.level, clock())
+        self.finished = 0
+        self.settled = False
+        self.reason = ""
+
+    def record(self, duration: float, failed: bool) -> int:
+        """Record one finished test; return the level to run at from now on."""
+        self.finished += 1
+        window = self.window
+        window.durations.append(duration)
+        window.failures += failed
+        elapsed = self.clock() - window.started
+        if self.settled or len(window.durations) < WINDOW_TESTS_PER_TAB * window.level or elapsed < MIN_WINDOW:
+            return self.level
+        window.elapsed = elapsed
+        window.cpu = self.sampler.cpu()
+        window.memory = self.sampler.memory_available()
+        self.windows.append(window)
+        self._decide(window)
+        if not self.settled and self.finished >= self.total * TUNE_SHARE:
+            self._settle("tuning budget used")
+        self.window = Window(self.level, self.clock())
+        return self.level
+
+    def best(self) -> Window | None:
+        """The highest-throughput window among those that did not overload."""
+        healthy = [w for w in self.windows if not w.decision.startswith("down")]
+        return max(healthy, key=lambda w: w.throughput, default=None)
+
+    def _settle(self, reason: str):
+        best = self.best()
+        if best is not None:
+            self.level = best.level
+        self.settled = True
+        self.reason = reason
+
+    def _decide(self, window: Window):
+        baseline = min(self.windows, key=lambda w: w.level)
+        previous = self.windows[-2] if len(self.windows) > 1 else None
+        if window.cpu is not None and window.cpu > MAX_CPU:
+            overload = f"CPU {window.cpu:.0%}"
+        elif window.memory is not None and window.memory < MIN_MEMORY:
+            overload = f"memory {window.memory:.0%} available"
+        elif window.failure_rate > baseline.failure_rate + FAILURE_MARGIN:
+            overload = f"failure rate {window.failure_rate:.0%}"
+        else:
+            overload = ""
+
+        if overload:
+            window.decision = f"down: {overload}"
+            self.level = max(1, window.level - 1)
+            if previous is not None and previous.level < window.level:
+                # We climbed into this: the previous level was the ceiling
+                self.settled, self.reason = True, overload
+            return
+        if previous is not None and window.throughput < previous.throughput * (1 - THROUGHPUT_MARGIN):
+            window.decision = "hold: throughput fell"
+            self._settle(f"throughput fell at {window.level} tabs")
+            return
+        if previous is not None and window.level > previous.level and (
+            window.throughput < previous.throughput * (1 + THROUGHPUT_MARGIN)
+        ):
+            window.decision = "hold: no gain"
+            self._settle(f"no gain from {window.level} tabs")
+            return
+        if window.level >= self.max_level:
+            window.decision = "hold: maximum"
+            self._settle(f"reached the maximum of {self.max_level} tabs")
+            return
+        window.decision = "up"
+        self.level = window.level + 1
+
+    def summary(self) -> str:
+        if not self.windows:
+            return f"ran at {self.level} tabs (too few tests to tune)"
+        best = self.best()
+        if best is None:
+            text = f"chose {self.level} tabs, every window overloaded"
+        else:
+            text = f"chose {self.level} tabs, best window {best.throughput:.2f} tests/s at {best.level}"
+        return f"{text} ({self.reason})" if self.reason else text
+
+    def html(self) -> str:
+        def pct(value):
+            return "n/a" if value is None else f"{value:.0%}"
+
+        rows = "".join(
+            f"<tr><td>{w.level}</td><td>{len(w.durations)}</td><td>{w.throughput:.2f}</td>"
+            f"<td>{w.latency:.1f}s</td><td>{w.failure_rate:.0%}</td><td>{pct(w.cpu)}</td>"
+            f"<td>{pct(w.memory)}</td><td>{html.escape(w.decision)}</td></tr>"
+            for w in self.windows
+        )
+        return (
+            "<h2>Concurrency autotuning</h2>"
+            f"<p>{html.escape(self.summary())}.</p>"
+            '<table class="time-breakdown"><tr><th>Tabs</th><th>Tests</th><th>Tests/s</th><th>Latency</th>'
+            "<th>Failures</th><th>CPU</th><th>Memory free</th><th>Decision</th></tr>"
+            f"{rows}</table>"
+        )
@@ -0,0 +1,343 @@
+"""
+Persistent warm browser server shared by pytest runs.
+
+Launching Chromium dominates short targeted runs. With `--warm-browser`
+pytest connects to a browser server that outlives the run instead of
+launching its own browser; if no server is running, one is started in
+the background first. Each run only opens its own contexts, which are
+closed when it disconnects.
+
+    python -m pytest tests/test_login.py -k TestLoginNegative --warm-browser
+
+The server is a detached `python -m plugins.browser_server serve`
+process wrapping Playwright's browser server. Its endpoint and launch
+options are kept in STATE_PATH, whose mtime acts as a lease that
+connected runs renew; the server shuts down after `--idle-minutes`
+without a run. Whenever the server is unhealthy, was launched with
+other options (e.g. headed vs headless) or cannot be reached, the run
+falls back to a normal local launch.
+
+Manage it from the command line:
+    python -m plugins.browser_server start [--browser chromium] [--headed]
+    python -m plugins.browser_server status
+    python -m plugins.browser_server stop
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pytest
+from playwright._impl._driver import compute_driver_executable, get_driver_env
+from playwright.sync_api import Error as PlaywrightError
+
+STATE_PATH = "reports/browser-server.json"
+
+DEFAULT_IDLE_MINUTES = 30
+
+# Connected runs renew the lease at most this often
+LEASE_INTERVAL = 30
+
+CONNECT_TIMEOUT_MS = 3000
+START_TIMEOUT = 30
+
+# pytest-playwright launch args the server understands, and their launchServer names
+SERVER_OPTIONS = {"headless": "headless", "channel": "channel"}
+
+STATUS_KEY = pytest.StashKey[str]()
+
+
+def read_state(path: str = STATE_PATH) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def server_options(launch_args: dict) -> dict:
+    """The part of the launch args that is fixed when the server starts."""
+    options = {"headless": True}
+    options.update({SERVER_OPTIONS[k]: v for k, v in launch_args.items() if k in SERVER_OPTIONS})
+    return options
+
+
+def cli_launch_args(config) -> tuple[str, dict]:
+    """Browser name and launch args from pytest-playwright's options, outside fixtures."""
+    browsers = config.getoption("browser", None) or ["chromium"]
+    args = {"headless": not config.getoption("headed", False)}
+    if config.getoption("slowmo", 0):
+        args["slow_mo"] = config.getoption("slowmo")
+    if config.getoption("browser_channel", None):
+        args["channel"] = config.getoption("browser_channel")
+    return browsers[0], args
+
+
+def running_state(path: str = STATE_PATH) -> dict | None:
+    """State of the server if its processes are alive."""
+    state = read_state(path)
+    if state is None or not (_alive(state["pid"]) and _alive(state["node_pid"])):
+        return None
+    return state
+
+
+def mismatch(state: dict, browser_name: str, launch_args: dict) -> str:
+    """Why this server cannot serve a run with these launch args, or ""."""
+    if state["browser"] == browser_name and state["options"] == server_options(launch_args):
+        return ""
+    return (
+        f"warm browser server runs {state['browser']} {state['options']}, "
+        f"this run needs {browser_name} {server_options(launch_args)}"
+    )
+
+
+def start_server(browser_name: str, launch_args: dict, idle_minutes: float, path: str = STATE_PATH) -> dict | None:
+    """Start the daemon in the background and wait for its endpoint."""
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    log = open(os.path.splitext(path)[0] + ".log", "a", encoding="utf-8")
+    daemon = subprocess.Popen(
+        [
+            sys.executable, "-m", "plugins.browser_server", "--state", path, "serve",
+            "--browser", browser_name,
+            "--options", json.dumps(server_options(launch_args)),
+            "--idle-minutes", str(idle_minutes),
+        ],
+        stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+        start_new_session=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    log.close()
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline and daemon.poll() is None:
+        state = running_state(path)
+        if state is not None and not mismatch(state, browser_name, launch_args):
+            return state
+        time.sleep(0.1)
+    return None
+
+
+def renew_lease(path: str = STATE_PATH):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def launch_server_process(browser_name: str, options: dict) -> tuple[subprocess.Popen, str]:
+    """Start Playwright's browser server; (process, ws endpoint)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as config:
+        json.dump(options, config)
+    node, cli = compute_driver_executable()
+    server = subprocess.Popen(
+        [node, cli, "launch-server", "--browser", browser_name, "--config", config.name],
+        stdout=subprocess.PIPE, env=get_driver_env(), text=True,
+    )
+    endpoint = server.stdout.readline().strip()
+    os.remove(config.name)
+    if not endpoint.startswith("ws"):
+        server.terminate()
+        raise RuntimeError(f"browser server did not start: {endpoint!r}")
+    return server, endpoint
+
+
+def serve(browser_name: str, options: dict, idle_minutes: float, path: str = STATE_PATH):
+    """Run the browser server until it has been idle for `idle_minutes`."""
+    try:
+        server, endpoint = launch_server_process(browser_name, options)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+
+    def owns_state() -> bool:
+        current = read_state(path)
+        return current is not None and current["pid"] == os.getpid()
+
+    def shutdown(*_):
+        server.terminate()
+        if owns_state():
+            os.remove(path)
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    state = {
+        "pid": os.getpid(),
+        "node_pid": server.pid,
+        "ws_endpoint": endpoint,
+        "browser": browser_name,
+        "options": options,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+    print(f"{browser_name} browser server listening on {endpoint}", flush=True)
+
+    while server.poll() is None:
+        time.sleep(min(LEASE_INTERVAL, 15))
+        if not owns_state():
+            # Replaced by a server another run started concurrently
+            break
+        idle = time.time() - os.path.getmtime(path)
+        if idle > idle_minutes * 60:
+            print(f"idle for {idle / 60:.0f} minutes, shutting down", flush=True)
+            break
+    shutdown()
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("warm-browser", "persistent warm browser server")
+    group.addoption(
+        "--warm-browser", action="store_true", default=False,
+        help="Connect to a persistent browser server (started on first use) instead of launching a browser",
+    )
+    group.addoption(
+        "--idle-minutes", type=float, default=DEFAULT_IDLE_MINUTES,
+        help=f"Shut a server started by this run down after this long without runs (default: {DEFAULT_IDLE_MINUTES})",
+    )
+    group.addoption(
+        "--browser-endpoint", metavar="WS_ENDPOINT", default=None,
+        help="Connect to this Playwright browser server instead of launching a browser (no fallback)",
+    )
+
+
+def connect_warm(browser_type, launch_args: dict, config) -> tuple[object | None, str]:
+    """Connect to the warm server, starting it if needed; (browser, status)."""
+    state = running_state()
+    if state is None:
+        state = start_server(browser_type.name, launch_args, config.option.idle_minutes)
+        if state is None:
+            return None, "warm browser server did not start; launched locally"
+    elif reason := mismatch(state, browser_type.name, launch_args):
+        return None, f"{reason}; launched locally"
+    try:
+        browser = browser_type.connect(
+            state["ws_endpoint"], timeout=CONNECT_TIMEOUT_MS, slow_mo=launch_args.get("slow_mo"),
+        )
+    except PlaywrightError as e:
+        return None, f"warm browser server unreachable ({str(e).splitlines()[0]}); launched locally"
+    renew_lease()
+    return browser, f"connected to warm browser server {state['ws_endpoint']} (pid {state['pid']})"
+
+
+@pytest.fixture(scope="session")
+def launch_browser(browser_type_launch_args, browser_type, pytestconfig):
+    """pytest-playwright's launcher, connecting to --browser-endpoint or the warm server if asked."""
+
+    def launch(**kwargs):
+        launch_args = {**browser_type_launch_args, **kwargs}
+        if pytestconfig.option.browser_endpoint:
+            return browser_type.connect(pytestconfig.option.browser_endpoint, slow_mo=launch_args.get("slow_mo"))
+        if pytestconfig.option.warm_browser:
+            browser, status = connect_warm(browser_type, launch_args, pytestconfig)
+            pytestconfig.stash[STATUS_KEY] = status
+            if browser is not None:
+                return browser
+        return browser_type.launch(**launch_args)
+
+    return launch
+
+
+class LeaseKeeper:
+    """Renews the server lease while tests run so it is not idled out."""
+
+    def __init__(self):
+        self.renewed = 0.0
+
+    def pytest_runtest_logreport(self, report):
+        now = time.monotonic()
+        if now - self.renewed > LEASE_INTERVAL:
+            self.renewed = now
+            renew_lease()
+
+    def pytest_terminal_summary(self, terminalreporter, config):
+        status = config.stash.get(STATUS_KEY, None)
+        if status:
+            terminalreporter.write_line(f"warm browser: {status}")
+
+
+def pytest_configure(config):
+    if config.option.warm_browser and not config.option.collectonly:
+        config.pluginmanager.register(LeaseKeeper(), "warm-browser-lease")
+
+
+# ──────────────────────────────────────────────
+# COMMAND LINE
+# ──────────────────────────────────────────────
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m plugins.browser_server", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--state", default=STATE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    start = sub.add_parser("start", help="Start the server in the background")
+    start.add_argument("--browser", default="chromium", choices=("chromium", "firefox", "webkit"))
+    start.add_argument("--headed", action="store_true")
+    start.add_argument("--channel")
+    start.add_argument("--idle-minutes", type=float, default=DEFAULT_IDLE_MINUTES)
+    sub.add_parser("status", help="Show the running server")
+    sub.add_parser("stop", help="Stop the running server")
+    run = sub.add_parser("serve", help=argparse.SUPPRESS)
+    run.add_argument("--browser", required=True)
+    run.add_argument("--options", required=True)
+    run.add_argument("--idle-minutes", type=float, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.browser, json.loads(args.options), args.idle_minutes, args.state)
+    elif args.command == "start":
+        launch_args = {"headless": not args.headed}
+        if args.channel:
+            launch_args["channel"] = args.channel
+        state = running_state(args.state)
+        if state is not None and mismatch(state, args.browser, launch_args):
+            print(mismatch(state, args.browser, launch_args) + "; stop it first")
+            return 1
+        state = state or start_server(args.browser, launch_args, args.idle_minutes, args.state)
+        if state is None:
+            print(f"server did not start, see {os.path.splitext(args.state)[0]}.log")
+            return 1
+        print(f"{state['browser']} browser server on {state['ws_endpoint']} (pid {state['pid']})")
+    elif args.command == "status":
+        state = running_state(args.state)
+        if state is None:
+            print("no warm browser server running")
+            return 1
+        idle = (time.time() - os.path.getmtime(args.state)) / 60
+        print(
+            f"{state['browser']} {state['options']} on {state['ws_endpoint']} (pid {state['pid']}), "
+            f"started {state['started_at']}, idle {idle:.0f} min"
+        )
+    elif args.command == "stop":
+        state = running_state(args.state)
+        if state is None:
+            print("no warm browser server running")
+            return 0
+        os.kill(state["pid"], signal.SIGTERM)
+        print(f"stopped browser server (pid {state['pid']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,482 @@
+"""
+HTTP caching of the app: warm vs cold loads, and a header audit.
+
+Repeat visits. tests/test_repeat_visits.py loads each page twice. The
+cold load runs in a new browser context, whose HTTP cache is empty. The
+warm load navigates to the page again in the same context. Both are
+measured in the page with the Navigation and Resource Timing APIs
+(`BasePage.get_load_metrics`):
+
+    requests      the document and every resource it loaded
+    transferred   bytes over the network, headers included; 0 for a cache hit
+    from_cache    responses served from the HTTP cache without a request
+    dcl_ms        navigation start to DOMContentLoaded
+    load_ms       navigation start to the load event
+
+The `load_comparison` fixture records both loads on the test. The report
+gets one row per page and engine, with the bytes the warm load saved.
+
+Header audit. tests/test_caching_headers.py records one network log per
+page visit (`network_audit.visit(...)`): every response from the app's
+origin, from the page's document until the page navigates elsewhere. The
+log routes the page through `route.fallback()`, which turns Playwright's
+HTTP cache off, so every response comes over the network. The visit
+makes no extra requests. Each response is checked from the log:
+
+    compression   text responses (HTML, CSS, JS, JSON, SVG) of COMPRESS_FROM
+                  bytes or more need a Content-Encoding
+    caching       static assets need a lifetime (max-age/Expires) or a
+                  validator (ETag/Last-Modified); documents need a validator
+                  and at most MAX_DOCUMENT_LIFETIME; API JSON must not be
+                  stored by shared caches
+    size          a response over its kind's BUDGETS entry, or a visit over
+                  PAGE_BUDGET
+
+The report ranks the responses of all visits twice: heaviest first, and
+least cacheable first.
+"""
+
+import contextlib
+import html
+import json
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+
+from pages.login_page import BASE_URL
+
+LOAD_FIELDS = ("requests", "transferred", "from_cache", "dcl_ms", "load_ms")
+
+
+def saved(cold: dict, warm: dict) -> float:
+    """Share of the cold load's bytes the warm load did not transfer."""
+    if not cold["transferred"]:
+        return 0.0
+    return 1 - warm["transferred"] / cold["transferred"]
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:.1f} KB"
+
+
+def _ms(value) -> str:
+    return "-" if value is None else f"{value} ms"
+
+
+class LoadComparisonReport:
+    """Cold and warm loads per page and engine."""
+
+    def __init__(self):
+        # (page, engine) -> {"cold": {...}, "warm": {...}}
+        self.loads = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == "load_comparison":
+                record = json.loads(value)
+                self.loads[(record["page"], record["engine"])] = record
+
+    def summary(self) -> str:
+        cached = sum(1 for record in self.loads.values() if saved(record["cold"], record["warm"]) > 0)
+        return f"{cached} of {len(self.loads)} warm loads transferred less than the cold load"
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.loads:
+            return
+        terminalreporter.write_sep("-", f"repeat visits: {self.summary()}")
+        for (page, engine), record in sorted(self.loads.items()):
+            cold, warm = record["cold"], record["warm"]
+            terminalreporter.write_line(
+                f"{page:<16} {engine:<9} cold {_kb(cold['transferred']):>9} / {cold['requests']:2d} requests, "
+                f"warm {_kb(warm['transferred']):>9} / {warm['requests']:2d} requests "
+                f"({warm['from_cache']} cached), saved {saved(cold, warm):.0%}"
+            )
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if not self.loads:
+            return
+
+        def cells(load):
+            return (
+                f"<td>{load['requests']}</td><td>{_kb(load['transferred'])}</td><td>{load['from_cache']}</td>"
+                f"<td>{_ms(load['dcl_ms'])}</td><td>{_ms(load['load_ms'])}</td>"
+            )
+
+        rows = "".join(
+            f"<tr><td>{html.escape(page)}</td><td>{html.escape(engine)}</td>"
+            f"{cells(record['cold'])}{cells(record['warm'])}"
+            f"<td>{saved(record['cold'], record['warm']):.0%}</td></tr>"
+            for (page, engine), record in sorted(self.loads.items())
+        )
+        columns = "<th>Requests</th><th>Transferred</th><th>Cached</th><th>DCL</th><th>Load</th>"
+        postfix.append(
+            "<h2>Repeat visits</h2>"
+            f"<p>{html.escape(self.summary())}. Cold: new browser context; warm: second navigation "
+            "in the same context.</p>"
+            '<table class="time-breakdown">'
+            '<tr><th rowspan="2">Page</th><th rowspan="2">Engine</th><th colspan="5">Cold</th>'
+            '<th colspan="5">Warm</th><th rowspan="2">Bytes saved</th></tr>'
+            f"<tr>{columns}{columns}</tr>{rows}</table>"
+        )
+
+
+KB = 1024
+
+COMPRESSIONS = {"gzip", "br", "zstd", "deflate"}
+
+# Content types worth compressing, and the size from which it pays off
+TEXT_TYPES = ("text/", "javascript", "json", "image/svg+xml", "xml")
+COMPRESS_FROM = 1 * KB
+
+STATIC_KINDS = ("stylesheet", "script", "image", "font")
+
+# Largest payload (bytes over the network, or decoded when unknown) per kind
+BUDGETS = {
+    "document": 100 * KB,
+    "stylesheet": 100 * KB,
+    "script": 150 * KB,
+    "image": 200 * KB,
+    "font": 100 * KB,
+    "api": 20 * KB,
+}
+PAGE_BUDGET = 1024 * KB
+
+# A document fresh for longer keeps serving the previous deploy
+MAX_DOCUMENT_LIFETIME = 600
+
+# Rows in each ranking of the report
+RANKED = 15
+
+# Cacheability levels, least cacheable first
+NOT_STORED, NOT_REUSABLE, REVALIDATED, FRESH = range(4)
+
+
+def cache_directives(value: str) -> dict[str, str]:
+    """`"public, max-age=600"` -> {"public": "", "max-age": "600"}."""
+    directives = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+def response_kind(resource_type: str, content_type: str) -> str:
+    if resource_type in ("fetch", "xhr"):
+        return "api" if "json" in content_type else resource_type
+    return resource_type
+
+
+def _duration(seconds: int) -> str:
+    for unit, size in (("d", 86400), ("h", 3600), ("min", 60)):
+        if seconds >= size:
+            return f"{seconds / size:g} {unit}"
+    return f"{seconds} s"
+
+
+@dataclass
+class AuditedResponse:
+    """One response of a recorded page visit, with the headers the audit reads."""
+
+    url: str
+    kind: str
+    status: int
+    content_type: str = ""
+    encoding: str = ""
+    cache_control: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    expires: str = ""
+    date: str = ""
+    # Body bytes over the network (0 when the engine does not say) and decoded
+    transferred: int = 0
+    size: int = 0
+
+    @property
+    def path(self) -> str:
+        parts = urlsplit(self.url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    @property
+    def payload(self) -> int:
+        return self.transferred or self.size
+
+    @property
+    def compressible(self) -> bool:
+        return any(text in self.content_type for text in TEXT_TYPES)
+
+    @property
+    def lifetime(self) -> int | None:
+        """Seconds the browser may reuse the response without asking, or None if unspecified."""
+        directives = cache_directives(self.cache_control)
+        if "max-age" in directives:
+            try:
+                return max(int(directives["max-age"]), 0)
+            except ValueError:
+                return 0
+        if self.expires and self.date:
+            try:
+                lifetime = parsedate_to_datetime(self.expires) - parsedate_to_datetime(self.date)
+            except (TypeError, ValueError):
+                # An invalid Expires means already expired
+                return 0
+            return max(int(lifetime.total_seconds()), 0)
+        return None
+
+    @property
+    def cacheability(self) -> tuple[int, str]:
+        """(level, label): how far a browser can reuse the response."""
+        directives = cache_directives(self.cache_control)
+        validator = bool(self.etag or self.last_modified)
+        if "no-store" in directives:
+            return NOT_STORED, "no-store"
+        lifetime = self.lifetime
+        if "no-cache" in directives or lifetime == 0:
+            return (REVALIDATED, "revalidated") if validator else (NOT_REUSABLE, "expired, no validator")
+        if lifetime is None:
+            return (REVALIDATED, "validator only") if validator else (NOT_REUSABLE, "no caching headers")
+        return FRESH, f"fresh for {_duration(lifetime)}"
+
+    @property
+    def findings(self) -> list[str]:
+        if not 200 <= self.status < 300:
+            return []
+        findings = []
+        directives = cache_directives(self.cache_control)
+        level, label = self.cacheability
+        if self.compressible and self.size >= COMPRESS_FROM and self.encoding not in COMPRESSIONS:
+            findings.append(f"{_kb(self.size)} {self.content_type.split(';')[0]} not compressed")
+        if self.kind in STATIC_KINDS and level < REVALIDATED:
+            findings.append(f"static {self.kind} not cacheable ({label})")
+        elif self.kind == "document":
+            if level != NOT_STORED and not (self.etag or self.last_modified):
+                findings.append("document without ETag or Last-Modified")
+            if (self.lifetime or 0) > MAX_DOCUMENT_LIFETIME:
+                findings.append(f"document fresh for {_duration(self.lifetime)}")
+        elif self.kind == "api":
+            if "public" in directives or "s-maxage" in directives or (level == FRESH and "private" not in directives):
+                findings.append(f"API response storable by shared caches (Cache-Control: {self.cache_control})")
+        budget = BUDGETS.get(self.kind)
+        if budget and self.payload > budget:
+            findings.append(f"{_kb(self.payload)} over the {_kb(budget)} {self.kind} budget")
+        return findings
+
+
+def visit_findings(page: str, responses: list[AuditedResponse]) -> list[str]:
+    findings = [f"{response.path}: {finding}" for response in responses for finding in response.findings]
+    total = sum(response.payload for response in responses)
+    if total > PAGE_BUDGET:
+        findings.append(f"{page}: {_kb(total)} over the {_kb(PAGE_BUDGET)} page budget")
+    return findings
+
+
+def _fall_back(route):
+    route.fallback()
+
+
+class NetworkLog:
+    """The app's responses to one page visit, from its document until it navigates elsewhere."""
+
+    def __init__(self, page):
+        self.page = page
+        self.requests = []
+        self.recording = False
+        self._document_seen = False
+
+    def start(self):
+        # Any route turns the HTTP cache off; fallback() hands the request on (e.g. to --app-url)
+        self.page.route("**/*", _fall_back)
+        self.page.on("request", self._on_request)
+        self.recording = True
+        return self
+
+    def _on_request(self, request):
+        if not self.recording:
+            return
+        if (request.is_navigation_request() and request.frame == self.page.main_frame
+                and request.redirected_from is None):
+            if self._document_seen:
+                self.recording = False
+                return
+            self._document_seen = True
+        if request.url.startswith(BASE_URL):
+            self.requests.append(request)
+
+    def stop(self) -> list[AuditedResponse]:
+        self.recording = False
+        self.page.remove_listener("request", self._on_request)
+        self.page.unroute("**/*", _fall_back)
+        responses = []
+        for request in self.requests:
+            response = request.response()
+            if response is not None:
+                responses.append(self._audited(request, response))
+        return responses
+
+    @staticmethod
+    def _audited(request, response) -> AuditedResponse:
+        headers = response.all_headers()
+        try:
+            transferred = max(request.sizes()["responseBodySize"], 0)
+        except PlaywrightError:
+            transferred = 0
+        try:
+            size = len(response.body())
+        except PlaywrightError:
+            # Redirects have no body
+            size = 0
+        content_type = headers.get("content-type", "")
+        return AuditedResponse(
+            url=request.url,
+            kind=response_kind(request.resource_type, content_type),
+            status=response.status,
+            content_type=content_type,
+            encoding=headers.get("content-encoding", "").strip().lower(),
+            cache_control=headers.get("cache-control", ""),
+            etag=headers.get("etag", ""),
+            last_modified=headers.get("last-modified", ""),
+            expires=headers.get("expires", ""),
+            date=headers.get("date", ""),
+            transferred=transferred,
+            size=size,
+        )
+
+
+class NetworkAudit:
+    """Recorded page visits of one test; each is audited from its network log."""
+
+    def __init__(self, node, page, engine: str):
+        self.node = node
+        self.page = page
+        self.engine = engine
+        self.visits = {}
+
+    @contextlib.contextmanager
+    def visit(self, name: str):
+        """Record the responses of what runs inside, as the visit of page `name`."""
+        log = NetworkLog(self.page).start()
+        try:
+            yield log
+        finally:
+            responses = log.stop()
+        self.visits[name] = responses
+        self.node.user_properties.append(("network_audit", json.dumps({
+            "page": name,
+            "engine": self.engine,
+            "responses": [asdict(response) for response in responses],
+        })))
+
+    def findings(self, name: str) -> list[str]:
+        return visit_findings(name, self.visits[name])
+
+
+class ResponseAuditReport:
+    """Responses of all audited visits, ranked by weight and by cacheability."""
+
+    def __init__(self):
+        # (engine, url) -> AuditedResponse, and the pages it was served for
+        self.responses = {}
+        self.pages = {}
+        self.visits = 0
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name != "network_audit":
+                continue
+            record = json.loads(value)
+            self.visits += 1
+            for data in record["responses"]:
+                key = (record["engine"], data["url"])
+                self.responses[key] = AuditedResponse(**data)
+                self.pages.setdefault(key, set()).add(record["page"])
+
+    def summary(self) -> str:
+        flagged = sum(1 for response in self.responses.values() if response.findings)
+        return f"{len(self.responses)} responses in {self.visits} page visits, {flagged} with findings"
+
+    def heaviest(self) -> list[tuple]:
+        return sorted(self.responses.items(), key=lambda item: -item[1].payload)[:RANKED]
+
+    def least_cacheable(self) -> list[tuple]:
+        return sorted(
+            self.responses.items(), key=lambda item: (item[1].cacheability[0], -item[1].payload),
+        )[:RANKED]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.responses:
+            return
+        terminalreporter.write_sep("-", f"response audit: {self.summary()}")
+        for (engine, _), response in self.least_cacheable():
+            if response.findings:
+                terminalreporter.write_line(
+                    f"{engine:<9} {response.path:<40} {_kb(response.payload):>9}  {'; '.join(response.findings)}"
+                )
+
+    def _table(self, title: str, rows: list[tuple]) -> str:
+        cells = "".join(
+            f"<tr><td>{html.escape(engine)}</td><td>{html.escape(response.path)}</td>"
+            f"<td>{html.escape(response.kind)}</td>"
+            f"<td>{html.escape(', '.join(sorted(self.pages[(engine, url)])))}</td>"
+            f"<td>{_kb(response.payload)}</td><td>{_kb(response.size)}</td>"
+            f"<td>{html.escape(response.encoding or '-')}</td>"
+            f"<td>{html.escape(response.cache_control or '-')}</td>"
+            f"<td>{'ETag' if response.etag else 'Last-Modified' if response.last_modified else '-'}</td>"
+            f"<td>{html.escape(response.cacheability[1])}</td>"
+            f"<td>{html.escape('; '.join(response.findings))}</td></tr>"
+            for (engine, url), response in rows
+        )
+        return (
+            f"<h3>{title}</h3>"
+            '<table class="time-breakdown"><tr><th>Engine</th><th>Resource</th><th>Kind</th><th>Pages</th>'
+            "<th>Transferred</th><th>Size</th><th>Encoding</th><th>Cache-Control</th><th>Validator</th>"
+            f"<th>Caching</th><th>Findings</th></tr>{cells}</table>"
+        )
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if not self.responses:
+            return
+        postfix.append(
+            "<h2>Caching and compression</h2>"
+            f"<p>{html.escape(self.summary())}.</p>"
+            + self._table("Heaviest responses", self.heaviest())
+            + self._table("Least cacheable responses", self.least_cacheable())
+        )
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_configure(config):
+    if not config.option.collectonly:
+        config.pluginmanager.register(LoadComparisonReport(), "load-comparison")
+        config.pluginmanager.register(ResponseAuditReport(), "response-audit")
+
+
+@pytest.fixture
+def load_comparison(request, browser_name):
+    """Record a page's cold and warm load: `load_comparison("login", cold, warm)`."""
+
+    def record(page: str, cold: dict, warm: dict):
+        request.node.user_properties.append(("load_comparison", json.dumps({
+            "page": page,
+            "engine": browser_name,
+            "cold": {key: cold[key] for key in LOAD_FIELDS},
+            "warm": {key: warm[key] for key in LOAD_FIELDS},
+        })))
+
+    return record
+
+
+@pytest.fixture
+def network_audit(request, page, browser_name) -> NetworkAudit:
+    """Record and audit page visits: `with network_audit.visit("index.html"): ...`."""
+    return NetworkAudit(request.node, page, browser_name)
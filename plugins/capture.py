@@ -0,0 +1,172 @@
+"""
+Bounded sensitive-data capture for console, page errors and network calls.
+
+The `sensitive_capture` fixture installs a small script in the page that
+wraps `console.*`, listens for uncaught errors and rejections, and wraps
+`fetch` / `XMLHttpRequest`. Every event is matched *inside the browser*
+against the registered sensitive patterns; only matches cross into
+Python, where they are kept in a ring buffer of MAX_MATCHES entries. The
+cost per event is a few regex tests, so long journeys stay cheap.
+
+Usage:
+    def test_no_leaks(self, login_page, sensitive_capture):
+        sensitive_capture.watch(email, password)
+        login_page.login(email, password)
+        sensitive_capture.assert_clean()
+
+Matches are attached to the HTML report when the test fails.
+"""
+
+import html
+import json
+import re
+from collections import deque
+
+import pytest
+from playwright.sync_api import Page
+from pytest_html import extras as pytest_extras
+
+# Matches kept per test; older ones are dropped
+MAX_MATCHES = 50
+
+# Characters of the offending message kept per match
+MAX_TEXT = 500
+
+# Sources checked by assert_clean() unless told otherwise; network bodies
+# legitimately carry credentials (see BUG-030), logs never should
+LOGGED_SOURCES = ("console", "pageerror")
+
+CAPTURE_KEY = pytest.StashKey["SensitiveCapture"]()
+
+CAPTURE_SCRIPT = """
+(patterns) => {
+  const compile = list => list.map(p => new RegExp(p, "i"));
+  if (window.__qaCapture) {
+    window.__qaCapture.patterns = compile(patterns);
+    return;
+  }
+  const state = { patterns: compile(patterns), scanned: 0 };
+  window.__qaCapture = state;
+
+  const text = value => {
+    if (typeof value === "string") return value;
+    try { return JSON.stringify(value); } catch (e) { return String(value); }
+  };
+  const check = (source, message) => {
+    state.scanned++;
+    for (const re of state.patterns) {
+      if (re.test(message)) {
+        window.__qaCaptureMatch(source, re.source, message.slice(0, %(max_text)d));
+        return;
+      }
+    }
+  };
+
+  for (const level of ["log", "info", "warn", "error", "debug"]) {
+    const original = console[level];
+    console[level] = function (...args) {
+      try { check("console", args.map(text).join(" ")); } catch (e) {}
+      return original.apply(this, args);
+    };
+  }
+  window.addEventListener("error", e => check("pageerror", String(e.message)));
+  window.addEventListener("unhandledrejection", e => check("pageerror", text(e.reason)));
+
+  const originalFetch = window.fetch;
+  window.fetch = function (input, init) {
+    try {
+      const url = typeof input === "string" ? input : input.url;
+      check("network", url + " " + (init && typeof init.body === "string" ? init.body : ""));
+    } catch (e) {}
+    return originalFetch.apply(this, arguments);
+  };
+  const originalOpen = XMLHttpRequest.prototype.open;
+  const originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__qaUrl = String(url);
+    return originalOpen.apply(this, arguments);
+  };
+  XMLHttpRequest.prototype.send = function (body) {
+    try { check("network", this.__qaUrl + " " + (typeof body === "string" ? body : "")); } catch (e) {}
+    return originalSend.apply(this, arguments);
+  };
+}
+""" % {"max_text": MAX_TEXT}
+
+
+class SensitiveCapture:
+    """Per-test capture of events that match registered sensitive patterns."""
+
+    def __init__(self, page: Page, max_matches: int = MAX_MATCHES):
+        self.page = page
+        self.patterns = []
+        self.matches = deque(maxlen=max_matches)
+        self.total_matches = 0
+        page.expose_binding("__qaCaptureMatch", self._on_match)
+        self._install()
+
+    def _on_match(self, source, kind, pattern, message):
+        self.total_matches += 1
+        self.matches.append({"source": kind, "pattern": pattern, "text": message})
+
+    def _install(self):
+        script = f"({CAPTURE_SCRIPT})({json.dumps(self.patterns)})"
+        # Init scripts run in order on every navigation, so the latest
+        # pattern list wins; evaluate also covers the current document.
+        self.page.add_init_script(script)
+        self.page.evaluate(CAPTURE_SCRIPT, self.patterns)
+
+    def watch(self, *values: str):
+        """Treat these literal values (emails, passwords, tokens) as sensitive."""
+        return self.watch_pattern(*(re.escape(value) for value in values if value))
+
+    def watch_pattern(self, *patterns: str):
+        """Treat anything matching these JavaScript-compatible regexes as sensitive."""
+        self.patterns.extend(patterns)
+        self._install()
+        return self
+
+    def found(self, sources=LOGGED_SOURCES) -> list[dict]:
+        return [m for m in self.matches if m["source"] in sources]
+
+    def assert_clean(self, message: str = "", sources=LOGGED_SOURCES):
+        """Fail if sensitive data showed up in any of `sources`."""
+        leaks = self.found(sources)
+        assert not leaks, (
+            (message or "Sensitive data was exposed")
+            + f" ({len(leaks)} matches): "
+            + str([f"[{m['source']}] {m['text']}" for m in leaks])
+        )
+
+
+@pytest.fixture
+def sensitive_capture(page: Page, request) -> SensitiveCapture:
+    """Capture console, page errors and network calls matching watched values."""
+    capture = SensitiveCapture(page)
+    request.node.stash[CAPTURE_KEY] = capture
+    return capture
+
+
+def _matches_html(capture: SensitiveCapture) -> str:
+    rows = "".join(
+        f"<tr><td>{html.escape(m['source'])}</td><td><code>{html.escape(m['pattern'])}</code></td>"
+        f"<td><pre>{html.escape(m['text'])}</pre></td></tr>"
+        for m in capture.matches
+    )
+    dropped = capture.total_matches - len(capture.matches)
+    note = f"<p>{dropped} older matches dropped.</p>" if dropped else ""
+    return (
+        '<div class="sensitive-capture"><strong>Sensitive data matches:</strong>'
+        f"<table><tr><th>Source</th><th>Pattern</th><th>Message</th></tr>{rows}</table>{note}</div>"
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    capture = item.stash.get(CAPTURE_KEY, None)
+    if report.when == "call" and report.failed and capture is not None and capture.matches:
+        extra_list = getattr(report, "extras", [])
+        extra_list.append(pytest_extras.html(_matches_html(capture)))
+        report.extras = extra_list
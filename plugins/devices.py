@@ -0,0 +1,278 @@
+"""
+Device profiles: viewport plus network throttling and CPU slowdown.
+
+`MOBILE_VIEWPORT` and `TABLET_VIEWPORT` only resize the page. A device
+profile also slows the network and the CPU down, through Chromium's
+emulation hooks (CDP `Network.emulateNetworkConditions` and
+`Emulation.setCPUThrottlingRate`; other engines get the viewport only):
+
+    desktop      1280x800, no throttling
+    tablet       768x1024, 40 ms, 10/5 Mbps, CPU 2x
+    phone        375x667, 150 ms, 1.6 Mbps/750 kbps, CPU 4x  (Lighthouse mobile)
+    slow-phone   375x667, 563 ms, 1.44 Mbps/675 kbps, CPU 6x (DevTools "Fast 3G")
+
+Select a profile per test or class, or for the whole run:
+
+    @pytest.mark.device("slow-phone")
+    def test_login_redirects_to_dashboard(self, login_page, registered_user): ...
+
+    python -m pytest tests/test_login.py tests/test_registration.py --device-profile slow-phone
+
+The profile is applied to the test's `page` (or its journey's page, after
+the journey's steps) before the page object fixtures open it. Every page
+load is timed from the navigation request to the load event. The report
+gets the loads and the test time per profile and category, and counts
+the loads over the profile's `max_load_ms` budget. Adaptive timeouts
+(plugins/timeouts.py) are learned per profile; until a wait has enough
+samples under a profile, its timeout in code is multiplied by the
+profile's `timeout_scale`, since `timeout=10000` was sized for desktop.
+"""
+
+import html
+import json
+import time
+from dataclasses import dataclass
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+
+from plugins.journeys import page_under_test
+from utils.test_data import DESKTOP_VIEWPORT, MOBILE_VIEWPORT, TABLET_VIEWPORT
+
+# Load budget of an unthrottled page; the timeouts in code are sized for it
+DESKTOP_LOAD_MS = 3000
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    name: str
+    viewport: dict
+    # Added round-trip latency and bandwidth; 0 leaves the network alone
+    latency_ms: float = 0
+    download_kbps: float = 0
+    upload_kbps: float = 0
+    cpu_slowdown: float = 1
+    # A page load slower than this is counted as over budget in the report
+    max_load_ms: float = DESKTOP_LOAD_MS
+
+    @property
+    def throttled(self) -> bool:
+        return bool(self.latency_ms or self.download_kbps or self.upload_kbps) or self.cpu_slowdown > 1
+
+    @property
+    def timeout_scale(self) -> float:
+        """Factor for the timeouts in code, in proportion to the load budget."""
+        return max(self.max_load_ms / DESKTOP_LOAD_MS, 1)
+
+
+PROFILES = {profile.name: profile for profile in (
+    DeviceProfile("desktop", DESKTOP_VIEWPORT),
+    DeviceProfile("tablet", TABLET_VIEWPORT, 40, 10000, 5000, 2, max_load_ms=4000),
+    DeviceProfile("phone", MOBILE_VIEWPORT, 150, 1600, 750, 4, max_load_ms=6000),
+    DeviceProfile("slow-phone", MOBILE_VIEWPORT, 563, 1440, 675, 6, max_load_ms=10000),
+)}
+
+
+def _bytes_per_second(kbps: float) -> float:
+    # CDP takes bytes per second; -1 disables throttling
+    return kbps * 1000 / 8 if kbps else -1
+
+
+class DeviceSession:
+    """A profile applied to one page, and the page loads seen under it."""
+
+    def __init__(self, page, profile: DeviceProfile):
+        self.page = page
+        self.profile = profile
+        self.cdp = None
+        self.loads = []
+        self._navigation_started = None
+
+    def apply(self):
+        self.page.set_viewport_size(self.profile.viewport)
+        self.page.on("request", self._on_request)
+        self.page.on("load", self._on_load)
+        if not self.profile.throttled:
+            return
+        try:
+            self.cdp = self.page.context.new_cdp_session(self.page)
+        except PlaywrightError:
+            # Not Chromium: viewport only
+            return
+        profile = self.profile
+        self.cdp.send("Network.enable")
+        self.cdp.send("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": profile.latency_ms,
+            "downloadThroughput": _bytes_per_second(profile.download_kbps),
+            "uploadThroughput": _bytes_per_second(profile.upload_kbps),
+        })
+        self.cdp.send("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_slowdown})
+
+    def close(self):
+        self.page.remove_listener("request", self._on_request)
+        self.page.remove_listener("load", self._on_load)
+        if self.cdp is not None:
+            try:
+                self.cdp.detach()
+            except PlaywrightError:
+                pass
+
+    def _on_request(self, request):
+        if request.is_navigation_request() and request.frame == self.page.main_frame:
+            self._navigation_started = time.perf_counter()
+
+    def _on_load(self, page):
+        if self._navigation_started is not None:
+            self.loads.append((time.perf_counter() - self._navigation_started) * 1000)
+            self._navigation_started = None
+
+    @property
+    def throttled(self) -> bool:
+        return self.cdp is not None
+
+
+class ProfileStats:
+    def __init__(self, profile: DeviceProfile):
+        self.profile = profile
+        self.tests = 0
+        self.failed = 0
+        self.test_time = 0.0
+        self.loads = []
+        self.unthrottled = 0
+
+    @property
+    def over_budget(self) -> int:
+        return sum(1 for load in self.loads if load > self.profile.max_load_ms)
+
+
+class DeviceReport:
+    """Page loads and test times per profile and category."""
+
+    def __init__(self):
+        self.stats = {}
+        self.calls = {}
+
+    def pytest_runtest_logreport(self, report):
+        # The fixture adds its properties at teardown, after the loads happened
+        if report.when == "call":
+            self.calls[report.nodeid] = report
+            return
+        if report.when != "teardown":
+            return
+        properties = dict(report.user_properties)
+        call = self.calls.pop(report.nodeid, None)
+        if "device_profile" not in properties or call is None:
+            return
+        profile = PROFILES[properties["device_profile"]]
+        stats = self.stats.setdefault((profile.name, getattr(call, "category", "")), ProfileStats(profile))
+        stats.tests += 1
+        stats.failed += call.failed
+        stats.test_time += call.duration
+        stats.loads.extend(json.loads(properties["page_loads_ms"]))
+        stats.unthrottled += profile.throttled and not properties["device_throttled"]
+
+    def rows(self):
+        return sorted(self.stats.items())
+
+    def summary(self) -> str:
+        loads = sum(len(stats.loads) for stats in self.stats.values())
+        over = sum(stats.over_budget for stats in self.stats.values())
+        text = f"{sum(s.tests for s in self.stats.values())} tests, {loads} page loads, {over} over budget"
+        unthrottled = sum(stats.unthrottled for stats in self.stats.values())
+        if unthrottled:
+            text += f" ({unthrottled} tests viewport only: throttling needs Chromium)"
+        return text
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.stats:
+            return
+        terminalreporter.write_sep("-", f"device profiles: {self.summary()}")
+        for (name, category), stats in self.rows():
+            slowest = max(stats.loads, default=0)
+            terminalreporter.write_line(
+                f"{name:<11} {category:<18} {stats.tests:3d} tests, {len(stats.loads):3d} loads, "
+                f"slowest {slowest:6.0f} ms, {stats.over_budget} over {stats.profile.max_load_ms:.0f} ms"
+            )
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if not self.stats:
+            return
+        rows = "".join(
+            f"<tr><td>{html.escape(name)}</td><td>{html.escape(category)}</td><td>{stats.tests}</td>"
+            f"<td>{stats.failed}</td><td>{stats.test_time / stats.tests:.2f}s</td><td>{len(stats.loads)}</td>"
+            f"<td>{sum(stats.loads) / len(stats.loads) if stats.loads else 0:.0f} ms</td>"
+            f"<td>{max(stats.loads, default=0):.0f} ms</td>"
+            f"<td>{stats.over_budget} (&gt; {stats.profile.max_load_ms:.0f} ms)</td></tr>"
+            for (name, category), stats in self.rows()
+        )
+        postfix.append(
+            "<h2>Device profiles</h2>"
+            f"<p>{html.escape(self.summary())}.</p>"
+            '<table class="time-breakdown"><tr><th>Profile</th><th>Category</th><th>Tests</th><th>Failed</th>'
+            "<th>Mean test time</th><th>Page loads</th><th>Mean load</th><th>Slowest load</th>"
+            f"<th>Over budget</th></tr>{rows}</table>"
+        )
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("devices", "device profiles")
+    group.addoption(
+        "--device-profile", choices=sorted(PROFILES), default=None,
+        help="Run browser tests under this device profile (viewport, network and CPU throttling)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", f"device(name): run the test under a device profile ({', '.join(PROFILES)})",
+    )
+    if not config.option.collectonly:
+        config.pluginmanager.register(DeviceReport(), "device-report")
+
+
+def _profile_for(node, config) -> DeviceProfile | None:
+    marker = node.get_closest_marker("device")
+    name = marker.args[0] if marker is not None else config.option.device_profile
+    if name is None:
+        return None
+    if name not in PROFILES:
+        raise pytest.UsageError(f"{node.nodeid}: unknown device profile {name!r}, choose from {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+@pytest.fixture(autouse=True)
+def device_profile(request):
+    """The DeviceSession of the test's page, or None without a profile or a page."""
+    profile = _profile_for(request.node, request.config)
+    if profile is None:
+        yield None
+        return
+    page = page_under_test(request)
+    if page is None:
+        yield None
+        return
+
+    session = DeviceSession(page, profile)
+    session.apply()
+    timeouts = request.config.pluginmanager.get_plugin("adaptive-timeouts")
+    if timeouts is not None:
+        timeouts.scope = profile.name
+        timeouts.scale = profile.timeout_scale
+    try:
+        yield session
+    finally:
+        if timeouts is not None:
+            timeouts.scope = ""
+            timeouts.scale = 1
+        session.close()
+        request.node.user_properties.extend([
+            ("device_profile", profile.name),
+            ("device_throttled", session.throttled),
+            ("page_loads_ms", json.dumps([round(load) for load in session.loads])),
+        ])
@@ -0,0 +1,645 @@
+"""
+Distributed runs over a fleet of Playwright browser servers.
+
+The coordinator (the pytest process you start) collects the tests as
+usual, then hands them to workers instead of running them. Each worker
+is a pytest subprocess on this machine whose browser is a remote
+browser server (a node), so the browsers - the expensive part of a UI
+run - are spread over the fleet:
+
+    python -m pytest --fleet-node ws://10.0.0.5:3000/abc=4 --fleet-node ws://10.0.0.6:3000/def=4
+    python -m pytest --fleet-local 3          # three servers on this host
+
+`=N` is the node's capacity: how many workers (and so tests) it runs at
+once (default `--fleet-capacity`). Nodes are started with
+`npx playwright launch-server` or `python -m plugins.browser_server start`.
+A node serves one engine, the first `--browser` unless prefixed
+(`firefox@ws://...`); `--fleet-local` starts its servers for every
+`--browser` (see plugins/matrix.py).
+
+Scheduling: tests are split between the nodes' queues in proportion to
+capacity, keeping each module together for fixture reuse; a test
+parametrized with an engine only goes to that engine's nodes. A worker
+takes from its own node's queue and, once that is empty, steals from
+the back of the fullest other queue of its engine. When no test of its
+engine is left to steal, the worker's slot moves to the node of
+another engine with the most tests queued.
+
+Failures: a node is probed (TCP connect) every few seconds and whenever
+one of its tests fails. An unreachable node is dropped, its workers are
+stopped and their in-flight tests are requeued on the other nodes,
+together with the node's queue; a dead worker process is replaced. A
+test lost twice is reported as an error.
+
+Results: workers stream their reports back; the coordinator feeds them
+through the regular report hooks once a test finishes, so there is one
+terminal summary, one history entry and one HTML report for the run.
+Worker logs and reports are kept in reports/fleet/.
+"""
+
+import argparse
+import json
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import pytest
+
+from plugins.browser_server import cli_launch_args, launch_server_process, server_options
+from plugins.matrix import item_engine
+from plugins.replay import replay
+
+FLEET_DIR = "reports/fleet"
+
+DEFAULT_CAPACITY = 2
+
+PROBE_INTERVAL = 5.0
+PROBE_TIMEOUT = 2.0
+
+# A test whose node or worker is lost this many times is reported as an error
+MAX_ATTEMPTS = 2
+
+# Worker process restarts per node before the node is given up
+MAX_RESTARTS = 3
+
+# Queued tests another engine needs before an idle worker slot moves to it
+MIN_QUEUE_TO_MOVE = 4
+
+FDS_ENV = "PYTEST_FLEET_FDS"
+
+LOST_KEY = pytest.StashKey[list]()
+
+# Options a worker inherits from the coordinator: flag -> takes a value
+PASSTHROUGH = {
+    "--browser": True,
+    "--matrix": False,
+    "--browser-channel": True,
+    "--headed": False,
+    "--slowmo": True,
+    "--device": True,
+    "--device-profile": True,
+    "--app-url": True,
+    "--soak-minutes": True,
+    "--tracing": True,
+    "--video": True,
+    "--screenshot": True,
+    "--output": True,
+    "--trace-failures": False,
+    "--trace-sample-rate": True,
+    "--trace-detail": True,
+    "--trace-dir": True,
+    "--trace-max-mb": True,
+    "--no-failure-screenshots": False,
+    "--screenshot-dir": True,
+    "--no-action-timing": False,
+    "--no-adaptive-timeouts": False,
+    "--timeout-multiplier": True,
+    "--memory-monitor": False,
+    "--max-browser-rss-mb": True,
+    "--max-js-heap-mb": True,
+}
+
+
+def passthrough_args(args: list[str]) -> list[str]:
+    kept, args = [], list(args)
+    while args:
+        arg = str(args.pop(0))
+        flag = arg.split("=", 1)[0]
+        if flag not in PASSTHROUGH:
+            continue
+        kept.append(arg)
+        if PASSTHROUGH[flag] and "=" not in arg and args:
+            kept.append(str(args.pop(0)))
+    return kept
+
+
+def parse_node(spec: str, default_capacity: int, default_engine: str) -> tuple[str, str, int]:
+    """`[engine@]ws://host:port/path[=capacity]` -> (engine, endpoint, capacity)."""
+    engine, at, rest = spec.partition("@")
+    if not at or "://" in engine:
+        engine, rest = default_engine, spec
+    endpoint, _, capacity = rest.rpartition("=")
+    if endpoint and capacity.isdigit():
+        return engine, endpoint, int(capacity)
+    return engine, rest, default_capacity
+
+
+class Channel:
+    """Newline-delimited JSON messages over a pair of pipe fds."""
+
+    def __init__(self, read_fd: int, write_fd: int):
+        self.read_fd = read_fd
+        self.write_fd = write_fd
+        self.buffer = b""
+
+    def fileno(self) -> int:
+        return self.read_fd
+
+    def send(self, message: dict):
+        data = (json.dumps(message, default=str) + "\n").encode()
+        while data:
+            data = data[os.write(self.write_fd, data):]
+
+    def receive(self) -> list[dict] | None:
+        """Messages available now (after select), or None at EOF."""
+        chunk = os.read(self.read_fd, 1 << 16)
+        if not chunk:
+            return None
+        self.buffer += chunk
+        *lines, self.buffer = self.buffer.split(b"\n")
+        return [json.loads(line) for line in lines if line]
+
+    def receive_one(self) -> dict | None:
+        """Block until the next message; None at EOF."""
+        while b"\n" not in self.buffer:
+            chunk = os.read(self.read_fd, 1 << 16)
+            if not chunk:
+                return None
+            self.buffer += chunk
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def close(self):
+        for fd in (self.read_fd, self.write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+# ──────────────────────────────────────────────
+# COORDINATOR
+# ──────────────────────────────────────────────
+
+
+class Node:
+    """A browser server and the queue of tests assigned to it."""
+
+    def __init__(self, endpoint: str, capacity: int, engine: str, process=None):
+        self.endpoint = endpoint
+        self.capacity = capacity
+        self.engine = engine
+        self.process = process
+        self.queue = deque()
+        self.workers = []
+        self.alive = True
+        self.restarts = 0
+        self.completed = 0
+        self.stolen = 0
+        self.moved_in = 0
+
+    @property
+    def name(self) -> str:
+        return urlsplit(self.endpoint).netloc
+
+    def load(self) -> float:
+        return len(self.queue) / self.capacity
+
+    def reachable(self) -> bool:
+        url = urlsplit(self.endpoint)
+        port = url.port or (443 if url.scheme == "wss" else 80)
+        try:
+            socket.create_connection((url.hostname, port), timeout=PROBE_TIMEOUT).close()
+        except OSError:
+            return False
+        return True
+
+
+class Worker:
+    """A pytest subprocess running tests against one node."""
+
+    def __init__(self, node: Node, name: str, process: subprocess.Popen, channel: Channel):
+        self.node = node
+        self.name = name
+        self.process = process
+        self.channel = channel
+        self.inflight = []
+        self.reports = {}
+        self.waiting = False
+        self.done = False
+
+
+class Coordinator:
+    """Dispatches the session's tests to fleet workers and merges their reports."""
+
+    def __init__(self, config):
+        self.config = config
+        self.nodes = []
+        self.workers = []
+        self.items = {}
+        self.engines = {}
+        self.attempts = {}
+        self.lost = []
+        self.selector = selectors.DefaultSelector()
+        self.started = 0.0
+
+    # Fleet setup
+
+    def start_nodes(self):
+        option = self.config.option
+        default_engine, launch_args = cli_launch_args(self.config)
+        for spec in option.fleet_node:
+            engine, endpoint, capacity = parse_node(spec, option.fleet_capacity, default_engine)
+            self.nodes.append(Node(endpoint, capacity, engine))
+        for engine in (option.browser or [default_engine]) if option.fleet_local else ():
+            for _ in range(option.fleet_local):
+                process, endpoint = launch_server_process(engine, server_options(launch_args))
+                self.nodes.append(Node(endpoint, option.fleet_capacity, engine, process))
+
+    def live_nodes(self, engine: str) -> list[Node]:
+        return [node for node in self.nodes if node.alive and node.engine == engine]
+
+    def worker_command(self, node: Node, name: str) -> list[str]:
+        config = self.config
+        journal = config.pluginmanager.get_plugin("run-journal")
+        command = [
+            sys.executable, "-m", "pytest",
+            "-o", "addopts=", "-p", "no:cacheprovider", "-q",
+            f"--html={FLEET_DIR}/{name}.html", "--self-contained-html",
+            "--fleet-worker", "--browser-endpoint", node.endpoint,
+            "--no-history", "--journal", f"{FLEET_DIR}/{name}.journal.jsonl",
+            *passthrough_args(config.invocation_params.args),
+        ]
+        if journal is not None:
+            # Same generated data as a local run with this seed
+            command += ["--seed", str(journal.seed)]
+        return command + [str(arg) for arg in config.args]
+
+    def spawn(self, node: Node) -> Worker:
+        name = f"{node.name.replace(':', '-')}-w{len(node.workers) + node.restarts}"
+        to_worker_r, to_worker_w = os.pipe()
+        from_worker_r, from_worker_w = os.pipe()
+        log = open(os.path.join(FLEET_DIR, f"{name}.log"), "w", encoding="utf-8")
+        process = subprocess.Popen(
+            self.worker_command(node, name),
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            env={**os.environ, FDS_ENV: f"{to_worker_r},{from_worker_w}"},
+            pass_fds=(to_worker_r, from_worker_w),
+            cwd=self.config.rootpath,
+        )
+        log.close()
+        os.close(to_worker_r)
+        os.close(from_worker_w)
+        worker = Worker(node, name, process, Channel(from_worker_r, to_worker_w))
+        node.workers.append(worker)
+        self.workers.append(worker)
+        self.selector.register(worker.channel, selectors.EVENT_READ, worker)
+        return worker
+
+    def distribute(self, nodeids: list[str]):
+        """Split tests between their engine's live nodes by capacity, module by module."""
+        modules = {}
+        for nodeid in nodeids:
+            modules.setdefault((self.engines[nodeid], nodeid.split("::")[0]), []).append(nodeid)
+        for (engine, _), group in modules.items():
+            alive = self.live_nodes(engine)
+            if alive:
+                min(alive, key=Node.load).queue.extend(group)
+                continue
+            for nodeid in group:
+                self.lost.append(nodeid)
+                replay(self.items[nodeid], None, "error", 0.0, f"not run: no fleet node runs {engine}")
+
+    # Scheduling
+
+    def next_test(self, node: Node) -> str | None:
+        if node.queue:
+            return node.queue.popleft()
+        victims = [other for other in self.live_nodes(node.engine) if other is not node and other.queue]
+        if not victims:
+            return None
+        victim = max(victims, key=Node.load)
+        node.stolen += 1
+        return victim.queue.pop()
+
+    def busy(self) -> bool:
+        return any(node.alive and node.queue for node in self.nodes) or any(
+            worker.inflight for worker in self.workers if not worker.done
+        )
+
+    def assign(self, worker: Worker) -> bool:
+        nodeid = self.next_test(worker.node)
+        if nodeid is None:
+            return False
+        worker.inflight.append(nodeid)
+        worker.waiting = False
+        worker.channel.send({"type": "run", "nodeid": nodeid})
+        return True
+
+    def wake_waiting(self):
+        for worker in self.workers:
+            if worker.waiting and not worker.done and worker.node.alive and not self.assign(worker):
+                break
+
+    def finish(self, worker: Worker):
+        worker.done = True
+        worker.waiting = False
+        worker.channel.send({"type": "done"})
+
+    def move_slot(self, worker: Worker) -> bool:
+        """Retire a worker whose engine has no tests left, for one on a busier engine."""
+        if any(node.queue for node in self.live_nodes(worker.node.engine)):
+            return False
+        busiest = max(
+            (node for node in self.nodes if node.alive and node.engine != worker.node.engine),
+            key=lambda node: len(node.queue) / (node.capacity + node.moved_in), default=None,
+        )
+        if busiest is None or len(busiest.queue) < MIN_QUEUE_TO_MOVE:
+            return False
+        self.finish(worker)
+        busiest.moved_in += 1
+        self.spawn(busiest)
+        return True
+
+    # Messages
+
+    def handle(self, worker: Worker, message: dict):
+        kind = message["type"]
+        if kind == "need":
+            if self.session.shouldfail or self.session.shouldstop:
+                self.finish(worker)
+            elif not self.assign(worker) and not self.move_slot(worker):
+                if self.busy():
+                    # Tests still in flight elsewhere may come back if a node fails
+                    worker.waiting = not worker.inflight
+                    worker.channel.send({"type": "empty"})
+                else:
+                    self.finish(worker)
+        elif kind == "report":
+            worker.reports.setdefault(message["nodeid"], []).append(message["report"])
+        elif kind == "finished":
+            nodeid = message["nodeid"]
+            worker.inflight.remove(nodeid)
+            reports = worker.reports.pop(nodeid, [])
+            failed = any(report["outcome"] == "failed" for report in reports)
+            if failed and not worker.node.reachable():
+                self.requeue(nodeid)
+                self.node_lost(worker.node, "unreachable after a test failed")
+            else:
+                self.emit(nodeid, reports, worker.node)
+        elif kind == "missing":
+            # The worker collected a different set of tests; only this process knows the item
+            nodeid = message["nodeid"]
+            worker.inflight.remove(nodeid)
+            replay(self.items[nodeid], None, "error", 0.0, f"fleet worker {worker.name} did not collect {nodeid}")
+
+    def emit(self, nodeid: str, reports: list[dict], node: Node):
+        item = self.items[nodeid]
+        ihook = item.ihook
+        ihook.pytest_runtest_logstart(nodeid=nodeid, location=item.location)
+        for data in reports:
+            report = self.config.hook.pytest_report_from_serializable(config=self.config, data=data)
+            report.user_properties.append(("fleet_node", node.name))
+            ihook.pytest_runtest_logreport(report=report)
+        ihook.pytest_runtest_logfinish(nodeid=nodeid, location=item.location)
+        node.completed += 1
+
+    def requeue(self, nodeid: str):
+        self.attempts[nodeid] = self.attempts.get(nodeid, 0) + 1
+        alive = self.live_nodes(self.engines[nodeid])
+        if self.attempts[nodeid] >= MAX_ATTEMPTS or not alive:
+            reason = "its node or worker was lost" if alive else f"no {self.engines[nodeid]} fleet node is left"
+            self.lost.append(nodeid)
+            replay(self.items[nodeid], None, "error", 0.0, f"not run: {reason} ({self.attempts[nodeid]} attempts)")
+            return
+        min(alive, key=Node.load).queue.appendleft(nodeid)
+
+    # Failures
+
+    def drop_worker(self, worker: Worker):
+        worker.done = True
+        try:
+            self.selector.unregister(worker.channel)
+        except (KeyError, ValueError):
+            pass
+        if worker.process.poll() is None:
+            worker.process.kill()
+            worker.process.wait()
+        worker.channel.close()
+        inflight, worker.inflight = worker.inflight, []
+        for nodeid in inflight:
+            self.requeue(nodeid)
+
+    def worker_lost(self, worker: Worker):
+        node = worker.node
+        self.drop_worker(worker)
+        if not node.alive or not self.busy() or self.session.shouldfail or self.session.shouldstop:
+            return
+        if node.reachable() and node.restarts < MAX_RESTARTS:
+            node.restarts += 1
+            node.workers.remove(worker)
+            self.spawn(node)
+        else:
+            self.node_lost(node, f"worker exited, see {FLEET_DIR}/{worker.name}.log")
+        self.wake_waiting()
+
+    def node_lost(self, node: Node, reason: str):
+        if not node.alive:
+            return
+        node.alive = False
+        self.config.stash.setdefault(LOST_KEY, []).append(f"{node.endpoint}: {reason}")
+        for worker in node.workers:
+            if not worker.done:
+                self.drop_worker(worker)
+        queued, node.queue = list(node.queue), deque()
+        if self.live_nodes(node.engine):
+            self.distribute(queued)
+        else:
+            for nodeid in queued:
+                self.requeue(nodeid)
+        self.wake_waiting()
+
+    def staff(self):
+        """Give a worker to every live node that has tests queued but none left running."""
+        if self.session.shouldfail or self.session.shouldstop:
+            return
+        for node in self.nodes:
+            if node.alive and node.queue and all(worker.done for worker in node.workers):
+                self.spawn(node)
+
+    def probe(self):
+        for node in self.nodes:
+            if node.alive and not node.reachable():
+                self.node_lost(node, "unreachable")
+
+    # Main loop
+
+    def run(self, session) -> bool:
+        self.session = session
+        self.started = time.monotonic()
+        os.makedirs(FLEET_DIR, exist_ok=True)
+        self.items = {item.nodeid: item for item in session.items}
+        self.start_nodes()
+        # Tests without an engine parameter run on the default browser's nodes
+        default_engine = cli_launch_args(self.config)[0]
+        self.engines = {nodeid: item_engine(item) or default_engine for nodeid, item in self.items.items()}
+        self.distribute(list(self.items))
+        for node in self.nodes:
+            for _ in range(node.capacity):
+                self.spawn(node)
+
+        last_probe = time.monotonic()
+        try:
+            while any(not worker.done or worker.inflight for worker in self.workers):
+                for key, _ in self.selector.select(timeout=PROBE_INTERVAL):
+                    worker = key.data
+                    if worker.done and not worker.inflight:
+                        # Closing down: drain until the worker exits
+                        if worker.channel.receive() is None:
+                            self.selector.unregister(worker.channel)
+                        continue
+                    messages = worker.channel.receive()
+                    if messages is None:
+                        self.worker_lost(worker)
+                        continue
+                    for message in messages:
+                        self.handle(worker, message)
+                if time.monotonic() - last_probe > PROBE_INTERVAL:
+                    last_probe = time.monotonic()
+                    self.probe()
+                # Slots moved to other engines may leave requeued tests without a worker
+                self.staff()
+                if not self.busy():
+                    for worker in self.workers:
+                        if worker.waiting and not worker.done:
+                            self.finish(worker)
+        finally:
+            self.shutdown()
+        return True
+
+    def shutdown(self):
+        for worker in self.workers:
+            try:
+                worker.process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+            worker.channel.close()
+        for node in self.nodes:
+            if node.process is not None:
+                node.process.terminate()
+                node.process.wait()
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        alive = sum(node.alive for node in self.nodes)
+        text = (
+            f"{len(self.nodes)} nodes ({alive} alive at the end), "
+            f"{sum(node.capacity for node in self.nodes)} workers, {elapsed:.0f}s; "
+            + ", ".join(
+                f"{node.name} ({node.engine}) ran {node.completed} (stole {node.stolen}"
+                + (f", {node.moved_in} slots moved in)" if node.moved_in else ")")
+                for node in self.nodes
+            )
+        )
+        if self.lost:
+            text += f"; {len(self.lost)} tests lost"
+        return text
+
+    # Hooks
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        # Replaces the regular loop; the tab runner skips its local batch
+        # while a coordinator is registered (tabs.SESSION_DRIVERS)
+        if session.config.option.collectonly or not session.items:
+            return None
+        return self.run(session)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.nodes:
+            terminalreporter.write_line(f"fleet: {self.summary()}")
+            for reason in self.config.stash.get(LOST_KEY, []):
+                terminalreporter.write_line(f"  lost node {reason}")
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if self.nodes:
+            prefix.append(f"<p>Fleet: {self.summary()}.</p>")
+
+
+# ──────────────────────────────────────────────
+# WORKER
+# ──────────────────────────────────────────────
+
+
+class FleetWorker:
+    """Runs the tests the coordinator sends and streams the reports back."""
+
+    def __init__(self, config):
+        self.config = config
+        read_fd, write_fd = (int(fd) for fd in os.environ[FDS_ENV].split(","))
+        self.channel = Channel(read_fd, write_fd)
+        self.current = None
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+        self.channel.send({"type": "report", "nodeid": report.nodeid, "report": data})
+
+    def run_one(self, item, nextitem):
+        item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+        self.channel.send({"type": "finished", "nodeid": item.nodeid})
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        items = {item.nodeid: item for item in session.items}
+        # One test is kept in hand so the running one knows its successor
+        # and the fixtures they share stay up
+        pending = deque()
+        done = False
+        while True:
+            if not done and len(pending) < 2:
+                self.channel.send({"type": "need"})
+                message = self.channel.receive_one()
+                # With nothing in hand, wait for the coordinator to push a test or finish
+                while message is not None and message["type"] == "empty" and not pending:
+                    message = self.channel.receive_one()
+                if message is None or message["type"] == "done":
+                    done = True
+                elif message["type"] == "run":
+                    if message["nodeid"] in items:
+                        pending.append(items[message["nodeid"]])
+                    else:
+                        self.channel.send({"type": "missing", "nodeid": message["nodeid"]})
+                    continue
+                # "empty" with a test in hand: nothing to prefetch, run it now
+            if not pending:
+                break
+            item = pending.popleft()
+            self.run_one(item, pending[0] if pending else None)
+        return True
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("fleet", "distributed runs over browser servers")
+    group.addoption(
+        "--fleet-node", action="append", default=[], metavar="[ENGINE@]WS_ENDPOINT[=CAPACITY]",
+        help="Run tests on this Playwright browser server (repeatable; ENGINE defaults to the first --browser)",
+    )
+    group.addoption(
+        "--fleet-local", type=int, default=0, metavar="N",
+        help="Start N browser servers per --browser on this host and run tests on them",
+    )
+    group.addoption(
+        "--fleet-capacity", type=int, default=DEFAULT_CAPACITY,
+        help=f"Concurrent tests per node without an explicit capacity (default: {DEFAULT_CAPACITY})",
+    )
+    group.addoption("--fleet-worker", action="store_true", default=False, help=argparse.SUPPRESS)
+
+
+def pytest_configure(config):
+    option = config.option
+    if option.fleet_worker:
+        config.pluginmanager.register(FleetWorker(config), "fleet-worker")
+    elif (option.fleet_node or option.fleet_local) and not option.collectonly:
+        if option.fleet_capacity < 1:
+            raise pytest.UsageError("--fleet-capacity must be at least 1")
+        config.pluginmanager.register(Coordinator(config), "fleet-coordinator")
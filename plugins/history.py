@@ -0,0 +1,346 @@
+"""
+Local SQLite history of test results across runs.
+
+Every run appends one row per test (outcome, duration, category, BUG id,
+retries) plus a run-level environment record. The store answers the
+questions a single timestamped HTML report cannot: how flaky is a test,
+how is its duration trending, and which tests are getting slower.
+
+The HTML report gains a Flakiness column and a duration delta versus the
+rolling median of previous runs.
+
+Query from the command line:
+    python -m plugins.history flaky
+    python -m plugins.history trend "tests/test_login.py::TestLoginPositive::test_successful_login[chromium]"
+    python -m plugins.history growing
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+from datetime import datetime
+
+import pytest
+
+DEFAULT_DB = "reports/history.sqlite"
+
+# Oldest runs beyond this limit are evicted at the end of each session
+DEFAULT_MAX_RUNS = 200
+
+# Number of most recent runs used for flakiness and rolling medians
+WINDOW = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    environment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    category TEXT,
+    bug_id TEXT,
+    retries INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_results_nodeid ON results (nodeid, run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE TABLE IF NOT EXISTS waits (
+    run_id INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_waits_run ON waits (run_id);
+"""
+
+
+class HistoryStore:
+    """Append-only store of per-test results, bounded to `max_runs` runs."""
+
+    def __init__(self, path: str = DEFAULT_DB, max_runs: int = DEFAULT_MAX_RUNS):
+        self.path = path
+        self.max_runs = max_runs
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ── Writing ──────────────────────────────────
+
+    def start_run(self, environment: dict) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO runs (started_at, environment) VALUES (?, ?)",
+            (datetime.now().isoformat(timespec="seconds"), json.dumps(environment)),
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def record(self, run_id: int, rows: list[dict]):
+        """Insert result rows for a run in a single transaction."""
+        self.conn.executemany(
+            "INSERT INTO results (run_id, nodeid, outcome, duration, category, bug_id, retries) "
+            "VALUES (:run_id, :nodeid, :outcome, :duration, :category, :bug_id, :retries)",
+            [{"run_id": run_id, **row} for row in rows],
+        )
+        self.conn.commit()
+
+    def record_waits(self, run_id: int, samples: list[tuple[str, float]]):
+        """Insert (operation, seconds) latencies of successful waits (see plugins.timeouts)."""
+        self.conn.executemany(
+            "INSERT INTO waits (run_id, operation, duration) VALUES (?, ?, ?)",
+            [(run_id, operation, duration) for operation, duration in samples],
+        )
+        self.conn.commit()
+
+    def evict(self):
+        """Drop the oldest runs so at most `max_runs` remain."""
+        keep = "SELECT id FROM runs ORDER BY id DESC LIMIT ?"
+        self.conn.execute(f"DELETE FROM results WHERE run_id NOT IN ({keep})", (self.max_runs,))
+        self.conn.execute(f"DELETE FROM waits WHERE run_id NOT IN ({keep})", (self.max_runs,))
+        deleted = self.conn.execute(
+            f"DELETE FROM runs WHERE id NOT IN ({keep})", (self.max_runs,)
+        ).rowcount
+        self.conn.commit()
+        if deleted:
+            self.conn.execute("VACUUM")
+
+    # ── Queries ──────────────────────────────────
+
+    def recent(self, window: int = WINDOW) -> dict[str, list[tuple[str, float]]]:
+        """Return {nodeid: [(outcome, duration), ...]} oldest first, over the last `window` runs."""
+        rows = self.conn.execute(
+            "SELECT nodeid, outcome, duration FROM results "
+            "WHERE run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?) "
+            "ORDER BY nodeid, run_id",
+            (window,),
+        ).fetchall()
+        history: dict[str, list[tuple[str, float]]] = {}
+        for nodeid, outcome, duration in rows:
+            history.setdefault(nodeid, []).append((outcome, duration))
+        return history
+
+    def wait_latencies(self, window: int = WINDOW) -> dict[str, list[float]]:
+        """Return {operation: [seconds, ...]} over the last `window` runs."""
+        rows = self.conn.execute(
+            "SELECT operation, duration FROM waits "
+            "WHERE run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)",
+            (window,),
+        ).fetchall()
+        latencies: dict[str, list[float]] = {}
+        for operation, duration in rows:
+            latencies.setdefault(operation, []).append(duration)
+        return latencies
+
+    def flakiness(self, window: int = WINDOW) -> dict[str, float]:
+        """Per-test flakiness: share of consecutive runs where the outcome flipped."""
+        return {
+            nodeid: flakiness_score([outcome for outcome, _ in results])
+            for nodeid, results in self.recent(window).items()
+        }
+
+    def failure_rates(self, window: int = WINDOW) -> dict[str, float]:
+        """Per-test share of failed or errored runs in the window."""
+        return {
+            nodeid: failure_rate([outcome for outcome, _ in results])
+            for nodeid, results in self.recent(window).items()
+        }
+
+    def duration_trend(self, nodeid: str) -> list[tuple[str, float]]:
+        """Return [(run started_at, duration), ...] for one test, oldest first."""
+        return self.conn.execute(
+            "SELECT runs.started_at, results.duration FROM results "
+            "JOIN runs ON runs.id = results.run_id "
+            "WHERE results.nodeid = ? ORDER BY results.run_id",
+            (nodeid,),
+        ).fetchall()
+
+    def slowest_growing(self, limit: int = 10, window: int = WINDOW) -> list[tuple[str, float]]:
+        """Return tests whose duration grows fastest, as (nodeid, seconds per run)."""
+        slopes = []
+        for nodeid, results in self.recent(window).items():
+            durations = [duration for _, duration in results]
+            if len(durations) < 3:
+                continue
+            slope, _ = statistics.linear_regression(range(len(durations)), durations)
+            slopes.append((nodeid, slope))
+        slopes.sort(key=lambda item: item[1], reverse=True)
+        return slopes[:limit]
+
+
+def flakiness_score(outcomes: list[str]) -> float:
+    """Fraction of consecutive pass/fail transitions; skipped runs are ignored."""
+    relevant = ["passed" if outcome == "passed" else "failed" for outcome in outcomes if outcome != "skipped"]
+    if len(relevant) < 2:
+        return 0.0
+    flips = sum(1 for prev, cur in zip(relevant, relevant[1:]) if prev != cur)
+    return flips / (len(relevant) - 1)
+
+
+def failure_rate(outcomes: list[str]) -> float:
+    relevant = [outcome for outcome in outcomes if outcome != "skipped"]
+    if not relevant:
+        return 0.0
+    return sum(1 for outcome in relevant if outcome != "passed") / len(relevant)
+
+
+def run_environment(config) -> dict:
+    """Describe the environment a run executed in."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "browsers": getattr(config.option, "browser", None) or ["chromium"],
+        "headed": bool(getattr(config.option, "headed", False)),
+        "ci": bool(os.environ.get("CI")),
+    }
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("history", "test-history store")
+    group.addoption(
+        "--history-db", default=DEFAULT_DB,
+        help=f"SQLite file that accumulates results across runs (default: {DEFAULT_DB})",
+    )
+    group.addoption(
+        "--history-max-runs", type=int, default=DEFAULT_MAX_RUNS,
+        help="Number of runs kept in the history database before the oldest are evicted",
+    )
+    group.addoption(
+        "--no-history", action="store_true", default=False,
+        help="Do not record this run in the history database",
+    )
+
+
+def pytest_configure(config):
+    if config.option.no_history or config.option.collectonly:
+        return
+    store = HistoryStore(config.option.history_db, config.option.history_max_runs)
+    config.pluginmanager.register(HistoryRecorder(store, config), "history-recorder")
+
+
+class HistoryRecorder:
+    """Collects final per-test outcomes and writes them to the history store."""
+
+    def __init__(self, store: HistoryStore, config):
+        self.store = store
+        self.config = config
+        self.run_id = None
+        self.previous = {}
+        self.pending = []
+        self.phases = {}
+        self.row_stats = {}
+
+    def pytest_sessionstart(self, session):
+        self.previous = self.store.recent(WINDOW)
+        self.run_id = self.store.start_run(run_environment(self.config))
+
+    def pytest_runtest_logreport(self, report):
+        phases = self.phases.setdefault(report.nodeid, [])
+        phases.append(report)
+        if report.when != "teardown" or report.outcome == "rerun":
+            return
+
+        del self.phases[report.nodeid]
+        outcome = final_outcome(phases)
+        duration = sum(r.duration for r in phases if r.outcome != "rerun")
+        call = next((r for r in phases if r.when == "call"), phases[0])
+        self.pending.append({
+            "nodeid": report.nodeid,
+            "outcome": outcome,
+            "duration": duration,
+            "category": getattr(call, "category", ""),
+            "bug_id": getattr(call, "bug_id", "") or None,
+            "retries": sum(1 for r in phases if r.outcome == "rerun" and r.when == "call"),
+        })
+
+        past = self.previous.get(report.nodeid, [])
+        past_durations = [d for o, d in past]
+        self.row_stats[report.nodeid] = {
+            "flakiness": flakiness_score([o for o, _ in past] + [outcome]) if past else None,
+            "delta": duration - statistics.median(past_durations) if past_durations else None,
+        }
+
+        if len(self.pending) >= 50:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.store.record(self.run_id, self.pending)
+            self.pending = []
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        self.flush()
+        self.store.evict()
+        self.store.close()
+
+    def pytest_html_results_table_header(self, cells):
+        cells.append("<th>Flakiness</th>")
+        cells.append("<th>&Delta; Median</th>")
+
+    def pytest_html_results_table_row(self, report, cells):
+        stats = self.row_stats.get(report.nodeid, {})
+        flakiness = stats.get("flakiness")
+        delta = stats.get("delta")
+        cells.append(f"<td>{'-' if flakiness is None else f'{flakiness:.0%}'}</td>")
+        cells.append(f"<td>{'-' if delta is None else f'{delta:+.2f}s'}</td>")
+
+
+def final_outcome(phases) -> str:
+    """Collapse setup/call/teardown reports into one test outcome."""
+    for report in phases:
+        if report.failed and report.when != "call":
+            return "error"
+    call = next((r for r in phases if r.when == "call" and r.outcome != "rerun"), None)
+    if call is not None:
+        return call.outcome
+    return "skipped" if any(r.skipped for r in phases) else "passed"
+
+
+# ──────────────────────────────────────────────
+# COMMAND LINE QUERIES
+# ──────────────────────────────────────────────
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m plugins.history", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--window", type=int, default=WINDOW)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("flaky", help="List tests by flakiness rate")
+    trend = sub.add_parser("trend", help="Show duration trend of one test")
+    trend.add_argument("nodeid")
+    growing = sub.add_parser("growing", help="List tests whose duration grows fastest")
+    growing.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    if args.command == "flaky":
+        failures = store.failure_rates(args.window)
+        ranked = sorted(store.flakiness(args.window).items(), key=lambda item: item[1], reverse=True)
+        for nodeid, score in ranked:
+            if score > 0:
+                print(f"{score:6.0%}  fail {failures[nodeid]:4.0%}  {nodeid}")
+    elif args.command == "trend":
+        for started_at, duration in store.duration_trend(args.nodeid):
+            print(f"{started_at}  {duration:7.2f}s")
+    elif args.command == "growing":
+        for nodeid, slope in store.slowest_growing(args.limit, args.window):
+            print(f"{slope:+7.3f}s/run  {nodeid}")
+    store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,419 @@
+"""
+Test impact analysis: which tests can a change break?
+
+The index maps every test to the symbols it exercises, at member
+granularity: page object methods and locator constants
+(`DashboardPage.REWARDS_POINTS`, `RegisterPage.EMAIL_ERROR`), fixtures,
+test data constants (`utils/test_data.py:MOBILE_VIEWPORT`) and the test
+itself. It combines:
+
+- a recorded run (`--impact-record`): the page object methods each test
+  actually called, taken from the action timer in plugins.timing
+- static analysis (ast) of the test sources in plugins/sources.py -
+  tests, fixtures, page objects and the journey steps: `self.LOCATOR`
+  and `self.method()` inside page objects, class attributes and
+  constructors used by tests, page objects from `journey.on(...)`,
+  journey markers, fixture requests and module-level names. Members
+  of an async page object that come from its sync class resolve to
+  the sync class
+
+and is stored in INDEX_PATH. Given a diff, the changed lines are mapped
+to the symbols that contain them, and only tests using one of those are
+affected - in milliseconds, without importing anything:
+
+    python -m plugins.impact affected --base origin/main
+    git diff | python -m plugins.impact affected --diff -
+    python -m pytest --affected-by origin/main
+
+Changes outside those sources that can change test behaviour (other
+plugins, pytest.ini, requirements.txt) and changed pytest hooks select
+every test; documentation and CI files select none. Tests that
+are not in the index yet (new tests) are always selected.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from plugins.sources import MODULE, ROOT, SourceFile, SourceIndex, is_hook, params
+
+INDEX_PATH = "reports/impact-index.json"
+
+# Changed files outside the analysed sources that never affect test outcomes
+IGNORED = re.compile(r"(^docs/|^reports/|^\.github/|^\.vscode/|\.md$|^\.gitignore$|^assets/)")
+
+HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def _key(relpath: str, qualname: str) -> str:
+    return f"{relpath}:{qualname}"
+
+
+class SourceModel(SourceIndex):
+    """The shared source index plus member-level references for the impact index."""
+
+    def member(self, relpath: str, cls: str, attr: str) -> str | None:
+        """Key of `cls.attr`, looked up through the project base classes and,
+        for an async page object, the sync class it shares locators with."""
+        model = self.files.get(relpath)
+        if model is None:
+            return None
+        if f"{cls}.{attr}" in model.nodes:
+            return _key(relpath, f"{cls}.{attr}")
+        owners = [self.resolve(model, base) for base in model.bases.get(cls, ())]
+        owners.append(self.counterpart(relpath, cls))
+        for target in owners:
+            if target is not None:
+                found = self.member(target[0], target[1], attr)
+                if found:
+                    return found
+        return None
+
+    def _fixture(self, model: SourceFile, qualname: str, name: str) -> str | None:
+        target = self.fixture(model, qualname, name)
+        return _key(*target) if target is not None else None
+
+    def _class(self, model: SourceFile, name: str) -> tuple[str, str] | None:
+        target = self.resolve(model, name)
+        if target is not None and isinstance(self.files[target[0]].nodes[target[1]], ast.ClassDef):
+            return target
+        return None
+
+    def _created(self, model: SourceFile, call) -> tuple[str, str] | None:
+        """Page object class of `LoginPage(page)`, `journey.on(LoginPage)` or,
+        since page object actions return the page object, `LoginPage(page).open()`
+        (awaited or not)."""
+        if isinstance(call, ast.Await):
+            call = call.value
+        if not isinstance(call, ast.Call):
+            return None
+        if isinstance(call.func, ast.Name):
+            return self._class(model, call.func.id)
+        if not isinstance(call.func, ast.Attribute):
+            return None
+        if call.func.attr == "on" and len(call.args) == 1 and isinstance(call.args[0], ast.Name):
+            return self._class(model, call.args[0].id)
+        return self._created(model, call.func.value)
+
+    def _annotated(self, model: SourceFile, annotation) -> list:
+        """Classes in a return annotation: `LoginPage` or `tuple[DashboardPage, dict]`."""
+        if isinstance(annotation, ast.Name):
+            return [self._class(model, annotation.id)]
+        if isinstance(annotation, ast.Subscript) and isinstance(annotation.slice, ast.Tuple):
+            return [self._class(model, e.id) if isinstance(e, ast.Name) else None for e in annotation.slice.elts]
+        return []
+
+    def _instance_types(self, model: SourceFile, qualname: str, node) -> dict[str, tuple[str, str]]:
+        """Page object classes of local names: `fp = ForgotPasswordPage(page)`,
+        `dashboard = journey.on(DashboardPage)`, fixtures annotated `-> LoginPage`
+        and `dashboard, user = authenticated_page`."""
+        types, returns = {}, {}
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for name in params(node):
+                fixture = self._fixture(model, qualname, name)
+                if fixture is None:
+                    continue
+                fixture_path, fixture_name = fixture.split(":", 1)
+                fixture_model = self.files[fixture_path]
+                returns[name] = self._annotated(fixture_model, fixture_model.nodes[fixture_name].returns)
+                if len(returns[name]) == 1 and returns[name][0] is not None:
+                    types[name] = returns[name][0]
+        for sub in ast.walk(node):
+            if not isinstance(sub, ast.Assign) or len(sub.targets) != 1:
+                continue
+            target, value = sub.targets[0], sub.value
+            if isinstance(value, (ast.Call, ast.Await)) and isinstance(target, ast.Name):
+                cls = self._created(model, value)
+                if cls is not None:
+                    types[target.id] = cls
+            elif isinstance(value, ast.Name) and isinstance(target, ast.Tuple) and value.id in returns:
+                for element, cls in zip(target.elts, returns[value.id]):
+                    if isinstance(element, ast.Name) and cls is not None:
+                        types[element.id] = cls
+        return types
+
+    def references(self, key: str) -> set[str]:
+        """Symbols directly used by the symbol `key`."""
+        relpath, qualname = key.split(":", 1)
+        model = self.files.get(relpath)
+        node = model.nodes.get(qualname) if model else None
+        if node is None:
+            return set()
+        refs = {_key(relpath, MODULE)}
+        owner = qualname.split(".")[0] if "." in qualname else None
+        if owner:
+            refs.add(_key(relpath, owner))
+        if isinstance(node, ast.ClassDef):
+            # Class decorators apply to every member: @pytest.mark.journey(SIGNED_IN)
+            for decorator in node.decorator_list:
+                for sub in ast.walk(decorator):
+                    target = self.resolve(model, sub.id) if isinstance(sub, ast.Name) else None
+                    if target is not None:
+                        refs.add(_key(*target))
+            return refs
+
+        instances = self._instance_types(model, qualname, node)
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Attribute) and isinstance(sub.value, ast.Name):
+                name = sub.value.id
+                if name == "self" and owner and not owner.startswith("Test"):
+                    found = self.member(relpath, owner, sub.attr)
+                    if found:
+                        refs.add(found)
+                    continue
+                target = instances.get(name) or self._class(model, name)
+                if target is not None:
+                    refs.add(self.member(*target, sub.attr) or _key(*target))
+                    continue
+            if isinstance(sub, ast.Attribute) and isinstance(sub.value, ast.Call):
+                # state.on(RegisterPage).open()
+                target = self._created(model, sub.value)
+                if target is not None:
+                    refs.add(self.member(*target, sub.attr) or _key(*target))
+                    continue
+            if isinstance(sub, ast.Call) and isinstance(sub.func, ast.Name):
+                target = self._class(model, sub.func.id)
+                if target is not None:
+                    refs.add(self.member(*target, "__init__") or _key(*target))
+                    continue
+            if isinstance(sub, ast.Name):
+                # Classes included: `journey.on(DashboardPage)` depends on the class's own lines
+                target = self.resolve(model, sub.id)
+                if target is not None:
+                    refs.add(_key(*target))
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for name in params(node):
+                found = self._fixture(model, qualname, name)
+                if found:
+                    refs.add(found)
+        return refs
+
+    def closure(self, seeds) -> set[str]:
+        seen, pending = set(), list(seeds)
+        while pending:
+            key = pending.pop()
+            if key not in seen:
+                seen.add(key)
+                pending.extend(self.references(key))
+        return seen
+
+    def test_key(self, nodeid: str) -> str:
+        path, _, rest = nodeid.split("[")[0].partition("::")
+        return _key(path, rest.replace("::", "."))
+
+
+def function_key(func, root: Path = ROOT) -> str | None:
+    try:
+        relpath = Path(func.__code__.co_filename).resolve().relative_to(root).as_posix()
+    except ValueError:
+        return None
+    return _key(relpath, func.__qualname__)
+
+
+# ──────────────────────────────────────────────
+# INDEX AND DIFFS
+# ──────────────────────────────────────────────
+
+
+def load_index(path: str = INDEX_PATH) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"tests": {}}
+
+
+def save_index(index: dict, path: str = INDEX_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=0, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def changed_lines(diff: str) -> dict[str, set[int] | None]:
+    """Changed new-side line numbers per file; None for deleted files."""
+    files, current = {}, None
+    lines = diff.splitlines()
+    for number, line in enumerate(lines):
+        if line.startswith("--- ") and number + 1 < len(lines) and lines[number + 1].startswith("+++ "):
+            old = line[4:].strip().removeprefix("a/")
+            new = lines[number + 1][4:].strip()
+            if new == "/dev/null":
+                files[old], current = None, None
+            else:
+                current = new.removeprefix("b/")
+                files.setdefault(current, set())
+        elif current is not None and (match := HUNK.match(line)):
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            # A pure deletion still touches the symbol around its position
+            files[current].update(range(start, start + max(count, 1)))
+    return files
+
+
+def changed_symbols(model: SourceModel, diff: str) -> tuple[set[str], str | None]:
+    """Keys of the changed symbols, or (_, reason) when every test is affected."""
+    changed = set()
+    for relpath, lines in changed_lines(diff).items():
+        if IGNORED.search(relpath):
+            continue
+        if relpath not in model.files and not relpath.startswith(("pages/", "tests/", "utils/")):
+            if relpath.endswith(".py") or relpath in ("pytest.ini", "requirements.txt"):
+                return changed, f"{relpath} changed"
+            continue
+        if lines is None or relpath not in model.files:
+            # Deleted (or unparsable) file: everything that used it
+            changed.add(f"{relpath}:*")
+            continue
+        file_model = model.files[relpath]
+        for line in lines:
+            symbol = file_model.symbol_at(line)
+            if is_hook(relpath, symbol):
+                return changed, f"pytest hook {relpath}:{symbol} changed"
+            changed.add(_key(relpath, symbol))
+    return changed, None
+
+
+def affected_tests(index: dict, model: SourceModel, diff: str) -> tuple[list[str] | None, str]:
+    """Node ids affected by `diff`; None means all tests."""
+    if not index["tests"]:
+        return None, "no impact index recorded yet"
+    changed, everything = changed_symbols(model, diff)
+    if everything:
+        return None, everything
+    deleted = {key[:-2] for key in changed if key.endswith(":*")}
+
+    def hit(symbols) -> bool:
+        return any(s in changed or s.split(":", 1)[0] in deleted for s in symbols)
+
+    selected = [nodeid for nodeid, symbols in index["tests"].items() if hit(symbols)]
+    known = {model.test_key(nodeid) for nodeid in index["tests"]}
+    for relpath, file_model in model.files.items():
+        for test in file_model.tests:
+            if relpath.startswith("tests/") and _key(relpath, test) not in known:
+                selected.append(f"{relpath}::{test.replace('.', '::')}")
+    return sorted(selected), f"{len(changed)} changed symbols"
+
+
+def git_diff(base: str) -> str:
+    return subprocess.run(
+        ["git", "diff", "--unified=0", base, "--"], cwd=ROOT,
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "test impact analysis")
+    group.addoption(
+        "--impact-record", action="store_true", default=False,
+        help=f"Record which symbols each test exercises into {INDEX_PATH}",
+    )
+    group.addoption(
+        "--affected-by", metavar="REV", default=None,
+        help="Run only the tests affected by `git diff REV` according to the impact index",
+    )
+
+
+def pytest_configure(config):
+    if config.option.collectonly and not config.option.affected_by:
+        return
+    if config.option.impact_record or config.option.affected_by:
+        config.pluginmanager.register(ImpactPlugin(config), "impact")
+
+
+class ImpactPlugin:
+    """Records the impact index and selects affected tests."""
+
+    def __init__(self, config):
+        self.config = config
+        self.note = None
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        base = config.option.affected_by
+        if not base:
+            return
+        model = SourceModel()
+        selected, reason = affected_tests(load_index(), model, git_diff(base))
+        if selected is None:
+            self.note = f"impact: running all tests ({reason})"
+            return
+        prefixes = tuple(selected)
+        keep, dropped = [], []
+        for item in items:
+            nodeid = item.nodeid
+            (keep if nodeid in prefixes or nodeid.split("[")[0] in prefixes else dropped).append(item)
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+            items[:] = keep
+        self.note = f"impact: {len(keep)} of {len(keep) + len(dropped)} tests affected by {base} ({reason})"
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        return self.note
+
+    def pytest_sessionfinish(self, session):
+        if not self.config.option.impact_record:
+            return
+        timing = self.config.pluginmanager.get_plugin("action-timing")
+        used = timing.timer.used if timing is not None else {}
+        model = SourceModel()
+        index = load_index()
+        for item in session.items:
+            if not hasattr(item, "function"):
+                continue
+            seeds = {model.test_key(item.nodeid)}
+            seeds.update(key for key in map(function_key, used.get(item.nodeid, ())) if key)
+            index["tests"][item.nodeid] = sorted(model.closure(seeds))
+        index["recorded_at"] = datetime.now().isoformat(timespec="seconds")
+        save_index(index)
+
+
+# ──────────────────────────────────────────────
+# COMMAND LINE
+# ──────────────────────────────────────────────
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m plugins.impact", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--index", default=INDEX_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    affected = sub.add_parser("affected", help="Print the node ids affected by a diff")
+    source = affected.add_mutually_exclusive_group()
+    source.add_argument("--base", default="HEAD", help="Diff the working tree against this revision (default: HEAD)")
+    source.add_argument("--diff", help="Read a unified diff from this file ('-' for stdin)")
+    show = sub.add_parser("show", help="Print the symbols a test exercises")
+    show.add_argument("nodeid")
+    args = parser.parse_args(argv)
+
+    index = load_index(args.index)
+    if args.command == "show":
+        for symbol in index["tests"].get(args.nodeid, []):
+            print(symbol)
+        return 0
+
+    if args.diff:
+        diff = sys.stdin.read() if args.diff == "-" else Path(args.diff).read_text(encoding="utf-8")
+    else:
+        diff = git_diff(args.base)
+    selected, reason = affected_tests(index, SourceModel(), diff)
+    print(f"# {reason}", file=sys.stderr)
+    if selected is None:
+        print("tests")
+    else:
+        print("\n".join(selected))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""
+Incremental run cache (opt-in with `--incremental`).
+
+A test that passed last time is not run again while both of these are
+unchanged:
+
+- its source fingerprint: the test function, every project fixture it
+  requests, the page object and test data modules they reference
+  (e.g. pages/login_page.py, utils/test_data.py) and their imports
+- the app fingerprint: a hash of the four pages' HTML plus the scripts
+  and stylesheets they load, revalidated with ETag / Last-Modified so an
+  unchanged deployment costs four 304 responses
+
+If the app cannot be reached the cache is bypassed for the whole run.
+Reused results are reported as passed and marked "cached" in the HTML
+report. Fingerprints and results live in pytest's cache directory.
+"""
+
+import hashlib
+import html
+import inspect
+import sys
+import urllib.error
+import urllib.request
+from datetime import datetime
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+import pytest
+
+from pages.dashboard_page import DashboardPage
+from pages.forgot_password_page import ForgotPasswordPage
+from pages.login_page import LoginPage
+from pages.register_page import RegisterPage
+from plugins.replay import replay
+
+ROOT = Path(__file__).resolve().parent.parent
+
+APP_PAGES = [LoginPage.URL, RegisterPage.URL, ForgotPasswordPage.URL, DashboardPage.URL]
+
+RESULTS_KEY = "incremental/results"
+ASSETS_KEY = "incremental/assets"
+
+FETCH_TIMEOUT = 5
+
+
+# ──────────────────────────────────────────────
+# SOURCE FINGERPRINTS
+# ──────────────────────────────────────────────
+
+
+def is_project_module(module) -> bool:
+    path = getattr(module, "__file__", None)
+    if not path:
+        return False
+    resolved = Path(path).resolve()
+    return resolved.is_relative_to(ROOT) and "site-packages" not in resolved.parts
+
+
+def owner_module(obj):
+    if inspect.ismodule(obj):
+        return obj
+    if inspect.isclass(obj) or inspect.isfunction(obj):
+        return sys.modules.get(obj.__module__)
+    return None
+
+
+@lru_cache(maxsize=None)
+def file_digest(path: str) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def module_closure(name: str) -> frozenset[str]:
+    """Return source files of a project module and the project modules it imports."""
+    files, pending, seen = set(), [name], set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        module = sys.modules.get(current)
+        if module is None or not is_project_module(module):
+            continue
+        files.add(module.__file__)
+        for value in vars(module).values():
+            dependency = owner_module(value)
+            if dependency is not None and is_project_module(dependency):
+                pending.append(dependency.__name__)
+    return frozenset(files)
+
+
+def referenced_names(code) -> set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= referenced_names(const)
+    return names
+
+
+def constant_origin(name: str, value, home):
+    """Return the project module a module-level constant was imported from."""
+    for module in list(sys.modules.values()):
+        if module is home or not is_project_module(module):
+            continue
+        if getattr(module, name, None) is value and name in vars(module):
+            return module
+    return None
+
+
+def collect_function(func, parts: dict, seen: set):
+    """Add a function's source and everything it references to `parts`."""
+    key = f"{func.__module__}.{func.__qualname__}"
+    if key in seen:
+        return
+    seen.add(key)
+    try:
+        parts[f"func:{key}"] = inspect.getsource(func)
+    except (OSError, TypeError):
+        return
+
+    home = sys.modules.get(func.__module__)
+    for name in referenced_names(func.__code__):
+        if name not in func.__globals__:
+            continue
+        value = func.__globals__[name]
+        module = owner_module(value)
+        if module is None:
+            module = constant_origin(name, value, home)
+            if module is None:
+                parts[f"const:{key}:{name}"] = repr(value)
+                continue
+        if not is_project_module(module):
+            continue
+        if module is home and inspect.isfunction(value):
+            collect_function(value, parts, seen)
+            continue
+        for path in module_closure(module.__name__):
+            parts[f"file:{path}"] = file_digest(path)
+
+
+def source_fingerprint(item) -> str:
+    """Fingerprint the code a test executes: test, fixtures, page objects, data."""
+    parts, seen = {}, set()
+    collect_function(item.function, parts, seen)
+    for name in item.fixturenames:
+        for fixturedef in item._fixtureinfo.name2fixturedefs.get(name, ()):
+            module = sys.modules.get(getattr(fixturedef.func, "__module__", ""))
+            if module is not None and is_project_module(module):
+                collect_function(inspect.unwrap(fixturedef.func), parts, seen)
+    digest = hashlib.sha256()
+    for key in sorted(parts):
+        digest.update(key.encode())
+        digest.update(parts[key].encode())
+    return digest.hexdigest()
+
+
+# ──────────────────────────────────────────────
+# APP FINGERPRINT
+# ──────────────────────────────────────────────
+
+
+class AssetLinks(HTMLParser):
+    """Collect script and stylesheet URLs referenced by a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.urls.append(attrs["src"])
+        elif tag == "link" and "stylesheet" in (attrs.get("rel") or "") and attrs.get("href"):
+            self.urls.append(attrs["href"])
+
+
+def fetch(url: str, known: dict) -> tuple[dict, bytes | None]:
+    """Fetch `url`, revalidating with the stored ETag / Last-Modified.
+
+    Returns the new cache entry and the body (None when unchanged).
+    """
+    request = urllib.request.Request(url)
+    if known.get("etag"):
+        request.add_header("If-None-Match", known["etag"])
+    if known.get("last_modified"):
+        request.add_header("If-Modified-Since", known["last_modified"])
+    try:
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            body = response.read()
+            return {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha": hashlib.sha256(body).hexdigest(),
+            }, body
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304 and known.get("sha"):
+            return known, None
+        raise
+
+
+def app_fingerprint(cache) -> str | None:
+    """Hash the app's pages and their JS/CSS; None if the app is unreachable."""
+    known = cache.get(ASSETS_KEY, {})
+    entries, pending, seen = {}, list(APP_PAGES), set()
+    try:
+        while pending:
+            url = pending.pop(0)
+            if url in seen:
+                continue
+            seen.add(url)
+            entry, body = fetch(url, known.get(url, {}))
+            entries[url] = entry
+            if url in APP_PAGES:
+                if body is None:
+                    links = known.get(url, {}).get("assets", [])
+                else:
+                    parser = AssetLinks()
+                    parser.feed(body.decode("utf-8", errors="replace"))
+                    links = [
+                        urljoin(url, src) for src in parser.urls
+                        if urlparse(urljoin(url, src)).netloc == urlparse(url).netloc
+                    ]
+                entry["assets"] = links
+                pending.extend(links)
+    except (urllib.error.URLError, OSError):
+        return None
+
+    cache.set(ASSETS_KEY, entries)
+    digest = hashlib.sha256()
+    for url in sorted(entries):
+        digest.update(f"{url}={entries[url]['sha']}".encode())
+    return digest.hexdigest()
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("incremental", "incremental run cache")
+    group.addoption(
+        "--incremental", action="store_true", default=False,
+        help="Reuse passing results of tests whose source and target app assets are unchanged",
+    )
+    group.addoption(
+        "--incremental-reset", action="store_true", default=False,
+        help="Forget all cached results before running",
+    )
+
+
+def pytest_configure(config):
+    if config.option.incremental and config.cache is not None:
+        config.pluginmanager.register(IncrementalCache(config), "incremental-cache")
+
+
+class IncrementalCache:
+    """Skips unchanged passing tests and records new passes."""
+
+    def __init__(self, config):
+        self.config = config
+        self.cache = config.cache
+        self.results = {} if config.option.incremental_reset else config.cache.get(RESULTS_KEY, {})
+        self.app = None
+        self.sources = {}
+        self.outcomes = {}
+        self.durations = {}
+        self.reused = 0
+
+    def pytest_sessionstart(self, session):
+        self.app = app_fingerprint(self.cache)
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        for item in items:
+            if hasattr(item, "function"):
+                self.sources[item.nodeid] = source_fingerprint(item)
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        if self.app is None:
+            return "incremental: target app unreachable, cache bypassed for this run"
+        return f"incremental: {len(self.results)} cached results available"
+
+    def replays(self, item) -> bool:
+        """Whether `item` is reported from the cache instead of running."""
+        entry = self.results.get(item.nodeid)
+        return not (
+            self.app is None
+            or entry is None
+            or entry["source"] != self.sources.get(item.nodeid)
+            or entry["app"] != self.app
+        )
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not self.replays(item):
+            return None
+        entry = self.results[item.nodeid]
+        replay(
+            item, nextitem, "passed", entry["duration"],
+            cached=True, cached_at=entry["passed_at"],
+        )
+        self.reused += 1
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        if getattr(report, "cached", False) or report.outcome == "rerun":
+            return
+        if report.failed:
+            self.outcomes[report.nodeid] = "failed"
+        elif report.when == "call":
+            self.outcomes.setdefault(report.nodeid, report.outcome)
+            self.durations[report.nodeid] = report.duration
+
+        if report.when != "teardown":
+            return
+        outcome = self.outcomes.pop(report.nodeid, None)
+        duration = self.durations.pop(report.nodeid, 0.0)
+        source = self.sources.get(report.nodeid)
+        if outcome == "passed" and self.app is not None and source is not None:
+            self.results[report.nodeid] = {
+                "source": source,
+                "app": self.app,
+                "duration": duration,
+                "passed_at": datetime.now().isoformat(timespec="seconds"),
+            }
+        else:
+            self.results.pop(report.nodeid, None)
+
+    def pytest_sessionfinish(self, session):
+        self.cache.set(RESULTS_KEY, self.results)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.reused:
+            terminalreporter.write_line(f"incremental: {self.reused} results reused from cache")
+
+    def pytest_html_results_table_row(self, report, cells):
+        if getattr(report, "cached", False):
+            cells[0] = cells[0].replace("</td>", ' <span class="cached-badge">cached</span></td>')
+
+    def pytest_html_results_table_html(self, report, data):
+        if getattr(report, "cached", False):
+            data.append(
+                '<div class="cached-note">Result reused from the passing run at '
+                f"{html.escape(report.cached_at)}: test source and app assets unchanged.</div>"
+            )
@@ -0,0 +1,217 @@
+"""
+Append-only run journal for crash-safe long runs.
+
+Every run writes `reports/journal.jsonl`: a session record with the test
+order and random seed, then one result record per test as soon as its
+teardown finishes (flushed and fsynced, so a browser crash or CI timeout
+loses at most the test in flight).
+
+`--resume` continues an interrupted run: the recorded order and seed are
+reused, tests already in the journal are replayed from it instead of
+running again, and the HTML report therefore contains the results of
+all partial attempts.
+
+Each test seeds `random` from the run seed and its node id, so its data
+(e.g. `random_email()`) does not depend on which tests ran before it,
+and `--seed` reproduces a run's data. A resumed attempt also mixes in
+its attempt number: the test that was in flight at the crash may have
+registered its address already, and the app rejects duplicates
+(TC-025), so it must not generate the same one again.
+"""
+
+import json
+import os
+import random
+from datetime import datetime
+
+import pytest
+
+from plugins.history import final_outcome
+from plugins.replay import replay
+
+DEFAULT_JOURNAL = "reports/journal.jsonl"
+
+
+def read_journal(path: str) -> list[dict]:
+    """Return journal records, ignoring a torn last line from a crash."""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
+
+
+class Journal:
+    """Writer for one journal file; every record is durable once written."""
+
+    def __init__(self, path: str, truncate: bool):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "w" if truncate else "a", encoding="utf-8")
+
+    def write(self, record: dict):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("journal", "resumable run journal")
+    group.addoption(
+        "--journal", default=DEFAULT_JOURNAL,
+        help=f"Append-only journal of finished tests (default: {DEFAULT_JOURNAL})",
+    )
+    group.addoption(
+        "--resume", action="store_true", default=False,
+        help="Continue the run recorded in the journal, skipping tests that already finished",
+    )
+    group.addoption(
+        "--seed", type=int, default=None,
+        help="Seed for generated test data (default: random, or the journal's seed with --resume)",
+    )
+
+
+def pytest_configure(config):
+    if config.option.collectonly:
+        return
+    config.pluginmanager.register(RunJournal(config), "run-journal")
+
+
+class RunJournal:
+    """Writes the journal and replays finished tests when resuming."""
+
+    def __init__(self, config):
+        self.config = config
+        self.path = config.option.journal
+        self.seed = config.option.seed
+        self.order = None
+        self.completed = {}
+        self.attempt = 1
+        self.phases = {}
+        self.replayed = 0
+
+        if config.option.resume:
+            for record in read_journal(self.path):
+                if record["type"] == "session":
+                    self.attempt = record["attempt"] + 1
+                    self.seed = record["seed"]
+                    self.order = record["order"]
+                elif record["type"] == "result":
+                    self.completed[record["nodeid"]] = record
+        if self.seed is None:
+            self.seed = random.randrange(2**32)
+        self.journal = Journal(self.path, truncate=self.order is None)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        yield
+        if self.order is None:
+            return
+        position = {nodeid: index for index, nodeid in enumerate(self.order)}
+        dropped = [item for item in items if item.nodeid not in position]
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+        items[:] = sorted(
+            (item for item in items if item.nodeid in position),
+            key=lambda item: position[item.nodeid],
+        )
+
+    def pytest_collection_finish(self, session):
+        self.journal.write({
+            "type": "session",
+            "attempt": self.attempt,
+            "seed": self.seed,
+            "order": self.order or [item.nodeid for item in session.items],
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    def pytest_report_header(self, config):
+        return f"run seed: {self.seed}"
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        if self.attempt > 1:
+            remaining = sum(1 for item in items if item.nodeid not in self.completed)
+            return (
+                f"resuming attempt {self.attempt}: {len(self.completed)} tests already finished, "
+                f"{remaining} to run"
+            )
+
+    def replays(self, item) -> bool:
+        """Whether `item` finished in an earlier attempt and is replayed."""
+        return item.nodeid in self.completed
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        record = self.completed.get(item.nodeid)
+        if record is None:
+            return None
+        replay(
+            item, nextitem, record["outcome"], record["duration"], record.get("longrepr"),
+            resumed_from=record["attempt"],
+        )
+        self.replayed += 1
+        return True
+
+    def pytest_runtest_setup(self, item):
+        # Tests replayed from the journal never get here; those that run on a
+        # resumed attempt (the one in flight at the crash included) get fresh data
+        salt = f"{self.attempt}:" if self.attempt > 1 else ""
+        random.seed(f"{self.seed}:{salt}{item.nodeid}")
+
+    def pytest_runtest_logreport(self, report):
+        if getattr(report, "resumed_from", None):
+            return
+        phases = self.phases.setdefault(report.nodeid, [])
+        phases.append(report)
+        if report.when != "teardown" or report.outcome == "rerun":
+            return
+        del self.phases[report.nodeid]
+        problem = next((r for r in phases if r.failed or r.skipped), None)
+        longrepr = None
+        if problem is not None:
+            longrepr = problem.longrepr[2] if problem.skipped and isinstance(problem.longrepr, tuple) else problem.longreprtext
+        self.journal.write({
+            "type": "result",
+            "attempt": self.attempt,
+            "nodeid": report.nodeid,
+            "outcome": final_outcome(phases),
+            "duration": sum(r.duration for r in phases if r.outcome != "rerun"),
+            "longrepr": longrepr,
+        })
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if exitstatus != pytest.ExitCode.INTERRUPTED:
+            self.journal.write({"type": "finished", "attempt": self.attempt})
+        self.journal.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.replayed:
+            terminalreporter.write_line(
+                f"journal: {self.replayed} results merged from earlier attempts ({self.path})"
+            )
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if self.attempt > 1:
+            prefix.append(
+                f"<p>Resumed run (attempt {self.attempt}, seed {self.seed}): "
+                f"{self.replayed} results merged from earlier attempts.</p>"
+            )
+
+    def pytest_html_results_table_row(self, report, cells):
+        attempt = getattr(report, "resumed_from", None)
+        if attempt:
+            cells[0] = cells[0].replace(
+                "</td>", f' <span class="resumed-badge">attempt {attempt}</span></td>'
+            )
@@ -0,0 +1,279 @@
+"""
+Journeys: tests as step sequences that share their common prefixes.
+
+Many tests start the same way (open register -> register -> log in ->
+dashboard) and differ only in their last steps or viewport. A journey
+declares those steps over the page objects:
+
+    from plugins.journeys import SIGNED_IN, set_viewport
+
+    @pytest.mark.journey(SIGNED_IN.then(set_viewport(TABLET_VIEWPORT)))
+    def test_rewards_card(self, journey):
+        assert not journey.page.locator(".overlay-image-rewards").is_visible()
+
+The `journey` fixture runs the steps and hands the test its state
+(`page`, `data`, `on(PageClass)`). At collection the runner builds a
+prefix tree of all journeys; wherever journeys branch, the browser
+state (cookies, localStorage, sessionStorage, URL, viewport) and the
+journey data are checkpointed the first time the prefix is executed.
+Later tests fork a fresh context from the deepest checkpoint and run
+only their remaining steps. The summary reports how many steps were
+saved. If the test that would create a checkpoint fails first, the
+next one simply runs the prefix itself.
+
+Plugins that hook the test's page find the journey's through
+`page_under_test(request)`.
+"""
+
+import copy
+import json
+
+import pytest
+
+from pages.login_page import LoginPage
+from pages.register_page import RegisterPage
+from utils.test_data import random_email
+
+RUNNER_KEY = pytest.StashKey["JourneyRunner"]()
+
+SESSION_STORAGE_SCRIPT = """
+(entries) => { for (const [key, value] of entries) sessionStorage.setItem(key, value); }
+"""
+
+
+class Step:
+    """One named, parameterised action on a JourneyState."""
+
+    def __init__(self, func, args: tuple = (), kwargs: dict | None = None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.key = (func.__name__, repr(args), repr(sorted(self.kwargs.items())))
+
+    def __call__(self, state):
+        return self.func(state, *self.args, **self.kwargs)
+
+    def __repr__(self):
+        params = [repr(a) for a in self.args] + [f"{k}={v!r}" for k, v in self.kwargs.items()]
+        return f"{self.func.__name__}({', '.join(params)})"
+
+
+def step(func):
+    """Turn `func(state, *args)` into a factory of Steps: `func(*args)`."""
+
+    def factory(*args, **kwargs) -> Step:
+        return Step(func, args, kwargs)
+
+    factory.__name__ = func.__name__
+    factory.__doc__ = func.__doc__
+    return factory
+
+
+class Journey(tuple):
+    """An immutable sequence of Steps."""
+
+    def __new__(cls, *steps: Step):
+        return super().__new__(cls, steps)
+
+    def then(self, *steps: Step) -> "Journey":
+        return Journey(*self, *steps)
+
+    @property
+    def keys(self) -> tuple:
+        return tuple(s.key for s in self)
+
+
+class JourneyState:
+    """What steps act on and what the test receives."""
+
+    def __init__(self, context, page, data: dict | None = None):
+        self.context = context
+        self.page = page
+        self.data = data or {}
+
+    def on(self, page_class):
+        """A page object of `page_class` bound to the journey's page."""
+        return page_class(self.page)
+
+
+class Checkpoint:
+    def __init__(self, state: JourneyState):
+        self.storage_state = state.context.storage_state()
+        self.session_storage = state.page.evaluate("() => Object.entries(sessionStorage)")
+        self.url = state.page.url
+        self.viewport = state.page.viewport_size
+        self.data = copy.deepcopy(state.data)
+
+    def fork(self, new_context) -> JourneyState:
+        context = new_context(storage_state=self.storage_state)
+        page = context.new_page()
+        if self.viewport:
+            page.set_viewport_size(self.viewport)
+        if self.session_storage:
+            # sessionStorage is not part of storage_state: seed it on a blank
+            # same-origin document so no app script runs before it is set
+            page.route(self.url, lambda route: route.fulfill(body="<html></html>", content_type="text/html"))
+            page.goto(self.url)
+            page.evaluate(SESSION_STORAGE_SCRIPT, self.session_storage)
+            page.unroute(self.url)
+        page.goto(self.url)
+        page.wait_for_load_state("networkidle")
+        return JourneyState(context, page, copy.deepcopy(self.data))
+
+
+class JourneyRunner:
+    """Prefix tree of the session's journeys and the checkpoints taken."""
+
+    def __init__(self):
+        self.branches = set()
+        self.checkpoints = {}
+        self.steps_declared = 0
+        self.steps_run = 0
+        self.tests = 0
+
+    def plan(self, journeys: list[Journey]):
+        """Mark every prefix where two or more journeys part (or one ends)."""
+        through, ends, nexts = {}, {}, {}
+        for journey in journeys:
+            keys = journey.keys
+            for i in range(1, len(keys) + 1):
+                prefix = keys[:i]
+                through[prefix] = through.get(prefix, 0) + 1
+                if i < len(keys):
+                    nexts.setdefault(prefix, set()).add(keys[i])
+            ends[keys] = ends.get(keys, 0) + 1
+        self.branches = {
+            prefix for prefix, count in through.items()
+            if count >= 2 and len(nexts.get(prefix, ())) + ends.get(prefix, 0) >= 2
+        }
+
+    def run(self, journey: Journey, new_context) -> JourneyState:
+        keys = journey.keys
+        start = next((i for i in range(len(keys), 0, -1) if keys[:i] in self.checkpoints), 0)
+        if start:
+            state = self.checkpoints[keys[:start]].fork(new_context)
+        else:
+            context = new_context()
+            state = JourneyState(context, context.new_page())
+        self.tests += 1
+        self.steps_declared += len(journey)
+        for i in range(start, len(journey)):
+            journey[i](state)
+            self.steps_run += 1
+            prefix = keys[: i + 1]
+            if prefix in self.branches and prefix not in self.checkpoints:
+                self.checkpoints[prefix] = Checkpoint(state)
+        return state
+
+    def summary(self) -> str:
+        saved = self.steps_declared - self.steps_run
+        share = saved / self.steps_declared if self.steps_declared else 0
+        return (
+            f"{self.tests} journeys ran {self.steps_run} of {self.steps_declared} steps; "
+            f"{saved} steps ({share:.0%}) replayed from {len(self.checkpoints)} checkpoints"
+        )
+
+
+# ──────────────────────────────────────────────
+# STEPS
+# ──────────────────────────────────────────────
+
+
+@step
+def open_register(state):
+    state.on(RegisterPage).open()
+
+
+@step
+def register(state, password: str = "SecurePass123!"):
+    """Register a new user (random email); credentials go to data["user"]."""
+    user = {"email": random_email(), "password": password, "first_name": "Test", "last_name": "User"}
+    reg = state.on(RegisterPage)
+    reg.fill_registration_form(
+        first_name=user["first_name"], last_name=user["last_name"], email=user["email"],
+        phone="0911234567", address="123 St", city="Split", zip_code="21000",
+        password=password, confirm_password=password, accept_terms=True,
+    )
+    reg.submit_registration()
+    state.page.wait_for_url("**/index.html**", timeout=10000)
+    state.data["user"] = user
+
+
+@step
+def log_in(state):
+    """Log in as data["user"] and wait for the dashboard."""
+    login = state.on(LoginPage).open()
+    login.login(state.data["user"]["email"], state.data["user"]["password"])
+    state.page.wait_for_url("**/dashboard.html**", timeout=10000)
+    state.page.wait_for_load_state("networkidle")
+
+
+@step
+def set_viewport(state, viewport: dict):
+    state.page.set_viewport_size(viewport)
+    state.page.reload()
+    state.page.wait_for_load_state("networkidle")
+
+
+SIGNED_IN = Journey(open_register(), register(), log_in())
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "journey(steps): run the test's steps through the shared journey runner")
+    config.stash[RUNNER_KEY] = JourneyRunner()
+
+
+def _journey(item) -> Journey | None:
+    marker = item.get_closest_marker("journey")
+    return Journey(*marker.args[0]) if marker else None
+
+
+def pytest_collection_modifyitems(session, config, items):
+    journeys = [journey for journey in map(_journey, items) if journey is not None]
+    config.stash[RUNNER_KEY].plan(journeys)
+
+
+def page_under_test(request):
+    """The test's `page`, or its journey's page once the steps ran; None for neither.
+
+    Journeys build their pages from `new_context`, not from `page`, so the
+    plugins that hook the test's page (tracing, failure screenshots, device
+    profiles) look it up here.
+    """
+    if "page" in request.fixturenames:
+        return request.getfixturevalue("page")
+    if "journey" in request.fixturenames:
+        return request.getfixturevalue("journey").page
+    return None
+
+
+@pytest.fixture
+def journey(request, new_context) -> JourneyState:
+    """State after running the test's `@pytest.mark.journey` steps."""
+    steps = _journey(request.node)
+    if steps is None:
+        raise pytest.UsageError(f"{request.node.nodeid} uses the journey fixture without a journey marker")
+    runner = request.config.stash[RUNNER_KEY]
+    before = runner.steps_run
+    state = runner.run(steps, new_context)
+    request.node.user_properties.append(("journey", json.dumps({
+        "steps": len(steps), "run": runner.steps_run - before,
+    })))
+    return state
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    runner = config.stash.get(RUNNER_KEY, None)
+    if runner is not None and runner.tests:
+        terminalreporter.write_line(f"journeys: {runner.summary()}")
+
+
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    runner = session.config.stash.get(RUNNER_KEY, None)
+    if runner is not None and runner.tests:
+        prefix.append(f"<p>Journeys: {runner.summary()}.</p>")
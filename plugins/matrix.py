@@ -0,0 +1,169 @@
+"""
+Browser matrix: one run on Chromium, Firefox and WebKit at once.
+
+pytest-playwright already turns `--browser chromium --browser firefox`
+into one test per engine (`test_x[chromium]`, `test_x[firefox]`), but
+runs them one after the other. `--matrix` selects all three engines and
+runs them on a local fleet (plugins/fleet.py) with one browser server
+per engine, so the engines run in parallel under one scheduler:
+
+    python -m pytest --matrix
+    python -m pytest --matrix -k "Dashboard or Registration" --fleet-capacity 3
+    python -m pytest --browser firefox --browser webkit --fleet-local 2
+
+Each engine's tests only go to its own nodes. The worker slots are
+shared: once an engine's tests are all handed out, its idle slots move
+to the engines that still have work queued.
+
+Every call duration is recorded per engine. The report gets an "Engine
+comparison" section: the mean time per category (one per page of the
+app) in each engine, and the tests with the widest gap between their
+fastest and slowest engine.
+"""
+
+import html
+import statistics
+
+import pytest
+
+ENGINES = ("chromium", "firefox", "webkit")
+
+# Rows in the table of tests with the widest engine gap
+TOP_GAPS = 10
+
+
+def item_engine(item) -> str:
+    """The engine pytest-playwright parametrized this test with, or ""."""
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("browser_name", "") if callspec else ""
+
+
+def base_nodeid(nodeid: str, engine: str) -> str:
+    """`test_x[firefox-abc]` -> `test_x[abc]`, the same test across engines."""
+    for old, new in ((f"[{engine}]", ""), (f"[{engine}-", "["), (f"-{engine}]", "]"), (f"-{engine}-", "-")):
+        if old in nodeid:
+            return nodeid.replace(old, new, 1)
+    return nodeid
+
+
+class EngineTimes:
+    """Call durations per test and engine."""
+
+    def __init__(self):
+        # base node id -> engine -> duration
+        self.tests = {}
+        self.categories = {}
+
+    def add(self, nodeid: str, engine: str, category: str, duration: float):
+        base = base_nodeid(nodeid, engine)
+        self.tests.setdefault(base, {})[engine] = duration
+        self.categories.setdefault(category, {}).setdefault(engine, []).append(duration)
+
+    def engines(self) -> list[str]:
+        seen = {engine for durations in self.tests.values() for engine in durations}
+        return [engine for engine in ENGINES if engine in seen] + sorted(seen.difference(ENGINES))
+
+    def category_means(self) -> list[tuple[str, dict[str, float]]]:
+        return [
+            (category, {engine: statistics.mean(values) for engine, values in by_engine.items()})
+            for category, by_engine in sorted(self.categories.items())
+        ]
+
+    def gaps(self, n: int = TOP_GAPS) -> list[tuple[str, dict[str, float], float]]:
+        """Tests run on several engines, widest slowest/fastest ratio first."""
+        rows = [
+            (base, durations, max(durations.values()) / min(durations.values()))
+            for base, durations in self.tests.items()
+            if len(durations) > 1 and min(durations.values()) > 0
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:n]
+
+
+def _slowest(means: dict[str, float]) -> str:
+    if len(means) < 2 or min(means.values()) <= 0:
+        return ""
+    slowest = max(means, key=means.get)
+    return f"{slowest} {means[slowest] / min(means.values()):.1f}x"
+
+
+def comparison_html(times: EngineTimes) -> str:
+    engines = times.engines()
+    header = "".join(f"<th>{html.escape(engine)}</th>" for engine in engines)
+
+    def cells(durations):
+        return "".join(
+            f"<td>{durations[engine]:.2f}s</td>" if engine in durations else "<td>-</td>" for engine in engines
+        )
+
+    categories = "".join(
+        f"<tr><td>{html.escape(category)}</td>{cells(means)}<td>{_slowest(means)}</td></tr>"
+        for category, means in times.category_means()
+    )
+    gaps = "".join(
+        f"<tr><td>{html.escape(base)}</td>{cells(durations)}<td>{ratio:.1f}x</td></tr>"
+        for base, durations, ratio in times.gaps()
+    )
+    return (
+        "<h2>Engine comparison</h2>"
+        f"<h3>Mean test time per category</h3><table class=\"time-breakdown\"><tr><th>Category</th>{header}"
+        f"<th>Slowest</th></tr>{categories}</table>"
+        f"<h3>Top {TOP_GAPS} tests by engine gap</h3><table class=\"time-breakdown\"><tr><th>Test</th>{header}"
+        f"<th>Slowest / fastest</th></tr>{gaps}</table>"
+    )
+
+
+class EngineComparison:
+    """Collects call durations per engine and reports them side by side."""
+
+    def __init__(self):
+        self.times = EngineTimes()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        outcome.get_result().engine = item_engine(item)
+
+    def pytest_runtest_logreport(self, report):
+        # Reports replayed from fleet workers carry the engine the worker set
+        engine = getattr(report, "engine", "")
+        if report.when == "call" and engine:
+            self.times.add(report.nodeid, engine, getattr(report, "category", ""), report.duration)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if len(self.times.engines()) < 2:
+            return
+        terminalreporter.write_sep("-", "mean test time per category and engine")
+        for category, means in self.times.category_means():
+            row = ", ".join(f"{engine} {means[engine]:.2f}s" for engine in self.times.engines() if engine in means)
+            slowest = _slowest(means)
+            terminalreporter.write_line(f"{category}: {row}" + (f" (slowest: {slowest})" if slowest else ""))
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if len(self.times.engines()) > 1:
+            postfix.append(comparison_html(self.times))
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("matrix", "browser matrix")
+    group.addoption(
+        "--matrix", action="store_true", default=False,
+        help=f"Run on {', '.join(ENGINES)} in parallel (a local fleet with a server per engine, "
+             "unless --fleet-node or --fleet-local is given)",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    option = config.option
+    if option.matrix:
+        if not option.browser or len(option.browser) < 2:
+            option.browser = list(ENGINES)
+        # Before the fleet plugin looks at its options
+        if not (option.fleet_worker or option.fleet_node or option.fleet_local or option.collectonly):
+            option.fleet_local = 1
+    config.pluginmanager.register(EngineComparison(), "engine-comparison")
@@ -0,0 +1,239 @@
+"""
+Browser memory monitoring and recycling.
+
+With `--memory-monitor` (implied by either threshold below), every
+browser test is sampled at the end of its call phase:
+
+    browser RSS    resident memory of the browser's processes except
+                   renderers (read from /proc; Linux only)
+    renderer RSS   resident memory of the renderer processes
+    JS heap        used JS heap of the test's page (Chromium, via CDP)
+
+The numbers are shown in the test's report row, and peaks go in the
+summary. When `--max-browser-rss-mb` or `--max-js-heap-mb` is crossed,
+the browser is closed and relaunched before the next browser test, so
+long generated suites stay within a fixed memory envelope.
+
+While memory is monitored, the session `browser` fixture is a proxy
+around pytest-playwright's `launch_browser`, so the browser can be
+swapped while the session runs. Otherwise it is the launched browser
+itself, as with the stock fixture.
+"""
+
+import os
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+from pytest_html import extras as pytest_extras
+
+MONITOR_KEY = pytest.StashKey["MemoryMonitor"]()
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+MB = 1024 * 1024
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode(errors="replace")
+    except OSError:
+        return None
+
+
+def browser_process_rss(root_pid: int | None = None) -> tuple[int, int] | None:
+    """(browser RSS, renderer RSS) in bytes of the browsers below this process.
+
+    Returns None where /proc is not available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    root_pid = root_pid or os.getpid()
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        stat = _read(f"/proc/{entry}/stat")
+        if stat:
+            # The command name may contain spaces; ppid follows the closing paren
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+
+    browser = renderer = 0
+    pending = list(children.get(root_pid, []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        cmdline = _read(f"/proc/{pid}/cmdline") or ""
+        statm = _read(f"/proc/{pid}/statm")
+        if not statm or "run-driver" in cmdline:
+            # The Playwright driver (node) is not part of the browser
+            continue
+        rss = int(statm.split()[1]) * PAGE_SIZE
+        if "--type=renderer" in cmdline or "-isForBrowser" in cmdline:
+            renderer += rss
+        else:
+            browser += rss
+    return browser, renderer
+
+
+def js_heap_used(page) -> int | None:
+    """Used JS heap of the page in bytes, or None outside Chromium."""
+    try:
+        session = page.context.new_cdp_session(page)
+    except PlaywrightError:
+        return None
+    try:
+        return int(session.send("Runtime.getHeapUsage")["usedSize"])
+    except PlaywrightError:
+        return None
+    finally:
+        try:
+            session.detach()
+        except PlaywrightError:
+            pass
+
+
+class RecyclableBrowser:
+    """Browser proxy that can close and relaunch the browser behind it."""
+
+    def __init__(self, launch):
+        self._launch = launch
+        self._browser = launch()
+        self.restarts = 0
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+    def recycle(self):
+        self._browser.close()
+        self._browser = self._launch()
+        self.restarts += 1
+
+
+class MemoryMonitor:
+    """Per-test memory samples, peaks and the recycling policy."""
+
+    def __init__(self, max_rss_mb: float | None, max_heap_mb: float | None):
+        self.max_rss = max_rss_mb * MB if max_rss_mb else None
+        self.max_heap = max_heap_mb * MB if max_heap_mb else None
+        self.peak_rss = 0
+        self.peak_heap = 0
+        self.recycle_pending = None
+        self.recycles = []
+
+    def sample(self, page) -> dict:
+        rss = browser_process_rss()
+        heap = js_heap_used(page) if page is not None else None
+        sample = {
+            "browser_rss": rss[0] if rss else None,
+            "renderer_rss": rss[1] if rss else None,
+            "js_heap": heap,
+        }
+        total = sum(rss) if rss else 0
+        self.peak_rss = max(self.peak_rss, total)
+        self.peak_heap = max(self.peak_heap, heap or 0)
+        if self.max_rss and total > self.max_rss:
+            self.recycle_pending = f"browser RSS {total / MB:.0f} MB > {self.max_rss / MB:.0f} MB"
+        elif self.max_heap and heap and heap > self.max_heap:
+            self.recycle_pending = f"JS heap {heap / MB:.1f} MB > {self.max_heap / MB:.0f} MB"
+        return sample
+
+
+def _mb(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / MB:.1f} MB"
+
+
+def sample_html(sample: dict) -> str:
+    return (
+        '<div class="memory-sample">Memory after test: '
+        f"browser {_mb(sample['browser_rss'])}, renderers {_mb(sample['renderer_rss'])}, "
+        f"JS heap {_mb(sample['js_heap'])}</div>"
+    )
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("memory", "browser memory monitoring")
+    group.addoption(
+        "--memory-monitor", action="store_true", default=False,
+        help="Record browser/renderer RSS and JS heap after every browser test",
+    )
+    group.addoption(
+        "--max-browser-rss-mb", type=float, default=None,
+        help="Restart the browser before the next test once its total RSS exceeds this",
+    )
+    group.addoption(
+        "--max-js-heap-mb", type=float, default=None,
+        help="Restart the browser before the next test once a page's JS heap exceeds this",
+    )
+
+
+def pytest_configure(config):
+    option = config.option
+    if option.collectonly or not (option.memory_monitor or option.max_browser_rss_mb or option.max_js_heap_mb):
+        return
+    monitor = MemoryMonitor(option.max_browser_rss_mb, option.max_js_heap_mb)
+    config.stash[MONITOR_KEY] = monitor
+    config.pluginmanager.register(MemoryReporter(monitor), "memory-reporter")
+
+
+@pytest.fixture(scope="session")
+def browser(launch_browser, pytestconfig):
+    """pytest-playwright's browser; behind a proxy so it can be recycled while memory is monitored."""
+    if MONITOR_KEY in pytestconfig.stash:
+        browser = RecyclableBrowser(launch_browser)
+    else:
+        browser = launch_browser()
+    yield browser
+    browser.close()
+
+
+@pytest.fixture(autouse=True)
+def _browser_recycle(request, pytestconfig):
+    """Relaunch the browser before this test if the last one crossed a threshold."""
+    monitor = pytestconfig.stash.get(MONITOR_KEY, None)
+    if monitor is not None and monitor.recycle_pending and "browser" in request.fixturenames:
+        request.getfixturevalue("browser").recycle()
+        monitor.recycles.append((request.node.nodeid, monitor.recycle_pending))
+        monitor.recycle_pending = None
+    yield
+
+
+class MemoryReporter:
+    """Samples memory after each browser test and reports it."""
+
+    def __init__(self, monitor: MemoryMonitor):
+        self.monitor = monitor
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when != "call" or "browser" not in item.fixturenames:
+            return
+        page = item.funcargs.get("page")
+        if page is None and "journey" in item.funcargs:
+            page = item.funcargs["journey"].page
+        report.memory = self.monitor.sample(page)
+        if item.config.option.htmlpath:
+            report.extras = getattr(report, "extras", []) + [pytest_extras.html(sample_html(report.memory))]
+
+    def _summary(self) -> str:
+        monitor = self.monitor
+        text = f"peak browser RSS {_mb(monitor.peak_rss)}, peak JS heap {_mb(monitor.peak_heap)}"
+        if monitor.recycles:
+            text += f"; browser restarted {len(monitor.recycles)} times"
+        return text
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_line(f"memory: {self._summary()}")
+        for nodeid, reason in self.monitor.recycles:
+            terminalreporter.write_line(f"  restarted before {nodeid}: {reason}")
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        prefix.append(f"<p>Browser memory: {self._summary()}.</p>")
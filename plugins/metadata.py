@@ -0,0 +1,124 @@
+"""
+Test metadata shared by conftest.py and the run plugins.
+
+Maps a collected test item to its report category (from the test file
+name) and to its BUG catalog id. Test docstrings start with a test case
+id ("TC-FP02: ..."); the test case tables of docs/test_report.md give
+the BUG id each case covers. Parametrized cases are rows of their own
+there (TC-004e is the fifth invalid email), so the case letter is taken
+from the parameter index. A BUG id written in the docstring itself is
+the fallback. Lookups are cached per test function / file, since the
+report hooks ask for them on every setup, call and teardown phase.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+TEST_REPORT = Path(__file__).resolve().parent.parent / "docs" / "test_report.md"
+
+# Category mapping from test file to display name
+CATEGORY_MAP = {
+    "tests/unit/": "Unit",
+    "test_registration": "Registration",
+    "test_login": "Login",
+    "test_forgot_password": "Forgot Password",
+    "test_dashboard": "Dashboard",
+    "test_responsive": "Responsive Design",
+    "test_api": "API",
+    "test_security": "Security",
+    "test_soak": "Soak",
+    "test_repeat_visits": "Repeat Visits",
+    "test_caching_headers": "Caching and Compression",
+}
+
+# Bug catalog id, e.g. "BUG-018"
+BUG_ID_PATTERN = re.compile(r"BUG-\d{3}")
+
+# Test case id opening a test docstring, e.g. "TC-FP02"; table rows add a case letter ("TC-004e")
+TC_ID_PATTERN = re.compile(r"TC-[A-Z]*\d+")
+TC_ROW_PATTERN = re.compile(r"TC-[A-Z]*\d+[a-z]?")
+
+
+@lru_cache(maxsize=None)
+def _function_doc(function) -> str:
+    return (getattr(function, "__doc__", "") or "").strip()
+
+
+@lru_cache(maxsize=None)
+def _file_category(file_name: str) -> str:
+    for key, label in CATEGORY_MAP.items():
+        if key in file_name:
+            return label
+    return "Other"
+
+
+@lru_cache(maxsize=None)
+def _doc_bug_id(doc: str) -> str:
+    bug_match = BUG_ID_PATTERN.search(doc)
+    return bug_match.group(0) if bug_match else ""
+
+
+@lru_cache(maxsize=None)
+def case_bug_ids(path: Path = TEST_REPORT) -> dict[str, str]:
+    """{TC id: BUG id} from the Bug column of the test case tables."""
+    bugs = {}
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return bugs
+    for line in text.splitlines():
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if len(cells) > 1 and TC_ROW_PATTERN.fullmatch(cells[0]):
+            bug_match = BUG_ID_PATTERN.search(cells[-1])
+            if bug_match:
+                bugs[cells[0]] = bug_match.group(0)
+    return bugs
+
+
+def _case_letter(item) -> str:
+    """Case letter of a test with one parametrize mark ("e" for the fifth), or ""."""
+    callspec = getattr(item, "callspec", None)
+    argnames = [mark.args[0] for mark in item.iter_markers("parametrize") if mark.args]
+    if callspec is None or len(argnames) != 1 or argnames[0] not in callspec.indices:
+        return ""
+    return chr(ord("a") + callspec.indices[argnames[0]])
+
+
+@lru_cache(maxsize=None)
+def _bug_id(doc: str, case: str) -> str:
+    tc_match = TC_ID_PATTERN.match(doc)
+    if tc_match:
+        bugs = case_bug_ids()
+        for tc_id in (tc_match.group(0) + case, tc_match.group(0)):
+            if tc_id in bugs:
+                return bugs[tc_id]
+    return _doc_bug_id(doc)
+
+
+def item_doc(item) -> str:
+    """Return the stripped docstring of the test function."""
+    return _function_doc(item.function)
+
+
+def item_category(item) -> str:
+    """Return the CATEGORY_MAP label for the file the test lives in."""
+    file_name = item.location[0] if hasattr(item, "location") else ""
+    return _file_category(str(file_name))
+
+
+def item_tc_id(item) -> str:
+    """Return the test case id the docstring starts with, or ""."""
+    tc_match = TC_ID_PATTERN.match(item_doc(item))
+    return tc_match.group(0) if tc_match else ""
+
+
+def item_bug_id(item) -> str:
+    """Return the BUG catalog id the test covers, or ""."""
+    return _bug_id(item_doc(item), _case_letter(item))
+
+
+def item_description(item) -> str:
+    """Return the first docstring line, used as the report Description."""
+    doc = item_doc(item)
+    return doc.split("\n")[0] if doc else ""
@@ -0,0 +1,275 @@
+"""
+Sampling profiler for tests (`--profile-tests`).
+
+A background thread samples the main thread's Python stack every
+`--profile-interval` milliseconds while a test runs - setup (including
+fixtures such as `registered_user` and `authenticated_page`), call and
+teardown, reporting hooks included. Sampling costs one stack walk per
+interval and nothing per function call, unlike cProfile. While
+Playwright's sync API waits in its dispatcher greenlet, the sample is
+the test's suspended stack with the dispatcher's frames on top.
+
+Output in `--profile-dir` (default `reports/profile/`):
+
+    stacks.folded     collapsed stacks for the whole run ("a;b;c 12"),
+                      usable with flamegraph.pl or speedscope
+    flamegraph.svg    merged flame graph of the run
+
+The HTML report gets each test's top frames in its row and a run-wide
+split of time between pytest-html, Playwright's sync dispatch and the
+page objects.
+"""
+
+import html
+import os
+import sys
+import threading
+import zlib
+from collections import Counter
+
+import greenlet
+import pytest
+from pytest_html import extras as pytest_extras
+
+from plugins.report_extras import add_extra, call_report
+
+DEFAULT_PROFILE_DIR = "reports/profile"
+
+# Frames listed per test in the report
+TOP_FRAMES = 10
+
+# Where time goes, by the package of any frame on the sampled stack (see _frame_label)
+AREAS = {
+    "pytest-html": f"(pytest_html{os.sep}",
+    "Playwright": f"(playwright{os.sep}",
+    "page objects": f"(pages{os.sep}",
+}
+
+
+def _frame_label(frame, rootdir: str) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(rootdir):
+        path = os.path.relpath(path, rootdir)
+    elif "site-packages" in path:
+        path = path.split(f"site-packages{os.sep}", 1)[1]
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """Samples one thread's stack on a timer; samples go to the active bucket."""
+
+    def __init__(self, interval: float, rootdir: str, thread_id: int | None = None):
+        self.interval = interval
+        self.rootdir = rootdir
+        self.thread_id = thread_id or threading.get_ident()
+        # Playwright's sync API waits by switching to its dispatcher greenlet;
+        # the test's own stack then sits suspended in the thread's main greenlet
+        self.main_greenlet = greenlet.getcurrent() if thread_id is None else None
+        self.bucket = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="test-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        labels = {}
+        while not self._stop.wait(self.interval):
+            bucket = self.bucket
+            frame = sys._current_frames().get(self.thread_id)
+            if bucket is None or frame is None:
+                continue
+            stack = self._walk(frame, labels)
+            suspended = self.main_greenlet.gr_frame if self.main_greenlet is not None else None
+            if suspended is not None:
+                # The dispatcher's frames run on top of the test's suspended ones
+                stack = self._walk(suspended, labels) + stack
+            bucket[";".join(stack)] += 1
+
+    def _walk(self, frame, labels: dict) -> list[str]:
+        """Labels of `frame` and its callers, outermost first."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get((code, code.co_firstlineno))
+            if label is None:
+                label = labels[(code, code.co_firstlineno)] = _frame_label(frame, self.rootdir)
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+
+def top_frames(stacks: Counter, n: int = TOP_FRAMES) -> list[tuple[str, int]]:
+    """Leaf frames (self time) with the most samples."""
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    return leaves.most_common(n)
+
+
+def area_shares(stacks: Counter) -> dict[str, int]:
+    """Samples whose stack passes through each of AREAS (inclusive time)."""
+    shares = dict.fromkeys(AREAS, 0)
+    for stack, count in stacks.items():
+        for area, marker in AREAS.items():
+            if marker in stack:
+                shares[area] += count
+    return shares
+
+
+def flamegraph_svg(stacks: Counter, title: str, width: int = 1200, row: int = 16) -> str:
+    """Render collapsed stacks as a standalone SVG flame graph."""
+    root = {"count": 0, "children": {}}
+    for stack, count in stacks.items():
+        node = root
+        node["count"] += count
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"count": 0, "children": {}})
+            node["count"] += count
+    total = root["count"] or 1
+    rects, depth_max = [], 0
+
+    def layout(node, x, depth):
+        nonlocal depth_max
+        for name, child in sorted(node["children"].items()):
+            w = child["count"] / total * width
+            if w >= 0.5:
+                depth_max = max(depth_max, depth)
+                rects.append((x, depth, w, name, child["count"]))
+                layout(child, x, depth + 1)
+            x += w
+
+    layout(root, 0.0, 0)
+    height = (depth_max + 1) * row + 30
+    body = []
+    for x, depth, w, name, count in rects:
+        y = height - (depth + 1) * row
+        hue = 10 + zlib.crc32(name.split(" (", 1)[-1].split(":")[0].encode()) % 50
+        label = html.escape(name)
+        text = html.escape(name[: int(w / 7)]) if w > 35 else ""
+        body.append(
+            f'<g><title>{label} - {count} samples ({count / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="hsl({hue},80%,60%)"/>'
+            f'<text x="{x + 3:.1f}" y="{y + row - 4}">{text}</text></g>'
+        )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        'font-family="monospace" font-size="11">'
+        f'<text x="4" y="16" font-size="14">{html.escape(title)} - {total} samples</text>'
+        + "".join(body)
+        + "</svg>"
+    )
+
+
+def _shares_text(shares: dict[str, int], total: int) -> str:
+    return ", ".join(f"{area} {count / total:.0%}" for area, count in shares.items())
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profile-tests", "sampling profiler")
+    group.addoption(
+        "--profile-tests", action="store_true", default=False,
+        help="Sample each test's Python stacks and write a flame graph of the run",
+    )
+    group.addoption(
+        "--profile-interval", type=float, default=5.0,
+        help="Sampling interval in milliseconds (default: 5)",
+    )
+    group.addoption(
+        "--profile-dir", default=DEFAULT_PROFILE_DIR,
+        help=f"Where collapsed stacks and the flame graph are written (default: {DEFAULT_PROFILE_DIR})",
+    )
+
+
+def pytest_configure(config):
+    if config.option.profile_tests and not config.option.collectonly:
+        config.pluginmanager.register(RunProfiler(config), "test-profiler")
+
+
+class RunProfiler:
+    """Runs the sampler for the session and attributes samples to tests."""
+
+    def __init__(self, config):
+        self.config = config
+        self.directory = config.option.profile_dir
+        self.by_test = {}
+        self.sampler = Sampler(config.option.profile_interval / 1000, str(config.rootpath))
+        self.sampler.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.sampler.bucket = self.by_test.setdefault(item.nodeid, Counter())
+        yield
+        self.sampler.bucket = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "teardown" and self.config.option.htmlpath:
+            row = call_report(item)
+            stacks = self.by_test.get(item.nodeid)
+            if row is not None and stacks:
+                add_extra(row, pytest_extras.html(self._test_html(stacks)))
+
+    def _test_html(self, stacks: Counter) -> str:
+        total = sum(stacks.values())
+        rows = "".join(
+            f"<tr><td>{count / total:.0%}</td><td><code>{html.escape(frame)}</code></td></tr>"
+            for frame, count in top_frames(stacks)
+        )
+        return (
+            f'<div class="profile-frames"><strong>Top frames</strong> ({total} samples; '
+            f"{_shares_text(area_shares(stacks), total)})<table>{rows}</table></div>"
+        )
+
+    def merged(self) -> Counter:
+        merged = Counter()
+        for stacks in self.by_test.values():
+            merged.update(stacks)
+        return merged
+
+    def pytest_sessionfinish(self, session):
+        self.sampler.stop()
+        merged = self.merged()
+        if not merged:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "stacks.folded"), "w", encoding="utf-8") as f:
+            for stack, count in merged.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(self.directory, "flamegraph.svg"), "w", encoding="utf-8") as f:
+            f.write(flamegraph_svg(merged, f"{len(self.by_test)} tests"))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        merged = self.merged()
+        if merged:
+            total = sum(merged.values())
+            terminalreporter.write_line(
+                f"profile: {total} samples ({_shares_text(area_shares(merged), total)}); "
+                f"flame graph in {os.path.join(self.directory, 'flamegraph.svg')}"
+            )
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        merged = self.merged()
+        if merged:
+            total = sum(merged.values())
+            path = os.path.join(self.directory, "flamegraph.svg")
+            link = os.path.relpath(path, os.path.dirname(os.path.abspath(self.config.option.htmlpath)))
+            prefix.append(
+                f"<p>Profile: {total} samples - {_shares_text(area_shares(merged), total)}. "
+                f'<a href="{html.escape(link.replace(os.sep, "/"))}">Flame graph</a></p>'
+            )
@@ -0,0 +1,51 @@
+"""
+Replay of previously recorded test results.
+
+Reports a test without executing it: synthesized setup/call/teardown
+reports go through the regular logreport hooks, so the terminal summary,
+the history store and the HTML report treat them like a real run.
+"""
+
+import pytest
+
+from plugins.metadata import item_bug_id, item_category, item_description, item_doc
+
+
+def replay(item, nextitem, outcome: str, duration: float, longrepr: str | None = None, **attrs):
+    """Emit reports for `item` with a recorded outcome instead of running it.
+
+    `outcome` is one of passed, failed, skipped or error (setup failure).
+    Extra keyword arguments become attributes of every emitted report.
+    """
+    ihook = item.ihook
+    ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+
+    attrs = {
+        "category": item_category(item),
+        "description": item_description(item),
+        "description_full": item_doc(item),
+        "bug_id": item_bug_id(item),
+        **attrs,
+    }
+    if outcome == "error":
+        phases = [("setup", "failed", longrepr, duration)]
+    elif outcome == "skipped":
+        reason = longrepr or "skipped"
+        phases = [("setup", "skipped", (item.location[0], item.location[1] or 0, reason), 0.0)]
+    else:
+        phases = [("setup", "passed", None, 0.0), ("call", outcome, longrepr, duration)]
+    phases.append(("teardown", "passed", None, 0.0))
+
+    keywords = {name: 1 for name in item.keywords}
+    for when, phase_outcome, phase_longrepr, phase_duration in phases:
+        report = pytest.TestReport(
+            item.nodeid, item.location, keywords, phase_outcome, phase_longrepr, when,
+            duration=phase_duration, **attrs,
+        )
+        ihook.pytest_runtest_logreport(report=report)
+
+    ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+    # The previous test kept its fixtures alive for this one; release what
+    # the next test does not share, exactly as the regular protocol does.
+    item.session._setupstate.teardown_exact(nextitem)
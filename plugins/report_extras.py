@@ -0,0 +1,35 @@
+"""
+Call-phase reports for plugins that link artifacts from a test's row.
+
+Tracing, failure screenshots and the profiler decide what to attach only
+after the test body has run - in a fixture's teardown or the teardown
+report. pytest-html renders a test's row from its call report at
+teardown, so extras appended to that report then still land in the row.
+`call_report(item)` returns it; `add_extra` appends to it.
+"""
+
+import pytest
+
+CALL_REPORT_KEY = pytest.StashKey[pytest.TestReport]()
+
+
+def call_report(item) -> pytest.TestReport | None:
+    """The test's call-phase report, or None if the call did not run."""
+    return item.stash.get(CALL_REPORT_KEY, None)
+
+
+def add_extra(report: pytest.TestReport, extra: dict):
+    report.extras = getattr(report, "extras", []) + [extra]
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "call":
+        item.stash[CALL_REPORT_KEY] = report
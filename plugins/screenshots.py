@@ -0,0 +1,182 @@
+"""
+Deduplicated, compressed screenshots of failed browser tests.
+
+When a test that uses `page` (or a journey's page) fails, a PNG screenshot
+is taken and keyed by a digest of its decoded pixels (the PNG header and
+image data), so a recompressed copy keeps its key. A stored screenshot
+is reused only if its pixels are identical, e.g. the same broken mobile
+overlay on register.html across many tests. Screenshots that merely look
+alike - another error message, a different field value - are stored as
+files of their own.
+
+New screenshots are recompressed (PNG deflate level 9) and written by a
+thread pool so the test run does not wait for them; zlib releases the
+GIL, so the work really happens off the main thread. Files live in
+`reports/screenshots/` with an index that keeps deduplicating across
+runs, and report rows link them instead of inlining base64 images.
+"""
+
+import hashlib
+import html
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+from pytest_html import extras as pytest_extras
+
+from plugins.journeys import page_under_test
+from plugins.report_extras import add_extra, call_report
+
+DEFAULT_SCREENSHOT_DIR = "reports/screenshots"
+
+ENCODER_WORKERS = 2
+
+STORE_KEY = pytest.StashKey["ScreenshotStore"]()
+
+
+def png_chunks(data: bytes) -> tuple[list[tuple[bytes, bytes]], list[bytes]]:
+    """A PNG's chunks other than IDAT/IEND, and its IDAT payloads."""
+    body = data[8:]
+    chunks, idat, offset = [], [], 0
+    while offset < len(body):
+        length, kind = struct.unpack(">I4s", body[offset:offset + 8])
+        payload = body[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if kind == b"IDAT":
+            idat.append(payload)
+        elif kind != b"IEND":
+            chunks.append((kind, payload))
+    return chunks, idat
+
+
+def pixel_digest(data: bytes) -> str:
+    """Digest of a PNG's header and decoded image data; unchanged by recompression."""
+    chunks, idat = png_chunks(data)
+    header = b"".join(payload for kind, payload in chunks if kind == b"IHDR")
+    return hashlib.sha256(header + zlib.decompress(b"".join(idat))).hexdigest()
+
+
+def recompress_png(data: bytes) -> bytes:
+    """Re-deflate a PNG's image data at level 9 into a single IDAT chunk."""
+    signature = data[:8]
+    chunks, idat = png_chunks(data)
+    compressed = zlib.compress(zlib.decompress(b"".join(idat)), 9)
+    if len(compressed) >= sum(len(part) for part in idat):
+        return data
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        crc = zlib.crc32(kind + payload) & 0xFFFFFFFF
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", crc)
+
+    return signature + b"".join(chunk(k, p) for k, p in chunks) + chunk(b"IDAT", compressed) + chunk(b"IEND", b"")
+
+
+def _write_png(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(recompress_png(data))
+
+
+class ScreenshotStore:
+    """Pixel-digest index of stored screenshots with a background writer."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                # Entries of older index formats are dropped and stored afresh
+                self.index = {
+                    pixels: name for pixels, name in json.load(f).items()
+                    if isinstance(name, str) and os.path.exists(os.path.join(directory, name))
+                }
+        self.pool = ThreadPoolExecutor(max_workers=ENCODER_WORKERS, thread_name_prefix="screenshot")
+        self.stored = 0
+        self.reused = 0
+
+    def add(self, data: bytes) -> str:
+        """Return the file name for this screenshot, storing it only if new."""
+        pixels = pixel_digest(data)
+        name = self.index.get(pixels)
+        if name is not None:
+            self.reused += 1
+            return name
+        name = f"{pixels[:16]}.png"
+        self.index[pixels] = name
+        self.pool.submit(_write_png, os.path.join(self.directory, name), data)
+        self.stored += 1
+        return name
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("screenshots", "failure screenshots")
+    group.addoption(
+        "--no-failure-screenshots", action="store_true", default=False,
+        help="Do not capture screenshots of failed browser tests",
+    )
+    group.addoption(
+        "--screenshot-dir", default=DEFAULT_SCREENSHOT_DIR,
+        help=f"Where deduplicated failure screenshots are stored (default: {DEFAULT_SCREENSHOT_DIR})",
+    )
+
+
+@pytest.fixture(scope="session")
+def screenshot_store(pytestconfig):
+    store = ScreenshotStore(pytestconfig.option.screenshot_dir)
+    pytestconfig.stash[STORE_KEY] = store
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def _failure_screenshot(request, pytestconfig):
+    """Screenshot the page when the test fails and link it from the report row."""
+    page = None if pytestconfig.option.no_failure_screenshots else page_under_test(request)
+    if page is None:
+        yield
+        return
+
+    store = request.getfixturevalue("screenshot_store")
+    yield
+
+    report = call_report(request.node)
+    if report is None or not report.failed:
+        return
+    try:
+        data = page.screenshot(type="png", timeout=5000)
+    except PlaywrightError:
+        return
+    name = store.add(data)
+
+    if pytestconfig.option.htmlpath:
+        path = os.path.join(pytestconfig.option.screenshot_dir, name)
+        link = os.path.relpath(path, os.path.dirname(os.path.abspath(pytestconfig.option.htmlpath)))
+        link = html.escape(link.replace(os.sep, "/"))
+        add_extra(report, pytest_extras.html(
+            f'<div class="failure-screenshot"><a href="{link}" target="_blank">'
+            f'<img src="{link}" loading="lazy" alt="Screenshot at failure"></a></div>'
+        ))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    store = config.stash.get(STORE_KEY, None)
+    if store is not None and (store.stored or store.reused):
+        terminalreporter.write_line(
+            f"failure screenshots: {store.stored} stored, {store.reused} reused "
+            f"({store.directory})"
+        )
@@ -0,0 +1,220 @@
+"""
+Time-budgeted test selection.
+
+`--time-budget 60s` keeps the subset of collected tests that gives the
+most signal within the budget, using the test history database:
+
+- expected duration: median of the test's recent durations
+- failure probability: recency-weighted failure rate
+- coverage: distinct BUG ids and CATEGORY_MAP categories not yet covered
+
+Tests that failed in the previous run are picked (and run) first. The
+rest are chosen greedily by value per second; because the value of a
+test can only drop as coverage grows, a lazy-evaluated heap keeps the
+selection in the millisecond range. The report header lists what was
+skipped and why.
+"""
+
+import heapq
+import html
+import re
+import statistics
+import time
+
+import pytest
+
+from plugins.history import HistoryStore, WINDOW
+from plugins.metadata import item_bug_id, item_category
+
+# Duration assumed for tests with no history when nothing else is known
+DEFAULT_DURATION = 5.0
+
+# Failure probability assumed for tests never run before
+UNKNOWN_FAILURE_PROBABILITY = 0.5
+
+# Weight of each past run when estimating failure probability (newest = 1)
+RECENCY_DECAY = 0.8
+
+BASE_VALUE = 0.05
+BUG_COVERAGE_VALUE = 0.5
+CATEGORY_COVERAGE_VALUE = 0.3
+
+BUDGET_PATTERN = re.compile(r"^(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m)?(?:(\d+(?:\.\d+)?)s?)?$")
+
+
+def parse_budget(value: str) -> float:
+    """Parse "90", "60s", "2m", "1m30s" or "1h" into seconds."""
+    match = BUDGET_PATTERN.match(value.strip().lower())
+    if not value.strip() or not match:
+        raise pytest.UsageError(f"Invalid --time-budget value: {value!r} (use e.g. 60s, 2m, 1m30s)")
+    hours, minutes, seconds = (float(group) if group else 0.0 for group in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def failure_probability(outcomes: list[str]) -> float:
+    """Recency-weighted share of failed runs; `outcomes` is oldest first."""
+    relevant = [outcome for outcome in outcomes if outcome != "skipped"]
+    if not relevant:
+        return UNKNOWN_FAILURE_PROBABILITY
+    weights = [RECENCY_DECAY ** age for age in range(len(relevant) - 1, -1, -1)]
+    failed = sum(w for w, outcome in zip(weights, relevant) if outcome != "passed")
+    return failed / sum(weights)
+
+
+class Candidate:
+    """A collected test with its estimated cost and value inputs."""
+
+    def __init__(self, index, item, history):
+        self.index = index
+        self.item = item
+        self.bug_id = item_bug_id(item)
+        self.category = item_category(item)
+        outcomes = [outcome for outcome, _ in history]
+        self.known = bool(history)
+        self.duration = statistics.median([d for _, d in history]) if history else None
+        self.p_fail = failure_probability(outcomes)
+        self.failed_last = bool(outcomes) and outcomes[-1] in ("failed", "error")
+
+    def value(self, bugs: set, categories: set) -> float:
+        value = BASE_VALUE + self.p_fail
+        if self.bug_id and self.bug_id not in bugs:
+            value += BUG_COVERAGE_VALUE
+        if self.category not in categories:
+            value += CATEGORY_COVERAGE_VALUE
+        return value
+
+
+def select(items, history: dict, budget: float):
+    """Choose tests within `budget` seconds.
+
+    Returns (selected candidates in run order, skipped candidates, estimated seconds).
+    """
+    candidates = [Candidate(i, item, history.get(item.nodeid, [])) for i, item in enumerate(items)]
+    known = [c.duration for c in candidates if c.known]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    for c in candidates:
+        if c.duration is None:
+            c.duration = fallback
+
+    remaining = budget
+    bugs, categories = set(), set()
+    failed_first, chosen = [], []
+
+    def take(c):
+        nonlocal remaining
+        remaining -= c.duration
+        if c.bug_id:
+            bugs.add(c.bug_id)
+        categories.add(c.category)
+
+    for c in sorted((c for c in candidates if c.failed_last), key=lambda c: c.duration):
+        if c.duration <= remaining:
+            take(c)
+            failed_first.append(c)
+
+    taken = {c.index for c in failed_first}
+    heap = [
+        (-c.value(bugs, categories) / max(c.duration, 0.01), c.index)
+        for c in candidates if c.index not in taken
+    ]
+    heapq.heapify(heap)
+    while heap:
+        _, index = heapq.heappop(heap)
+        c = candidates[index]
+        if c.duration > remaining:
+            continue
+        ratio = c.value(bugs, categories) / max(c.duration, 0.01)
+        if heap and ratio < -heap[0][0]:
+            # Stale priority: coverage changed since it was pushed
+            heapq.heappush(heap, (-ratio, index))
+            continue
+        take(c)
+        chosen.append(c)
+        taken.add(index)
+
+    chosen.sort(key=lambda c: c.index)
+    skipped = [c for c in candidates if c.index not in taken]
+    return failed_first + chosen, skipped, budget - remaining
+
+
+def skip_reason(c: Candidate) -> str:
+    estimate = f"~{c.duration:.1f}s" if c.known else f"~{c.duration:.1f}s (no history)"
+    return f"{estimate}, failure probability {c.p_fail:.0%}"
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("selection", "time-budgeted test selection")
+    group.addoption(
+        "--time-budget", default=None, metavar="DURATION",
+        help="Run only the most valuable tests that fit in DURATION (e.g. 60s, 2m), based on test history",
+    )
+
+
+def pytest_configure(config):
+    if config.option.time_budget:
+        budget = parse_budget(config.option.time_budget)
+        config.pluginmanager.register(BudgetSelector(budget, config), "budget-selector")
+
+
+class BudgetSelector:
+    """Deselects tests that do not fit the time budget and explains why."""
+
+    def __init__(self, budget: float, config):
+        self.budget = budget
+        self.config = config
+        self.selected = []
+        self.skipped = []
+        self.estimate = 0.0
+        self.elapsed_ms = 0.0
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        store = HistoryStore(config.option.history_db)
+        history = store.recent(WINDOW)
+        store.close()
+
+        started = time.perf_counter()
+        self.selected, self.skipped, self.estimate = select(items, history, self.budget)
+        self.elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if self.skipped:
+            config.hook.pytest_deselected(items=[c.item for c in self.skipped])
+        items[:] = [c.item for c in self.selected]
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        return (
+            f"time budget {self.budget:g}s: selected {len(self.selected)} tests "
+            f"(~{self.estimate:.0f}s), skipped {len(self.skipped)} "
+            f"[selection took {self.elapsed_ms:.1f} ms]"
+        )
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        failed_first = sum(1 for c in self.selected if c.failed_last)
+        covered = {c.bug_id for c in self.selected if c.bug_id}
+        missed = sorted({c.bug_id for c in self.skipped if c.bug_id} - covered)
+        rows = "".join(
+            f"<li><code>{html.escape(c.item.nodeid)}</code> - {skip_reason(c)}</li>"
+            for c in sorted(self.skipped, key=lambda c: c.p_fail / max(c.duration, 0.01), reverse=True)
+        )
+        prefix.append(
+            '<div class="time-budget">'
+            f"<h2>Time budget: {self.budget:g}s</h2>"
+            f"<p>Selected {len(self.selected)} tests with an estimated {self.estimate:.1f}s "
+            f"({failed_first} previously failed tests ran first), "
+            f"covering {len({c.category for c in self.selected})} categories and {len(covered)} BUG ids. "
+            f"Selection computed in {self.elapsed_ms:.1f} ms.</p>"
+            + (
+                f"<p>Skipped {len(self.skipped)} tests that did not fit the remaining budget "
+                "after higher value-per-second tests were chosen"
+                + (f"; BUG ids left uncovered: {', '.join(missed)}" if missed else "")
+                + ":</p>"
+                f"<details><summary>Skipped tests</summary><ul>{rows}</ul></details>"
+                if self.skipped else "<p>No tests were skipped.</p>"
+            )
+            + "</div>"
+        )
@@ -0,0 +1,220 @@
+"""
+Duration-balanced shards for CI matrices, and merging their results.
+
+`--shard i/n` runs the i-th of n shards. Shards are balanced by the
+tests' median durations from the history database (tests without
+history count as the median of the known ones), not by test count: the
+longest tests are placed first, each on the shard with the least time
+so far. Every shard computes the same split as long as it sees the
+same collection and history database; ties are broken by node id.
+
+A shard writes its results - the full setup/call/teardown reports,
+including the Category, Description and BUG id attributes conftest.py
+adds - to `reports/shards/shard-i-of-n.json`. Merging feeds those
+reports through the regular report hooks once more, producing one
+terminal summary, one history entry and one HTML report:
+
+    python -m pytest --shard 1/3            # on each CI runner
+    python -m plugins.shard merge reports/shards/*.json
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+from plugins.history import HistoryStore, WINDOW
+from plugins.selection import DEFAULT_DURATION
+
+SHARD_DIR = "reports/shards"
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """`"2/3"` -> (2, 3)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, e.g. 1/3, got {value!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {index} does not exist in {count} shards")
+    return index, count
+
+
+def expected_durations(nodeids: list[str], history: dict) -> dict[str, float]:
+    medians = {
+        nodeid: statistics.median(duration for _, duration in history[nodeid])
+        for nodeid in nodeids if history.get(nodeid)
+    }
+    fallback = statistics.median(medians.values()) if medians else DEFAULT_DURATION
+    return {nodeid: medians.get(nodeid, fallback) for nodeid in nodeids}
+
+
+def split(durations: dict[str, float], count: int) -> list[list[str]]:
+    """Longest-first greedy split into `count` shards of similar total duration."""
+    shards = [[] for _ in range(count)]
+    heap = [(0.0, index) for index in range(count)]
+    for nodeid in sorted(durations, key=lambda n: (-durations[n], n)):
+        total, index = heapq.heappop(heap)
+        shards[index].append(nodeid)
+        heapq.heappush(heap, (total + durations[nodeid], index))
+    return shards
+
+
+def results_path(index: int, count: int) -> str:
+    return os.path.join(SHARD_DIR, f"shard-{index}-of-{count}.json")
+
+
+class ShardSelector:
+    """Keeps this shard's tests and records their reports for the merge."""
+
+    def __init__(self, config):
+        self.config = config
+        self.index, self.count = config.option.shard
+        self.totals = []
+        self.selected = 0
+        self.reports = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        # First, on the full collection, so that every shard splits the same list
+        store = HistoryStore(config.option.history_db)
+        history = store.recent(WINDOW)
+        store.close()
+        durations = expected_durations([item.nodeid for item in items], history)
+        shards = split(durations, self.count)
+        self.totals = [sum(durations[nodeid] for nodeid in shard) for shard in shards]
+        mine = set(shards[self.index - 1])
+        deselected = [item for item in items if item.nodeid not in mine]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in mine]
+        self.selected = len(items)
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        estimates = ", ".join(f"{total:.0f}s" for total in self.totals)
+        return f"shard {self.index}/{self.count}: {self.selected} tests (expected shard durations: {estimates})"
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+        self.reports.setdefault(report.nodeid, []).append(data)
+
+    def pytest_sessionfinish(self, session):
+        if self.config.option.collectonly:
+            return
+        path = results_path(self.index, self.count)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "shard": f"{self.index}/{self.count}",
+                "tests": [{"nodeid": nodeid, "reports": reports} for nodeid, reports in self.reports.items()],
+            }, f, default=str)
+        os.replace(tmp, path)
+
+
+class ShardMerger:
+    """Reports the results of shard files instead of running tests."""
+
+    def __init__(self, config):
+        self.config = config
+        self.paths = sorted({path for pattern in config.option.merge_shards for path in glob.glob(pattern)})
+        self.shards = []
+        self.missing = []
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        # Replaces the run loop: results come from the shard files. The tab
+        # runner skips its live batch while this is registered (tabs.SESSION_DRIVERS)
+        if session.config.option.collectonly:
+            return None
+        if not self.paths:
+            raise pytest.UsageError(f"--merge-shards: no files match {' '.join(self.config.option.merge_shards)}")
+        hook = self.config.hook
+        merged = set()
+        for path in self.paths:
+            with open(path, encoding="utf-8") as f:
+                shard = json.load(f)
+            self.shards.append(shard["shard"])
+            for test in shard["tests"]:
+                reports = [
+                    hook.pytest_report_from_serializable(config=self.config, data=data)
+                    for data in test["reports"]
+                ]
+                location = reports[0].location
+                hook.pytest_runtest_logstart(nodeid=test["nodeid"], location=location)
+                for report in reports:
+                    hook.pytest_runtest_logreport(report=report)
+                hook.pytest_runtest_logfinish(nodeid=test["nodeid"], location=location)
+                merged.add(test["nodeid"])
+        self.missing = [item.nodeid for item in session.items if item.nodeid not in merged]
+        return True
+
+    def _summary(self) -> str:
+        text = f"merged {len(self.paths)} shard files ({', '.join(self.shards)})"
+        if self.missing:
+            text += f"; {len(self.missing)} collected tests are in no shard"
+        return text
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_line(f"shards: {self._summary()}")
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        prefix.append(f"<p>Shards: {self._summary()}.</p>")
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("shard", "duration-balanced sharding")
+    group.addoption(
+        "--shard", type=parse_shard, default=None, metavar="I/N",
+        help="Run the I-th of N shards balanced by historical test durations",
+    )
+    group.addoption(
+        "--merge-shards", action="append", default=[], metavar="GLOB",
+        help="Report the results recorded by --shard runs instead of running tests",
+    )
+
+
+def pytest_configure(config):
+    if config.option.merge_shards:
+        if config.option.shard:
+            raise pytest.UsageError("--shard and --merge-shards cannot be combined")
+        config.pluginmanager.register(ShardMerger(config), "shard-merger")
+    elif config.option.shard:
+        config.pluginmanager.register(ShardSelector(config), "shard-selector")
+
+
+# ──────────────────────────────────────────────
+# COMMAND LINE
+# ──────────────────────────────────────────────
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m plugins.shard", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    merge = sub.add_parser("merge", help="Merge shard results into one HTML report and history entry")
+    merge.add_argument("files", nargs="*", default=[os.path.join(SHARD_DIR, "*.json")])
+    merge.add_argument("--html", default="reports/report.html", help="Report path (default: reports/report.html, which conftest.py timestamps like a regular run)")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    # Extra arguments go to pytest, e.g. --history-db or -q. A separate
+    # process, so that pytest imports the plugins itself.
+    return subprocess.call([
+        sys.executable, "-m", "pytest", "-p", "no:cacheprovider", f"--html={args.html}",
+        *(f"--merge-shards={pattern}" for pattern in args.files),
+        *pytest_args,
+    ])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Soak mode: repeat a user flow for a long time and look for leaks.
+
+A soak test repeats a cycle of named steps until `--soak-minutes` are
+up. After every step it forces a garbage collection and samples the
+page:
+
+    js_heap     used JS heap (CDP Runtime.getHeapUsage)
+    dom_nodes   live DOM nodes (CDP Memory.getDOMCounters)
+    listeners   JS event listeners (same)
+    storage     characters in localStorage + sessionStorage
+
+The first three need Chromium; storage is sampled everywhere. Samples
+are appended to `reports/soak/samples.jsonl` as they are taken, so an
+interrupted multi-hour run still leaves its data behind.
+
+At the end each step's samples are fitted with a line over the cycle
+number, one line per metric. A metric leaks when it grows by more than
+its `LEAK_SLOPES` threshold per cycle and the samples follow the line
+(correlation of at least MIN_CORRELATION), i.e. the growth is steady
+rather than noise. Growth carries over to every later step of the same
+page, so the earliest growing step in the cycle is reported as the
+offending one. The report gets a table per step and metric.
+
+Soak tests are marked `soak` and skipped unless `--soak-minutes` is
+given; see tests/test_soak.py. `--app-url` (plugins/stand_in.py) points
+them at a local stand-in for unattended runs.
+"""
+
+import html
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+
+SOAK_DIR = "reports/soak"
+
+METRICS = ("js_heap", "dom_nodes", "listeners", "storage")
+
+# Growth per cycle above which a steady trend counts as a leak
+LEAK_SLOPES = {"js_heap": 10 * 1024, "dom_nodes": 1.0, "listeners": 1.0, "storage": 16.0}
+
+MIN_CORRELATION = 0.8
+
+# Cycles needed before trends are fitted
+MIN_CYCLES = 5
+
+# Consecutive failed cycles after which the run gives up (e.g. the stand-in is down)
+MAX_FAILED_CYCLES = 5
+
+STORAGE_SIZE = """() => {
+    let size = 0;
+    for (const storage of [localStorage, sessionStorage]) {
+        for (let i = 0; i < storage.length; i++) {
+            const key = storage.key(i);
+            size += key.length + (storage.getItem(key) || "").length;
+        }
+    }
+    return size;
+}"""
+
+
+class Sampler:
+    """Forces GC and reads the memory counters of one page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.cdp = None
+        self.cdp_available = True
+
+    def _session(self):
+        if self.cdp is None and self.cdp_available:
+            try:
+                self.cdp = self.page.context.new_cdp_session(self.page)
+            except PlaywrightError:
+                self.cdp_available = False
+        return self.cdp
+
+    def sample(self) -> dict:
+        sample = dict.fromkeys(METRICS)
+        cdp = self._session()
+        if cdp is not None:
+            try:
+                cdp.send("HeapProfiler.collectGarbage")
+                sample["js_heap"] = cdp.send("Runtime.getHeapUsage")["usedSize"]
+                counters = cdp.send("Memory.getDOMCounters")
+                sample["dom_nodes"] = counters["nodes"]
+                sample["listeners"] = counters["jsEventListeners"]
+            except PlaywrightError:
+                # The session went away with its target; a new one next time
+                self.cdp = None
+        try:
+            sample["storage"] = self.page.evaluate(STORAGE_SIZE)
+        except PlaywrightError:
+            pass
+        return sample
+
+    def close(self):
+        if self.cdp is not None:
+            try:
+                self.cdp.detach()
+            except PlaywrightError:
+                pass
+
+
+class Trend:
+    """Linear fit of one metric after one step, over the cycles."""
+
+    def __init__(self, step: str, metric: str, cycles: list[int], values: list[float]):
+        self.step = step
+        self.metric = metric
+        self.first = values[0]
+        self.last = values[-1]
+        self.slope, _ = statistics.linear_regression(cycles, values)
+        try:
+            self.correlation = statistics.correlation(cycles, values)
+        except statistics.StatisticsError:
+            # Constant values: no trend
+            self.correlation = 0.0
+
+    @property
+    def leaking(self) -> bool:
+        return self.slope > LEAK_SLOPES[self.metric] and self.correlation >= MIN_CORRELATION
+
+    def describe(self) -> str:
+        return (
+            f"{self.metric} grows {_amount(self.metric, self.slope)} per cycle after '{self.step}' "
+            f"(r={self.correlation:.2f}, {_amount(self.metric, self.first)} -> {_amount(self.metric, self.last)})"
+        )
+
+
+def _amount(metric: str, value: float) -> str:
+    if metric == "js_heap":
+        return f"{value / 1024:.0f} KB"
+    if metric == "storage":
+        return f"{value:.0f} chars"
+    return f"{value:.1f}"
+
+
+class SoakResult:
+    def __init__(self, steps: list[str], samples: list[dict], cycles: int, failed: list[str], elapsed: float):
+        self.steps = steps
+        self.samples = samples
+        self.cycles = cycles
+        self.failed = failed
+        self.elapsed = elapsed
+        self.trends = self._fit() if cycles >= MIN_CYCLES else []
+
+    def _fit(self) -> list[Trend]:
+        trends = []
+        for step in self.steps:
+            for metric in METRICS:
+                points = [(s["cycle"], s[metric]) for s in self.samples if s["step"] == step and s[metric] is not None]
+                if len(points) >= MIN_CYCLES:
+                    trends.append(Trend(step, metric, *map(list, zip(*points))))
+        return trends
+
+    @property
+    def leaks(self) -> list[Trend]:
+        """Per leaking metric, the earliest growing step of the cycle."""
+        leaks = {}
+        for trend in self.trends:
+            if trend.leaking and trend.metric not in leaks:
+                leaks[trend.metric] = trend
+        return list(leaks.values())
+
+    def describe(self) -> str:
+        return "; ".join(trend.describe() for trend in self.leaks)
+
+    def summary(self) -> str:
+        text = f"{self.cycles} cycles in {self.elapsed / 60:.1f} min, {len(self.failed)} failed"
+        if self.cycles < MIN_CYCLES:
+            return f"{text}; too few cycles to fit trends (need {MIN_CYCLES})"
+        leaks = self.leaks
+        if not leaks:
+            return f"{text}; no steady growth"
+        return f"{text}; leak: " + "; ".join(f"{t.metric} from '{t.step}'" for t in leaks)
+
+    def html(self) -> str:
+        rows = "".join(
+            f"<tr><td>{html.escape(t.step)}</td><td>{t.metric}</td><td>{_amount(t.metric, t.first)}</td>"
+            f"<td>{_amount(t.metric, t.last)}</td><td>{_amount(t.metric, t.slope)}</td>"
+            f"<td>{t.correlation:.2f}</td><td>{'LEAK' if t.leaking else ''}</td></tr>"
+            for t in self.trends
+        )
+        failed = "".join(f"<li>{html.escape(reason)}</li>" for reason in self.failed[-10:])
+        return (
+            "<h2>Soak</h2>"
+            f"<p>{html.escape(self.summary())}. Samples: {SOAK_DIR}/samples.jsonl.</p>"
+            '<table class="time-breakdown"><tr><th>Step</th><th>Metric</th><th>First</th><th>Last</th>'
+            f"<th>Growth per cycle</th><th>r</th><th></th></tr>{rows}</table>"
+            + (f"<p>Last failed cycles:</p><ul>{failed}</ul>" if failed else "")
+        )
+
+
+class SoakRunner:
+    """Runs a cycle of steps for a fixed time, sampling memory after each step."""
+
+    def __init__(self, minutes: float):
+        self.minutes = minutes
+        self.results = []
+
+    def run(self, page, steps: list[tuple[str, object]]) -> SoakResult:
+        """Repeat `steps` ([(name, callable), ...]) until the time is up."""
+        os.makedirs(SOAK_DIR, exist_ok=True)
+        sampler = Sampler(page)
+        samples, failed = [], []
+        cycles = consecutive_failures = 0
+        start = time.monotonic()
+        deadline = start + self.minutes * 60
+        with open(os.path.join(SOAK_DIR, "samples.jsonl"), "w", encoding="utf-8") as log:
+            try:
+                while time.monotonic() < deadline:
+                    cycle_samples = []
+                    try:
+                        for name, action in steps:
+                            action()
+                            cycle_samples.append({
+                                "cycle": cycles, "step": name,
+                                "at": datetime.now().isoformat(timespec="seconds"), **sampler.sample(),
+                            })
+                    except Exception as e:
+                        # A half cycle would skew the trends; keep going from the next one
+                        failed.append(f"cycle {cycles}: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}")
+                        consecutive_failures += 1
+                        if consecutive_failures >= MAX_FAILED_CYCLES:
+                            raise
+                        continue
+                    consecutive_failures = 0
+                    for sample in cycle_samples:
+                        log.write(json.dumps(sample) + "\n")
+                    log.flush()
+                    samples.extend(cycle_samples)
+                    cycles += 1
+            finally:
+                sampler.close()
+        result = SoakResult([name for name, _ in steps], samples, cycles, failed, time.monotonic() - start)
+        self.results.append(result)
+        return result
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for result in self.results:
+            terminalreporter.write_line(f"soak: {result.summary()}")
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        for result in self.results:
+            postfix.append(result.html())
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+RUNNER_KEY = pytest.StashKey[SoakRunner]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("soak", "soak mode")
+    group.addoption(
+        "--soak-minutes", type=float, default=0, metavar="MINUTES",
+        help="Run the soak tests (marked soak) for this long each; they are skipped otherwise",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "soak: repeats a flow for --soak-minutes and checks memory for leaks")
+    if config.option.soak_minutes > 0:
+        runner = SoakRunner(config.option.soak_minutes)
+        config.stash[RUNNER_KEY] = runner
+        config.pluginmanager.register(runner, "soak-runner")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.option.soak_minutes > 0:
+        return
+    skip = pytest.mark.skip(reason="soak test: run with --soak-minutes N")
+    for item in items:
+        if item.get_closest_marker("soak"):
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def soak(pytestconfig) -> SoakRunner:
+    """The soak runner, set to --soak-minutes."""
+    return pytestconfig.stash[RUNNER_KEY]
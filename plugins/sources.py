@@ -0,0 +1,181 @@
+"""
+Symbol model of the test sources, shared by watch mode and impact analysis.
+
+The files in SOURCES are parsed with ast, never imported, so the model
+is current after every edit and costs milliseconds. A SourceFile lists
+the file's symbols down to class members (`DashboardPage.REWARDS_POINTS`,
+`TestLogin.test_login_success`) with their nodes and line spans, plus its
+imports, fixtures, tests, base classes and, for the async page objects
+in `pages/aio/`, the sync class they share locators with
+(`@locators_of(SyncLoginPage)`). A SourceIndex holds all files and
+resolves names, fixtures and counterparts across them.
+
+plugins/journeys.py is a source too: its steps drive the page objects
+for every `@pytest.mark.journey` test.
+"""
+
+import ast
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SOURCES = ("pages", "tests", "utils", "conftest.py", "plugins/journeys.py")
+
+# Pseudo symbol for a module's non-def statements (imports, constants' setup)
+MODULE = "<module>"
+
+
+def source_files(root: Path = ROOT) -> list[Path]:
+    files = []
+    for entry in SOURCES:
+        path = root / entry
+        if path.is_file():
+            files.append(path)
+        elif path.is_dir():
+            files.extend(p for p in path.rglob("*.py") if "__pycache__" not in p.parts)
+    return sorted(files)
+
+
+def names(node) -> set[str]:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def is_fixture(node) -> bool:
+    for decorator in node.decorator_list:
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        if isinstance(target, ast.Attribute) and target.attr == "fixture":
+            return True
+        if isinstance(target, ast.Name) and target.id == "fixture":
+            return True
+    return False
+
+
+def params(node) -> list[str]:
+    return [a.arg for a in node.args.args + node.args.kwonlyargs if a.arg not in ("self", "cls")]
+
+
+def is_hook(relpath: str, symbol: str) -> bool:
+    """A pytest hook in conftest.py or a plugin: it can change any test."""
+    return symbol.startswith("pytest_") and not relpath.startswith("tests/")
+
+
+def _counterpart(node: ast.ClassDef) -> str | None:
+    for decorator in node.decorator_list:
+        if (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name)
+                and decorator.func.id == "locators_of" and decorator.args
+                and isinstance(decorator.args[0], ast.Name)):
+            return decorator.args[0].id
+    return None
+
+
+class SourceFile:
+    """Symbols of one source file down to class members, with line spans."""
+
+    def __init__(self, relpath: str, source: str):
+        self.relpath = relpath
+        self.nodes = {}
+        self.spans = {}
+        self.imports = {}
+        self.fixtures = {}
+        self.bases = {}
+        self.counterparts = {}
+        self.tests = []
+        # Statements that are not symbols (imports, expressions, ...)
+        self.module_nodes = []
+        for node in ast.parse(source).body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._add(node.name, node)
+                if is_fixture(node):
+                    self.fixtures[node.name] = node.name
+                elif node.name.startswith("test"):
+                    self.tests.append(node.name)
+            elif isinstance(node, ast.ClassDef):
+                self._add_class(node)
+            elif isinstance(node, ast.Assign) and all(isinstance(t, ast.Name) for t in node.targets):
+                for target in node.targets:
+                    self._add(target.id, node)
+            else:
+                if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    for alias in node.names:
+                        self.imports[alias.asname or alias.name] = (node.module, alias.name)
+                self.module_nodes.append(node)
+
+    def _add(self, qualname: str, node):
+        self.nodes[qualname] = node
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        self.spans[qualname] = (start, node.end_lineno)
+
+    def _add_class(self, node: ast.ClassDef):
+        self._add(node.name, node)
+        self.bases[node.name] = [b.id for b in node.bases if isinstance(b, ast.Name)]
+        counterpart = _counterpart(node)
+        if counterpart is not None:
+            self.counterparts[node.name] = counterpart
+        for member in node.body:
+            if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._add(f"{node.name}.{member.name}", member)
+                if is_fixture(member):
+                    self.fixtures.setdefault(member.name, f"{node.name}.{member.name}")
+                elif member.name.startswith("test") and node.name.startswith("Test"):
+                    self.tests.append(f"{node.name}.{member.name}")
+            elif isinstance(member, ast.Assign):
+                for target in member.targets:
+                    if isinstance(target, ast.Name):
+                        self._add(f"{node.name}.{target.id}", member)
+
+    def symbol_at(self, line: int) -> str:
+        """Innermost symbol containing `line` (a member before its class)."""
+        best = MODULE
+        for qualname, (start, end) in self.spans.items():
+            if start <= line <= end and (best == MODULE or qualname.count(".") > best.count(".")):
+                best = qualname
+        return best
+
+
+class SourceIndex:
+    """SourceFiles of all SOURCES, with name, fixture and counterpart resolution."""
+
+    def __init__(self, root: Path = ROOT):
+        self.root = root
+        self.files = {}
+        for path in source_files(root):
+            self.update(path)
+
+    def update(self, path: Path):
+        relpath = path.relative_to(self.root).as_posix()
+        try:
+            self.files[relpath] = SourceFile(relpath, path.read_text(encoding="utf-8"))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            # Deleted, or saved mid-edit; keep the previous view
+            if not path.exists():
+                self.files.pop(relpath, None)
+
+    def resolve(self, source: SourceFile, name: str) -> tuple[str, str] | None:
+        """(relpath, qualname) of a module-level name used in `source`."""
+        if name in source.nodes:
+            return source.relpath, name
+        if name in source.imports:
+            module, symbol = source.imports[name]
+            relpath = module.replace(".", "/") + ".py"
+            if relpath in self.files and symbol in self.files[relpath].nodes:
+                return relpath, symbol
+        return None
+
+    def fixture(self, source: SourceFile, qualname: str, name: str) -> tuple[str, str] | None:
+        """Where fixture `name` requested by `qualname` is defined: its class,
+        its module, conftest.py, then the plugin sources."""
+        owner = qualname.split(".")[0] if "." in qualname else None
+        if owner and f"{owner}.{name}" in source.nodes:
+            return source.relpath, f"{owner}.{name}"
+        plugins = [f for relpath, f in sorted(self.files.items()) if relpath.startswith("plugins/")]
+        for candidate in (source, self.files.get("conftest.py"), *plugins):
+            if candidate is not None and name in candidate.fixtures:
+                return candidate.relpath, candidate.fixtures[name]
+        return None
+
+    def counterpart(self, relpath: str, cls: str) -> tuple[str, str] | None:
+        """The sync page object an async one shares its locators with."""
+        source = self.files.get(relpath)
+        if source is None or cls not in source.counterparts:
+            return None
+        return self.resolve(source, source.counterparts[cls])
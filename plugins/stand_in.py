@@ -0,0 +1,51 @@
+"""
+Run the browser tests against a local stand-in of the application.
+
+The page objects address the deployed app (`BASE_URL`). With
+`--app-url` every request a test's `page` makes to that origin is
+served by the stand-in instead, so the tests and page objects stay
+unchanged (API tests using Playwright's `request` are not routed):
+
+    python -m pytest tests/test_soak.py --soak-minutes 240 --app-url http://127.0.0.1:8000
+
+The stand-in has to serve the same pages and `/api/*` endpoints. Requests
+are forwarded with their method, headers and body, and the stand-in's
+response is returned under the original URL.
+"""
+
+import pytest
+
+from pages.login_page import BASE_URL
+
+
+def _forward(app_url: str):
+    def handle(route):
+        url = route.request.url.replace(BASE_URL, app_url.rstrip("/"), 1)
+        route.fulfill(response=route.fetch(url=url))
+
+    return handle
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("stand-in", "local stand-in of the application")
+    group.addoption(
+        "--app-url", default=None, metavar="URL",
+        help=f"Serve requests to {BASE_URL} from this URL instead (a local stand-in)",
+    )
+
+
+@pytest.fixture(autouse=True)
+def stand_in(request):
+    """Route the test's browser context to --app-url, if given."""
+    app_url = request.config.option.app_url
+    if not app_url or "page" not in request.fixturenames:
+        yield None
+        return
+    context = request.getfixturevalue("context")
+    context.route(f"{BASE_URL}/**", _forward(app_url))
+    yield app_url
@@ -0,0 +1,342 @@
+"""
+Streaming, compact HTML report for large runs (`--report-stream DIR`).
+
+pytest-html keeps every report in memory and renders one big document;
+with `--self-contained-html` every docstring and screenshot is inlined
+per row. For suites with tens of thousands of generated cases this mode
+replaces it:
+
+- each finished test is appended to `DIR/records.jsonl` immediately
+- docstrings are written once to `DIR/docs.jsonl` and referenced by hash
+- image extras are written once to `DIR/assets/<sha256>.<ext>`
+- at the end `DIR/index.html` is rendered by streaming the records into
+  gzip-compressed chunks; the viewer inflates chunks on demand
+  (DecompressionStream) and renders only the visible rows
+
+Memory stays flat regardless of test count: the plugin keeps only the
+set of seen docstring/asset hashes and a few counters.
+"""
+
+import base64
+import gzip
+import hashlib
+import html
+import json
+import os
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from plugins.history import final_outcome
+
+# Records per compressed chunk in the viewer
+CHUNK_SIZE = 500
+
+IMAGE_EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/gif": "gif", "image/svg+xml": "svg"}
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class StreamWriter:
+    """Appends result records and deduplicated docstrings/assets to DIR."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "assets"), exist_ok=True)
+        self.records = open(os.path.join(directory, "records.jsonl"), "w", encoding="utf-8")
+        self.docs = open(os.path.join(directory, "docs.jsonl"), "w", encoding="utf-8")
+        self.seen_docs = set()
+        self.seen_assets = set()
+        self.outcomes = Counter()
+        self.failed_rows = []
+        self.count = 0
+
+    def add_doc(self, doc: str) -> str | None:
+        if not doc:
+            return None
+        key = _digest(doc.encode())[:16]
+        if key not in self.seen_docs:
+            self.seen_docs.add(key)
+            self.docs.write(json.dumps([key, doc]) + "\n")
+        return key
+
+    def add_asset(self, content: str, mime_type: str) -> str | None:
+        """Store a base64 image extra once; return its path relative to DIR."""
+        extension = IMAGE_EXTENSIONS.get(mime_type)
+        if extension is None:
+            return None
+        data = base64.b64decode(content)
+        name = f"assets/{_digest(data)}.{extension}"
+        if name not in self.seen_assets:
+            self.seen_assets.add(name)
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(data)
+        return name
+
+    def add_record(self, record: dict):
+        record["i"] = self.count
+        self.records.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.records.flush()
+        self.outcomes[record["o"]] += 1
+        if record["o"] in ("failed", "error"):
+            self.failed_rows.append(self.count)
+        self.count += 1
+
+    def close(self):
+        self.records.close()
+        self.docs.close()
+
+
+def _compressed_chunks(path: str, size: int):
+    """Yield base64 gzip chunks of JSON arrays, reading `path` line by line."""
+    batch = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            batch.append(line.rstrip("\n"))
+            if len(batch) == size:
+                yield _pack(batch)
+                batch = []
+    if batch:
+        yield _pack(batch)
+
+
+def _pack(lines: list[str]) -> str:
+    payload = ("[" + ",".join(lines) + "]").encode("utf-8")
+    return base64.b64encode(gzip.compress(payload, compresslevel=9)).decode("ascii")
+
+
+def render_viewer(writer: StreamWriter, title: str, total_duration: float) -> str:
+    """Write DIR/index.html by streaming chunks from the record files."""
+    meta = {
+        "title": title,
+        "generated": datetime.now().strftime("%d-%b-%Y %H:%M:%S"),
+        "total": writer.count,
+        "chunkSize": CHUNK_SIZE,
+        "outcomes": dict(writer.outcomes),
+        "failedRows": writer.failed_rows,
+        "duration": round(total_duration, 2),
+    }
+    head, tail = VIEWER_TEMPLATE.split("<!-- CHUNKS -->")
+    path = os.path.join(writer.directory, "index.html")
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(head.replace("__TITLE__", html.escape(title)))
+        out.write('<script type="application/json" id="meta">')
+        out.write(json.dumps(meta).replace("</", "<\\/"))
+        out.write("</script>\n")
+        for chunk in _compressed_chunks(os.path.join(writer.directory, "records.jsonl"), CHUNK_SIZE):
+            out.write(f'<script type="application/octet-stream" class="chunk">{chunk}</script>\n')
+        for chunk in _compressed_chunks(os.path.join(writer.directory, "docs.jsonl"), CHUNK_SIZE):
+            out.write(f'<script type="application/octet-stream" class="docs">{chunk}</script>\n')
+        out.write(tail)
+    return path
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("stream-report", "streaming HTML report")
+    group.addoption(
+        "--report-stream", default=None, metavar="DIR",
+        help="Stream results to DIR and render a compact, virtualised viewer "
+        "at DIR/index.html instead of the pytest-html report",
+    )
+
+
+def pytest_configure(config):
+    if config.option.report_stream and not config.option.collectonly:
+        # Replaces pytest-html for this run, which would buffer every report
+        config.option.htmlpath = None
+        config.pluginmanager.register(StreamReport(config), "stream-report")
+
+
+class StreamReport:
+    """Writes one compact record per finished test."""
+
+    def __init__(self, config):
+        self.writer = StreamWriter(config.option.report_stream)
+        self.phases = {}
+        self.total_duration = 0.0
+
+    def pytest_runtest_logreport(self, report):
+        phases = self.phases.setdefault(report.nodeid, [])
+        phases.append(report)
+        if report.when != "teardown" or report.outcome == "rerun":
+            return
+        del self.phases[report.nodeid]
+
+        call = next((r for r in phases if r.when == "call"), phases[0])
+        problem = next((r for r in phases if r.failed), None)
+        duration = sum(r.duration for r in phases if r.outcome != "rerun")
+        self.total_duration += duration
+
+        assets = []
+        for report_phase in phases:
+            for extra in getattr(report_phase, "extras", []):
+                if extra.get("format_type") == "image":
+                    name = self.writer.add_asset(extra["content"], extra.get("mime_type", ""))
+                    if name:
+                        assets.append(name)
+
+        record = {
+            "n": report.nodeid,
+            "o": final_outcome(phases),
+            "d": round(duration, 3),
+            "c": getattr(call, "category", ""),
+            "s": getattr(call, "description", ""),
+            "doc": self.writer.add_doc(getattr(call, "description_full", "")),
+        }
+        if problem is not None:
+            record["e"] = problem.longreprtext
+        if assets:
+            record["a"] = assets
+        self.writer.add_record(record)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        self.writer.close()
+        self.path = render_viewer(self.writer, "QA Test Application - Test Report", self.total_duration)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep("-", f"Generated streaming report: file://{os.path.abspath(self.path)}")
+
+
+VIEWER_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+       color: #1a1a2e; background: #f8f9fa; margin: 0; padding: 20px 40px; font-size: 15px; }
+h1 { font-size: 1.8em; font-weight: 600; border-bottom: 3px solid #4361ee; padding-bottom: 10px; }
+.summary { background: white; padding: 12px 18px; border-radius: 8px; border-left: 4px solid #4361ee;
+           box-shadow: 0 1px 3px rgba(0,0,0,0.08); margin-bottom: 14px; }
+.summary label { margin-left: 16px; }
+.layout { display: flex; gap: 16px; }
+#viewport { flex: 3; height: 70vh; overflow-y: auto; position: relative; background: white;
+            border-radius: 8px; box-shadow: 0 1px 4px rgba(0,0,0,0.1); }
+#spacer { position: relative; }
+.row { position: absolute; left: 0; right: 0; height: 32px; line-height: 32px; padding: 0 12px;
+       display: flex; gap: 12px; border-bottom: 1px solid #eee; cursor: pointer; white-space: nowrap; }
+.row:hover { background: #edf2ff; }
+.row .outcome { width: 60px; font-weight: 600; }
+.row .category { width: 130px; color: #636e72; }
+.row .name { flex: 1; overflow: hidden; text-overflow: ellipsis; font-family: "SF Mono", "Consolas", monospace; font-size: 0.9em; }
+.row .duration { width: 70px; text-align: right; color: #636e72; }
+.passed .outcome { color: #2e7d32; } .failed .outcome, .error .outcome { color: #c62828; }
+.skipped .outcome { color: #f9a825; }
+#detail { flex: 2; height: 70vh; overflow-y: auto; background: white; border-radius: 8px; padding: 14px 18px;
+          box-shadow: 0 1px 4px rgba(0,0,0,0.1); }
+#detail pre { white-space: pre-wrap; word-wrap: break-word; font-size: 0.9em; }
+#detail .log { background: #1a1a2e; color: #a8e6cf; padding: 12px; border-radius: 6px; }
+#detail img { max-width: 100%; border: 1px solid #ccc; margin-top: 8px; }
+</style>
+</head>
+<body>
+<h1>__TITLE__</h1>
+<div class="summary" id="summary"></div>
+<div class="layout">
+  <div id="viewport"><div id="spacer"></div></div>
+  <div id="detail">Select a test to see its details.</div>
+</div>
+<!-- CHUNKS -->
+<script>
+(function () {
+  const ROW_HEIGHT = 32, MAX_CACHED_CHUNKS = 8;
+  const meta = JSON.parse(document.getElementById("meta").textContent);
+  const chunkEls = document.querySelectorAll("script.chunk");
+  const docEls = document.querySelectorAll("script.docs");
+  const chunks = new Map();
+  let docs = null;
+  let rows = null;  // null = all rows, otherwise list of row indexes
+
+  async function inflate(b64) {
+    const bytes = Uint8Array.from(atob(b64.trim()), c => c.charCodeAt(0));
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+    return JSON.parse(await new Response(stream).text());
+  }
+
+  function chunk(index) {
+    if (!chunks.has(index)) {
+      chunks.set(index, inflate(chunkEls[index].textContent));
+      if (chunks.size > MAX_CACHED_CHUNKS) chunks.delete(chunks.keys().next().value);
+    }
+    return chunks.get(index);
+  }
+
+  async function record(i) {
+    const data = await chunk(Math.floor(i / meta.chunkSize));
+    return data[i % meta.chunkSize];
+  }
+
+  async function loadDocs() {
+    if (docs === null) {
+      docs = new Map();
+      for (const el of docEls) for (const [key, doc] of await inflate(el.textContent)) docs.set(key, doc);
+    }
+    return docs;
+  }
+
+  const esc = s => String(s).replace(/[&<>"]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+  const viewport = document.getElementById("viewport");
+  const spacer = document.getElementById("spacer");
+  const detail = document.getElementById("detail");
+
+  function count() { return rows === null ? meta.total : rows.length; }
+
+  let renderToken = 0;
+  async function render() {
+    const token = ++renderToken;
+    spacer.style.height = count() * ROW_HEIGHT + "px";
+    const first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - 5);
+    const last = Math.min(count(), first + Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 10);
+    const html = [];
+    for (let pos = first; pos < last; pos++) {
+      const r = await record(rows === null ? pos : rows[pos]);
+      if (token !== renderToken) return;
+      html.push(`<div class="row ${r.o}" data-i="${r.i}" style="top:${pos * ROW_HEIGHT}px">` +
+        `<span class="outcome">${esc(r.o)}</span><span class="category">${esc(r.c)}</span>` +
+        `<span class="name" title="${esc(r.s)}">${esc(r.n)}</span><span class="duration">${r.d.toFixed(2)}s</span></div>`);
+    }
+    spacer.innerHTML = html.join("");
+  }
+
+  async function show(i) {
+    const r = await record(i);
+    const docMap = await loadDocs();
+    let body = `<h3>${esc(r.n)}</h3><p><b>${esc(r.o)}</b> in ${r.d.toFixed(2)}s &middot; ${esc(r.c)}</p>`;
+    if (r.doc) body += `<div><strong>Test Details:</strong><pre>${esc(docMap.get(r.doc) || "")}</pre></div>`;
+    if (r.e) body += `<pre class="log">${esc(r.e)}</pre>`;
+    for (const a of r.a || []) body += `<a href="${esc(a)}" target="_blank"><img src="${esc(a)}" loading="lazy"></a>`;
+    detail.innerHTML = body;
+  }
+
+  const o = meta.outcomes;
+  document.getElementById("summary").innerHTML =
+    `${meta.total} tests took ${meta.duration}s &middot; generated ${esc(meta.generated)} &middot; ` +
+    Object.keys(o).map(k => `${o[k]} ${esc(k)}`).join(", ") +
+    `<label><input type="checkbox" id="failedOnly"> failures only</label>`;
+  document.getElementById("failedOnly").addEventListener("change", e => {
+    rows = e.target.checked ? meta.failedRows : null;
+    viewport.scrollTop = 0;
+    render();
+  });
+  viewport.addEventListener("scroll", () => requestAnimationFrame(render));
+  spacer.addEventListener("click", e => {
+    const row = e.target.closest(".row");
+    if (row) show(Number(row.dataset.i));
+  });
+  render();
+})();
+</script>
+</body>
+</html>
+"""
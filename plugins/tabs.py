@@ -0,0 +1,302 @@
+"""
+Concurrent tabs for async tests.
+
+Tests written as `async def` against the async page objects in
+`pages/aio/` do not run one by one. Before the sync tests start, all
+selected async tests run together in one event loop, each in its own
+browser context and tab, at most `--tabs` at a time (`--tabs auto`
+tunes that number during the run, see plugins/autotune.py). Most of a
+UI test's time is spent waiting on the network and on fixed delays,
+so one worker keeps several tests in flight instead of sitting idle:
+
+    async def test_page_title(self, apage):
+        forgot_password_page = await ForgotPasswordPage(apage).open()
+        assert "Forgot Password" in await forgot_password_page.get_title()
+
+Async tests take the `apage` fixture (an async Playwright page) and
+their parameters, nothing else. Their results are replayed when pytest
+reaches each test, so reports, reruns and selection work as usual; the
+report rows carry the test's own duration in the tab.
+
+The batch leaves out what pytest would not run: tests skipped by
+`skip`/`skipif`, `xfail(run=False)`, and tests that the journal
+(`--resume`) or `--incremental` report from earlier results. Once
+`--maxfail` (or `-x`) failures are in, no further tab starts; tests
+the batch did not get to run one at a time if pytest reaches them.
+"""
+
+import argparse
+import asyncio
+import inspect
+import sys
+import threading
+import time
+
+import pytest
+from _pytest.skipping import evaluate_skip_marks, evaluate_xfail_marks
+from playwright.async_api import async_playwright
+
+from plugins.autotune import ConcurrencyTuner, default_max_level
+from plugins.browser_server import cli_launch_args
+
+DEFAULT_TABS = 4
+
+AUTO = "auto"
+
+RESULT_KEY = pytest.StashKey[tuple]()
+
+# The fixtures the tab runner provides to async tests
+TAB_FIXTURES = ("apage",)
+
+# Plugins that replace the run loop (plugins/fleet.py, plugins/shard.py); no local batch beside them
+SESSION_DRIVERS = ("fleet-coordinator", "fleet-worker", "shard-merger")
+
+# Plugins that report some tests from earlier results (plugins/journal.py, plugins/incremental.py)
+REPLAYERS = ("run-journal", "incremental-cache")
+
+
+def is_async_test(item) -> bool:
+    return isinstance(item, pytest.Function) and inspect.iscoroutinefunction(item.function)
+
+
+def _call_args(item, page) -> dict:
+    params = getattr(item, "callspec", None)
+    params = params.params if params else {}
+    kwargs = {}
+    for name in inspect.signature(item.function).parameters:
+        if name in ("self", "cls"):
+            continue
+        if name == "apage":
+            kwargs[name] = page
+        else:
+            kwargs[name] = params[name]
+    return kwargs
+
+
+def counts_as_failure(item, excinfo) -> bool:
+    """Whether a tab result is a failure for --maxfail and the autotuner."""
+    if excinfo is None or isinstance(excinfo[1], (pytest.skip.Exception, pytest.xfail.Exception)):
+        return False
+    return item.get_closest_marker("xfail") is None
+
+
+def will_run(item, config) -> bool:
+    """Whether pytest would execute this test, rather than skip or replay it."""
+    try:
+        if evaluate_skip_marks(item) is not None:
+            return False
+        xfail = evaluate_xfail_marks(item)
+    except pytest.fail.Exception:
+        # A broken skipif/xfail condition; pytest reports it at setup
+        return False
+    if xfail is not None and not xfail.run:
+        return False
+    for name in REPLAYERS:
+        plugin = config.pluginmanager.get_plugin(name)
+        if plugin is not None and plugin.replays(item):
+            return False
+    return True
+
+
+def tabs_option(value: str):
+    """`--tabs`: a number of tabs or "auto"."""
+    if value == AUTO:
+        return AUTO
+    try:
+        tabs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or {AUTO!r}, got {value!r}")
+    if tabs < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return tabs
+
+
+def check_fixtures(item) -> str:
+    """Why the tab runner cannot provide this async test's arguments, or ""."""
+    params = getattr(item, "callspec", None)
+    params = params.params if params else {}
+    unsupported = [
+        name for name in inspect.signature(item.function).parameters
+        if name not in ("self", "cls") and name not in TAB_FIXTURES and name not in params
+    ]
+    if unsupported:
+        return f"async tests run in tabs and can only use {', '.join(TAB_FIXTURES)}, not {', '.join(unsupported)}"
+    return ""
+
+
+class TabRunner:
+    """Runs async tests as concurrent tabs of one browser."""
+
+    def __init__(self, config):
+        self.config = config
+        self.limit = config.option.tabs
+        self.tuner = None
+        self.wall = 0.0
+        self.busy = 0.0
+        self.peak = 0
+        self.count = 0
+        self.failed = 0
+
+    async def _launch(self, playwright):
+        browser_name, launch_args = cli_launch_args(self.config)
+        browser_type = getattr(playwright, browser_name)
+        if self.config.option.browser_endpoint:
+            return await browser_type.connect(self.config.option.browser_endpoint, slow_mo=launch_args.get("slow_mo"))
+        return await browser_type.launch(**launch_args)
+
+    async def _run_all(self, items):
+        # A condition rather than a semaphore: the autotuner moves the limit while tests run
+        slot = asyncio.Condition()
+        in_flight = 0
+
+        async with async_playwright() as playwright:
+            try:
+                browser = await self._launch(playwright)
+            except Exception:
+                # Every test reports the launch error, like sync tests do
+                for item in items:
+                    item.stash[RESULT_KEY] = (0.0, sys.exc_info())
+                return
+
+            maxfail = self.config.option.maxfail
+
+            async def run_one(item):
+                nonlocal in_flight
+                async with slot:
+                    await slot.wait_for(lambda: in_flight < self.limit)
+                    if maxfail and self.failed >= maxfail:
+                        return
+                    in_flight += 1
+                self.peak = max(self.peak, in_flight)
+                context = await browser.new_context()
+                start = time.perf_counter()
+                excinfo = None
+                try:
+                    page = await context.new_page()
+                    await item.obj(**_call_args(item, page))
+                except (Exception, pytest.skip.Exception, pytest.fail.Exception):
+                    # pytest.skip/fail/xfail raise BaseExceptions; they belong to the test, not the batch
+                    excinfo = sys.exc_info()
+                finally:
+                    duration = time.perf_counter() - start
+                    await context.close()
+                item.stash[RESULT_KEY] = (duration, excinfo)
+                failed = counts_as_failure(item, excinfo)
+                self.busy += duration
+                self.count += 1
+                self.failed += failed
+                async with slot:
+                    in_flight -= 1
+                    if self.tuner is not None:
+                        self.limit = self.tuner.record(duration, failed)
+                    slot.notify_all()
+
+            try:
+                await asyncio.gather(*(run_one(item) for item in items))
+            finally:
+                await browser.close()
+
+    def run(self, items):
+        if self.config.option.tabs == AUTO and len(items) > 1:
+            self.tuner = ConcurrencyTuner(len(items), self.config.option.max_tabs)
+            self.limit = self.tuner.level
+        elif self.config.option.tabs == AUTO:
+            self.limit = 1
+        start = time.perf_counter()
+        asyncio.run(self._run_all(items))
+        self.wall += time.perf_counter() - start
+
+    def run_alone(self, item):
+        """Run one async test outside the batch (when another runner drives the session)."""
+        # In a thread: a sync Playwright session may already own this thread's event loop
+        thread = threading.Thread(target=self.run, args=([item],))
+        thread.start()
+        thread.join()
+
+    def summary(self) -> str:
+        speedup = self.busy / self.wall if self.wall else 0
+        return (
+            f"{self.count} async tests in up to {self.peak} concurrent tabs: "
+            f"{self.wall:.1f}s wall for {self.busy:.1f}s of test time ({speedup:.1f}x)"
+        )
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.config.option.collectonly:
+            return None
+        if any(session.config.pluginmanager.has_plugin(name) for name in SESSION_DRIVERS):
+            # Their loop decides where and whether tests run; async tests a
+            # fleet worker receives run one at a time through run_alone
+            return None
+        items = [
+            item for item in session.items
+            if is_async_test(item) and not check_fixtures(item) and will_run(item, session.config)
+        ]
+        if items:
+            self.run(items)
+        return None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pyfunc_call(self, pyfuncitem):
+        if not is_async_test(pyfuncitem):
+            return None
+        if reason := check_fixtures(pyfuncitem):
+            pytest.fail(reason, pytrace=False)
+        if RESULT_KEY not in pyfuncitem.stash:
+            self.run_alone(pyfuncitem)
+        _, excinfo = pyfuncitem.stash[RESULT_KEY]
+        if excinfo is not None:
+            raise excinfo[1].with_traceback(excinfo[2])
+        return True
+
+    @pytest.hookimpl(hookwrapper=True, trylast=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "call" and RESULT_KEY in item.stash:
+            # The call only re-raised the tab's result; history, --time-budget
+            # and --shard need the time the test took in its tab
+            report.duration = item.stash[RESULT_KEY][0]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.count:
+            terminalreporter.write_line(f"tabs: {self.summary()}")
+        if self.tuner is not None:
+            terminalreporter.write_line(f"tabs autotune: {self.tuner.summary()}")
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if self.count:
+            prefix.append(f"<p>Tabs: {self.summary()}.</p>")
+        if self.tuner is not None:
+            postfix.append(self.tuner.html())
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("tabs", "concurrent tabs for async tests")
+    group.addoption(
+        "--tabs", type=tabs_option, default=DEFAULT_TABS,
+        help=f"How many async tests run at once, each in its own tab, or 'auto' to tune it (default: {DEFAULT_TABS})",
+    )
+    group.addoption(
+        "--max-tabs", type=int, default=default_max_level(),
+        help="Upper bound for --tabs auto (default: twice the CPU count)",
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(TabRunner(config), "tab-runner")
+
+
+@pytest.fixture
+def apage():
+    """Async Playwright page of an async test.
+
+    The tab runner passes each async test its own page; this fixture only
+    declares the name.
+    """
+    return None
@@ -0,0 +1,246 @@
+"""
+Adaptive timeouts from the latencies of previous runs.
+
+The waits in page objects, fixtures and tests carry fixed timeouts
+(`wait_for_url(..., timeout=10000)`), or none at all, which means
+Playwright's 30 s default. A fixed value is too long on a fast machine,
+so a broken test hangs for 10 s before failing. It can also be too short
+on a slow CI runner.
+
+The waiting Playwright calls (sync and async `Page`) are wrapped at
+configure time, like plugins/timing.py does:
+
+    goto  wait_for_url  wait_for_selector  wait_for_load_state
+
+Each call is an operation keyed by method and target, e.g.
+`wait_for_url **/dashboard.html**` or `wait_for_selector #loginMessage
+(visible)`. The latency of every successful call is stored in the
+history database. Once an operation has MIN_SAMPLES samples over the
+last WINDOW runs, its timeout is `--timeout-multiplier` times their p99,
+kept within MIN_TIMEOUT_MS..MAX_TIMEOUT_MS, and replaces the timeout
+passed in code. Until then the timeout in code applies. The report shows
+each operation's p99, its timeout and the waits that timed out.
+
+Operations are learned per scope: under a device profile
+(plugins/devices.py) a wait is its own operation, `[slow-phone]
+wait_for_url ...`, so a throttled phone does not inherit desktop p99s.
+Until such an operation is learned, the timeout in code is multiplied
+by the profile's timeout scale (3.3x on slow-phone), so `timeout=10000`
+does not fail a load that is within the profile's 10 s budget.
+"""
+
+import functools
+import html
+import inspect
+import re
+import statistics
+import time
+
+import pytest
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from plugins.history import HistoryStore, WINDOW
+
+WAIT_CALLS = ("goto", "wait_for_url", "wait_for_selector", "wait_for_load_state")
+
+DEFAULT_MULTIPLIER = 3.0
+
+# Samples an operation needs before its timeout is learned
+MIN_SAMPLES = 20
+
+MIN_TIMEOUT_MS = 1000
+MAX_TIMEOUT_MS = 60000
+
+
+def operation_key(name: str, args: tuple, kwargs: dict) -> str:
+    """`wait_for_url("**/index.html**")` -> "wait_for_url **/index.html**"."""
+    if args:
+        target = args[0]
+    elif name == "wait_for_load_state":
+        target = kwargs.get("state") or "load"
+    else:
+        target = kwargs.get("url", kwargs.get("selector", ""))
+    if isinstance(target, re.Pattern):
+        target = target.pattern
+    elif not isinstance(target, str):
+        target = getattr(target, "__name__", type(target).__name__)
+    if name == "wait_for_selector" and kwargs.get("state"):
+        target = f"{target} ({kwargs['state']})"
+    return f"{name} {target}"
+
+
+def p99(samples: list[float]) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[98]
+
+
+class Operation:
+    def __init__(self, samples: list[float]):
+        self.samples = len(samples)
+        self.p99 = p99(samples) if len(samples) >= MIN_SAMPLES else None
+        self.calls = 0
+        self.timed_out = 0
+        # Timeouts passed in code, used while nothing is learned
+        self.coded = set()
+
+
+class TimeoutManager:
+    """Learns per-operation timeouts and applies them to the waiting Playwright calls."""
+
+    def __init__(self, learned: dict[str, list[float]], multiplier: float):
+        self.multiplier = multiplier
+        self.operations = {operation: Operation(samples) for operation, samples in learned.items()}
+        self.samples = []
+        self.patched = []
+        # Set by plugins.devices while a test runs under a device profile
+        self.scope = ""
+        self.scale = 1
+
+    def timeout(self, operation: str) -> float | None:
+        """The learned timeout in ms, or None to keep the one in code."""
+        known = self.operations.get(operation)
+        if known is None or known.p99 is None:
+            return None
+        return min(max(self.multiplier * known.p99 * 1000, MIN_TIMEOUT_MS), MAX_TIMEOUT_MS)
+
+    def _before(self, name: str, args: tuple, kwargs: dict) -> tuple[str, float | None]:
+        operation = operation_key(name, args, kwargs)
+        if self.scope:
+            operation = f"[{self.scope}] {operation}"
+        entry = self.operations.setdefault(operation, Operation([]))
+        entry.calls += 1
+        entry.coded.add(kwargs.get("timeout"))
+        timeout = self.timeout(operation)
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        elif self.scale > 1 and kwargs.get("timeout"):
+            kwargs["timeout"] = kwargs["timeout"] * self.scale
+        return operation, timeout
+
+    def _timed_out(self, operation: str, timeout: float | None, error: Exception):
+        self.operations[operation].timed_out += 1
+        if timeout is not None and hasattr(error, "add_note"):
+            known = self.operations[operation]
+            error.add_note(
+                f"adaptive timeout {timeout:.0f} ms for {operation}: "
+                f"{self.multiplier:g} x p99 {known.p99:.2f}s of {known.samples} samples"
+            )
+
+    def wrap(self, func, name: str):
+        manager = self
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def adaptive(page, *args, **kwargs):
+                operation, timeout = manager._before(name, args, kwargs)
+                start = time.perf_counter()
+                try:
+                    result = await func(page, *args, **kwargs)
+                except PlaywrightTimeoutError as e:
+                    manager._timed_out(operation, timeout, e)
+                    raise
+                manager.samples.append((operation, time.perf_counter() - start))
+                return result
+        else:
+            @functools.wraps(func)
+            def adaptive(page, *args, **kwargs):
+                operation, timeout = manager._before(name, args, kwargs)
+                start = time.perf_counter()
+                try:
+                    result = func(page, *args, **kwargs)
+                except PlaywrightTimeoutError as e:
+                    manager._timed_out(operation, timeout, e)
+                    raise
+                manager.samples.append((operation, time.perf_counter() - start))
+                return result
+
+        return adaptive
+
+    def instrument(self):
+        for cls in (Page, AsyncPage):
+            for name in WAIT_CALLS:
+                original = vars(cls)[name]
+                self.patched.append((cls, name, original))
+                setattr(cls, name, self.wrap(original, name))
+
+    def summary(self) -> str:
+        used = [entry for entry in self.operations.values() if entry.calls]
+        learned = sum(1 for entry in used if entry.p99 is not None)
+        timed_out = sum(entry.timed_out for entry in used)
+        return (
+            f"{learned} of {len(used)} wait operations used learned timeouts "
+            f"({self.multiplier:g} x p99), {timed_out} waits timed out"
+        )
+
+    def html(self) -> str:
+        def coded(entry):
+            values = sorted(f"{value:.0f} ms" for value in entry.coded if value is not None)
+            return ", ".join(values) or "default"
+
+        rows = "".join(
+            f"<tr><td>{html.escape(operation)}</td><td>{entry.samples}</td>"
+            f"<td>{'-' if entry.p99 is None else f'{entry.p99:.2f}s'}</td>"
+            f"<td>{'-' if self.timeout(operation) is None else f'{self.timeout(operation):.0f} ms'}</td>"
+            f"<td>{coded(entry)}</td><td>{entry.calls}</td><td>{entry.timed_out}</td></tr>"
+            for operation, entry in sorted(self.operations.items(), key=lambda item: -item[1].calls)
+            if entry.calls
+        )
+        return (
+            "<h2>Adaptive timeouts</h2>"
+            f"<p>{html.escape(self.summary())}. Operations with fewer than {MIN_SAMPLES} samples "
+            "keep the timeout in code, scaled by the device profile's timeout scale.</p>"
+            '<table class="time-breakdown"><tr><th>Operation</th><th>Samples</th><th>p99</th>'
+            "<th>Timeout</th><th>In code</th><th>Calls</th><th>Timed out</th></tr>"
+            f"{rows}</table>"
+        )
+
+    # Hooks
+
+    def pytest_sessionfinish(self, session):
+        # Before the history recorder closes its store (trylast)
+        recorder = session.config.pluginmanager.get_plugin("history-recorder")
+        if recorder is not None and recorder.run_id is not None and self.samples:
+            recorder.store.record_waits(recorder.run_id, self.samples)
+
+    def pytest_unconfigure(self, config):
+        for cls, name, original in reversed(self.patched):
+            setattr(cls, name, original)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if any(entry.calls for entry in self.operations.values()):
+            terminalreporter.write_line(f"adaptive timeouts: {self.summary()}")
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if any(entry.calls for entry in self.operations.values()):
+            postfix.append(self.html())
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("adaptive-timeouts", "timeouts learned from previous runs")
+    group.addoption(
+        "--no-adaptive-timeouts", action="store_true", default=False,
+        help="Keep the timeouts in code instead of learning them from the history database",
+    )
+    group.addoption(
+        "--timeout-multiplier", type=float, default=DEFAULT_MULTIPLIER,
+        help=f"Learned timeout as a multiple of the operation's p99 latency (default: {DEFAULT_MULTIPLIER:g})",
+    )
+
+
+def pytest_configure(config):
+    option = config.option
+    if option.no_adaptive_timeouts or option.collectonly:
+        return
+    if option.timeout_multiplier <= 1:
+        raise pytest.UsageError("--timeout-multiplier must be greater than 1")
+    store = HistoryStore(option.history_db)
+    learned = store.wait_latencies(WINDOW)
+    store.close()
+    manager = TimeoutManager(learned, option.timeout_multiplier)
+    manager.instrument()
+    config.pluginmanager.register(manager, "adaptive-timeouts")
@@ -0,0 +1,231 @@
+"""
+Per-action timing for page objects.
+
+Every public method of `BasePage` and its subclasses is wrapped at
+configure time (the page modules stay untouched), and the Playwright
+calls that wait are wrapped to attribute their time:
+
+    sleep       page.wait_for_timeout(...)  - fixed delays
+    wait        wait_for_load_state / wait_for_url / wait_for_selector /
+                wait_for_function / locator.wait_for - waiting on a condition
+    roundtrip   everything else inside the action - driver calls
+                (goto, fill, click, text_content, ...)
+
+Nested actions (`login` calling `fill_email`) count towards both
+methods, but only the outermost action counts towards the test. The
+cost is two perf_counter() calls per action. Totals per test and per
+method are added to the HTML report as a "Time breakdown" section.
+"""
+
+import functools
+import html
+import time
+from dataclasses import dataclass
+
+import pytest
+from playwright.sync_api import Locator, Page
+
+from pages.base_page import BasePage
+
+# Playwright calls whose time is attributed to something other than the driver roundtrip
+SLEEP_CALLS = {Page: ("wait_for_timeout",)}
+WAIT_CALLS = {
+    Page: ("wait_for_load_state", "wait_for_url", "wait_for_selector", "wait_for_function"),
+    Locator: ("wait_for",),
+}
+
+# Rows shown in each table of the report section
+TOP_METHODS = 15
+TOP_TESTS = 10
+
+
+@dataclass
+class Timing:
+    calls: int = 0
+    total: float = 0.0
+    sleep: float = 0.0
+    wait: float = 0.0
+
+    @property
+    def roundtrip(self) -> float:
+        return max(self.total - self.sleep - self.wait, 0.0)
+
+    def add(self, total: float, sleep: float, wait: float):
+        self.calls += 1
+        self.total += total
+        self.sleep += sleep
+        self.wait += wait
+
+
+class ActionTimer:
+    """Aggregates action timings per method and per test."""
+
+    def __init__(self):
+        self.stack = []
+        self.by_method = {}
+        self.by_test = {}
+        # Page object functions each test called, for plugins.impact
+        self.used = {}
+        self.current_test = None
+
+    def _enter(self):
+        frame = [0.0, 0.0]
+        self.stack.append(frame)
+        return frame
+
+    def _exit(self, func, method: str, frame, elapsed: float):
+        self.stack.pop()
+        sleep, wait = frame
+        if self.stack:
+            # Waits inside a nested action belong to the enclosing one as well
+            self.stack[-1][0] += sleep
+            self.stack[-1][1] += wait
+        self.by_method.setdefault(method, Timing()).add(elapsed, sleep, wait)
+        if self.current_test is not None:
+            self.used.setdefault(self.current_test, set()).add(func)
+            if not self.stack:
+                self.by_test.setdefault(self.current_test, Timing()).add(elapsed, sleep, wait)
+
+    def action(self, func):
+        timer = self
+
+        @functools.wraps(func)
+        def timed(self, *args, **kwargs):
+            frame = timer._enter()
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                timer._exit(func, f"{type(self).__name__}.{func.__name__}", frame, time.perf_counter() - start)
+
+        timed.__timed__ = func
+        return timed
+
+    def driver_call(self, func, slot: int):
+        timer = self
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if not timer.stack:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.stack[-1][slot] += time.perf_counter() - start
+
+        timed.__timed__ = func
+        return timed
+
+
+def _page_classes():
+    pending, seen = [BasePage], []
+    while pending:
+        cls = pending.pop()
+        if cls not in seen:
+            seen.append(cls)
+            pending.extend(cls.__subclasses__())
+    return seen
+
+
+def instrument(timer: ActionTimer):
+    """Wrap page object methods and waiting Playwright calls; return an undo list."""
+    patched = []
+
+    def patch(cls, name, wrapped):
+        patched.append((cls, name, vars(cls)[name]))
+        setattr(cls, name, wrapped)
+
+    for cls in _page_classes():
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or not callable(attr) or hasattr(attr, "__timed__"):
+                continue
+            patch(cls, name, timer.action(attr))
+    for slot, calls in enumerate((SLEEP_CALLS, WAIT_CALLS)):
+        for cls, names in calls.items():
+            for name in names:
+                patch(cls, name, timer.driver_call(vars(cls)[name], slot))
+    return patched
+
+
+def _seconds(value: float) -> str:
+    return f"{value:.2f}s"
+
+
+def breakdown_html(timer: ActionTimer) -> str:
+    def table(title, first_column, rows):
+        body = "".join(
+            f"<tr><td>{html.escape(name)}</td><td>{t.calls}</td><td>{_seconds(t.total)}</td>"
+            f"<td>{_seconds(t.roundtrip)}</td><td>{_seconds(t.wait)}</td><td>{_seconds(t.sleep)}</td></tr>"
+            for name, t in rows
+        )
+        return (
+            f"<h3>{title}</h3><table class=\"time-breakdown\"><tr><th>{first_column}</th><th>Calls</th>"
+            f"<th>Total</th><th>Driver roundtrip</th><th>Waiting</th><th>Sleep</th></tr>{body}</table>"
+        )
+
+    def top(timings, n):
+        return sorted(timings.items(), key=lambda entry: entry[1].total, reverse=True)[:n]
+
+    overall = Timing()
+    for t in timer.by_test.values():
+        overall.add(t.total, t.sleep, t.wait)
+    return (
+        "<h2>Time breakdown</h2>"
+        f"<p>{_seconds(overall.total)} in page object actions: {_seconds(overall.roundtrip)} driver roundtrip, "
+        f"{_seconds(overall.wait)} waiting for conditions, {_seconds(overall.sleep)} fixed sleeps.</p>"
+        + table(f"Top {TOP_METHODS} methods by cumulative time", "Method", top(timer.by_method, TOP_METHODS))
+        + table(f"Top {TOP_TESTS} tests by action time", "Test", top(timer.by_test, TOP_TESTS))
+    )
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("action-timing", "page object action timing")
+    group.addoption(
+        "--no-action-timing", action="store_true", default=False,
+        help="Do not time page object actions",
+    )
+
+
+def pytest_configure(config):
+    if config.option.no_action_timing or config.option.collectonly:
+        return
+    config.pluginmanager.register(ActionTiming(), "action-timing")
+
+
+class ActionTiming:
+    """Instruments page objects for the session and reports the breakdown."""
+
+    def __init__(self):
+        self.timer = ActionTimer()
+        self.patched = instrument(self.timer)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.timer.current_test = item.nodeid
+        yield
+        self.timer.current_test = None
+
+    def pytest_unconfigure(self, config):
+        for cls, name, original in reversed(self.patched):
+            setattr(cls, name, original)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.timer.by_method:
+            return
+        terminalreporter.write_sep("-", "slowest page object methods (cumulative)")
+        top = sorted(self.timer.by_method.items(), key=lambda entry: entry[1].total, reverse=True)[:5]
+        for name, t in top:
+            terminalreporter.write_line(
+                f"{t.total:8.2f}s  {name} ({t.calls} calls; roundtrip {t.roundtrip:.2f}s, "
+                f"waiting {t.wait:.2f}s, sleep {t.sleep:.2f}s)"
+            )
+
+    def pytest_html_results_summary(self, prefix, summary, postfix, session):
+        if self.timer.by_method:
+            postfix.append(breakdown_html(self.timer))
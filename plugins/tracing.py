@@ -0,0 +1,148 @@
+"""
+Failure-only Playwright tracing with sampling and a disk cap.
+
+With `--trace-failures`, every browser test records a Playwright trace
+in memory. When the test passes the trace is dropped without touching
+the disk (unless it is picked by `--trace-sample-rate`); when it fails
+the trace is written to `reports/traces/` and linked from the test's
+row in the HTML report. Open one with `playwright show-trace <zip>`.
+
+`--trace-detail` controls what is recorded:
+    actions      actions, console and network only (cheapest)
+    screenshots  + screencast frames
+    snapshots    + DOM snapshots for the time-travel view
+    full         + screenshots, snapshots and test sources
+
+The traces directory is capped at `--trace-max-mb`; the oldest traces
+are evicted first. This replaces pytest-playwright's `--tracing
+retain-on-failure`, which writes every trace and deletes passing ones.
+"""
+
+import os
+import random
+import re
+from datetime import datetime
+
+import pytest
+from pytest_html import extras as pytest_extras
+
+from plugins.journeys import page_under_test
+from plugins.report_extras import add_extra, call_report
+
+DEFAULT_TRACE_DIR = "reports/traces"
+
+TRACE_DETAIL = {
+    "actions": {"screenshots": False, "snapshots": False, "sources": False},
+    "screenshots": {"screenshots": True, "snapshots": False, "sources": False},
+    "snapshots": {"screenshots": False, "snapshots": True, "sources": False},
+    "full": {"screenshots": True, "snapshots": True, "sources": True},
+}
+
+
+class TraceStore:
+    """Directory of trace files bounded to `max_bytes`, evicting the oldest."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        entries = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".zip")]
+        self.files = sorted(
+            ((os.path.getmtime(path), path, os.path.getsize(path)) for path in entries),
+        )
+        self.total = sum(size for _, _, size in self.files)
+
+    def path_for(self, nodeid: str) -> str:
+        slug = re.sub(r"[^\w.-]+", "_", nodeid)[-150:]
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return os.path.join(self.directory, f"{slug}-{stamp}.zip")
+
+    def add(self, path: str) -> list[str]:
+        """Account for a newly written trace; return the paths evicted."""
+        size = os.path.getsize(path)
+        self.files.append((os.path.getmtime(path), path, size))
+        self.total += size
+        evicted = []
+        while self.total > self.max_bytes and len(self.files) > 1:
+            _, oldest, oldest_size = self.files.pop(0)
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            self.total -= oldest_size
+            evicted.append(oldest)
+        return evicted
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("trace-failures", "failure-only Playwright tracing")
+    group.addoption(
+        "--trace-failures", action="store_true", default=False,
+        help="Record a trace for every browser test and keep it only if the test fails",
+    )
+    group.addoption(
+        "--trace-sample-rate", type=float, default=0.0,
+        help="Fraction of passing tests whose trace is kept as well (default: 0)",
+    )
+    group.addoption(
+        "--trace-detail", choices=sorted(TRACE_DETAIL), default="full",
+        help="What the trace records: actions, screenshots, snapshots or full (default: full)",
+    )
+    group.addoption(
+        "--trace-dir", default=DEFAULT_TRACE_DIR,
+        help=f"Where kept traces are written (default: {DEFAULT_TRACE_DIR})",
+    )
+    group.addoption(
+        "--trace-max-mb", type=float, default=200,
+        help="Disk cap for the traces directory; oldest traces are evicted (default: 200)",
+    )
+
+
+def pytest_configure(config):
+    if config.option.trace_failures and getattr(config.option, "tracing", "off") != "off":
+        raise pytest.UsageError("--trace-failures replaces --tracing; use only one of them")
+
+
+@pytest.fixture(scope="session")
+def trace_store(pytestconfig) -> TraceStore:
+    return TraceStore(pytestconfig.option.trace_dir, int(pytestconfig.option.trace_max_mb * 1024 * 1024))
+
+
+@pytest.fixture(autouse=True)
+def _failure_trace(request, pytestconfig):
+    """Trace browser tests in memory; persist the trace only if it is needed."""
+    if not pytestconfig.option.trace_failures:
+        yield
+        return
+    if "context" in request.fixturenames:
+        context = request.getfixturevalue("context")
+    elif (page := page_under_test(request)) is not None:
+        # A journey's context: traced from the end of its steps
+        context = page.context
+    else:
+        yield
+        return
+
+    store = request.getfixturevalue("trace_store")
+    context.tracing.start(
+        title=request.node.nodeid,
+        **TRACE_DETAIL[pytestconfig.option.trace_detail],
+    )
+    yield
+
+    report = call_report(request.node)
+    failed = report is None or report.failed
+    sampled = not failed and random.Random().random() < pytestconfig.option.trace_sample_rate
+    if not (failed or sampled):
+        context.tracing.stop()
+        return
+
+    path = store.path_for(request.node.nodeid)
+    context.tracing.stop(path=path)
+    store.add(path)
+    if report is not None and pytestconfig.option.htmlpath:
+        link = os.path.relpath(path, os.path.dirname(os.path.abspath(pytestconfig.option.htmlpath)))
+        add_extra(report, pytest_extras.url(link.replace(os.sep, "/"), name="Trace"))
@@ -0,0 +1,253 @@
+"""
+Watch mode (`--watch`): re-run the tests affected by each edit.
+
+pytest runs the selected tests once, then polls the test sources
+(`pages/`, `tests/`, `utils/`, `conftest.py` and the journey steps in
+plugins/journeys.py; see plugins/sources.py). On every change it works
+out which top-level symbols changed - a page object class, a fixture, a
+test data constant, a test - and re-runs only the tests that use them,
+directly or through fixtures and other symbols. For example, editing
+ForgotPasswordPage re-runs tests/test_forgot_password.py,
+tests/test_forgot_password_async.py (its tests use the `pages/aio/`
+counterpart, which shares the sync class's locators through
+`locators_of`), TC-R05 and the repeat visit and caching tests, which
+build the page object themselves.
+
+Dependencies come from the source (ast), not from imports, so they are
+current after every edit and cost milliseconds. Each re-run is a child
+pytest with `--warm-browser`, so it reuses the persistent browser
+server instead of launching Chromium; results stream to the terminal
+as they come. Changing a pytest hook in conftest.py or a plugin source
+re-runs the whole selection.
+"""
+
+import ast
+import hashlib
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from plugins.sources import MODULE, ROOT, SOURCES, SourceFile, SourceIndex, is_hook, names, params, source_files
+
+POLL_INTERVAL = 0.5
+
+# Wait for editors that write a file in several steps
+DEBOUNCE = 0.3
+
+
+def snapshot(files: list[Path]) -> dict[Path, float]:
+    mtimes = {}
+    for path in files:
+        try:
+            mtimes[path] = path.stat().st_mtime
+        except OSError:
+            pass
+    return mtimes
+
+
+def _digest(*nodes) -> str:
+    return hashlib.sha256("\n".join(ast.dump(node) for node in nodes).encode()).hexdigest()
+
+
+def watch_symbols(source: SourceFile) -> dict[str, tuple[str, set[str], list[str]]]:
+    """The file's re-run granularity: symbol -> (hash, names it uses, fixtures it requests).
+
+    Top-level functions, constants and classes are one symbol each. In test
+    classes every method is its own symbol; the class's decorators, bases and
+    other statements are shared by the methods.
+    """
+    symbols = {MODULE: (_digest(*source.module_nodes), set(), [])}
+    for qualname, node in source.nodes.items():
+        owner, _, _ = qualname.rpartition(".")
+        function = isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        if not owner:
+            if isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+                continue
+            refs = names(node.value) if isinstance(node, ast.Assign) else names(node)
+            symbols[qualname] = (_digest(node), refs, params(node) if function else [])
+        elif owner.startswith("Test") and function:
+            cls = source.nodes[owner]
+            shared = set()
+            for part in [*cls.decorator_list, *cls.bases]:
+                shared |= names(part)
+            for member in cls.body:
+                if not isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    shared |= names(member)
+            symbols[qualname] = (_digest(node), names(node) | shared, params(node))
+    return symbols
+
+
+class DependencyIndex(SourceIndex):
+    """Which tests depend on which symbols of the source files."""
+
+    def __init__(self, root: Path = ROOT):
+        self.symbols = {}
+        super().__init__(root)
+
+    def update(self, path: Path):
+        super().update(path)
+        relpath = path.relative_to(self.root).as_posix()
+        if relpath in self.files:
+            self.symbols[relpath] = watch_symbols(self.files[relpath])
+        else:
+            self.symbols.pop(relpath, None)
+
+    def dependencies(self, relpath: str, symbol: str) -> set[tuple[str, str]]:
+        """Transitive closure of the symbols `symbol` uses (itself included)."""
+        seen, pending = set(), [(relpath, symbol)]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            source = self.files.get(current[0])
+            if source is None:
+                continue
+            pending.append((source.relpath, MODULE))
+            # Async page objects share the sync class's locators
+            counterpart = self.counterpart(*current)
+            if counterpart is not None:
+                pending.append(counterpart)
+            _, refs, requested = self.symbols[source.relpath].get(current[1], (None, (), ()))
+            for name in refs:
+                target = self.resolve(source, name)
+                if target is not None:
+                    pending.append(target)
+            for name in requested:
+                target = self.fixture(source, current[1], name)
+                if target is not None:
+                    pending.append(target)
+        return seen
+
+    def tests(self) -> list[tuple[str, str]]:
+        return [
+            (relpath, test)
+            for relpath, source in self.files.items()
+            if relpath.startswith("tests/")
+            for test in source.tests
+        ]
+
+    def hashes(self) -> dict[tuple[str, str], str]:
+        return {
+            (relpath, symbol): digest
+            for relpath, symbols in self.symbols.items()
+            for symbol, (digest, _, _) in symbols.items()
+        }
+
+    def affected(self, changed: set[tuple[str, str]]) -> list[str]:
+        """Node ids (without parameters) of the tests that use a changed symbol."""
+        selected = []
+        for relpath, test in self.tests():
+            if self.dependencies(relpath, test) & changed:
+                selected.append(f"{relpath}::{test.replace('.', '::')}")
+        return selected
+
+
+def changed_symbols(before: dict, after: dict) -> set[tuple[str, str]]:
+    return {key for key in before.keys() | after.keys() if before.get(key) != after.get(key)}
+
+
+# ──────────────────────────────────────────────
+# WATCH LOOP
+# ──────────────────────────────────────────────
+
+
+def child_args(config) -> tuple[list[str], list[str]]:
+    """(options to pass to each re-run, positional selection of this run)."""
+    positional = [str(arg) for arg in config.args]
+    options = [
+        arg for arg in config.invocation_params.args
+        if arg != "--watch" and str(arg) not in positional
+    ]
+    return options, positional
+
+
+def in_selection(nodeid: str, selection: list[str]) -> bool:
+    """Whether a node id falls under one of the run's path / node id arguments."""
+    if not selection:
+        return True
+    path = ROOT / nodeid.split("::")[0]
+    for arg in selection:
+        file_part, _, rest = arg.partition("::")
+        target = Path(file_part).resolve()
+        if target != path and target not in path.parents:
+            continue
+        if not rest or nodeid.split("::", 1)[1].startswith(rest):
+            return True
+    return False
+
+
+def run_tests(options: list[str], nodeids: list[str]) -> int:
+    command = [
+        sys.executable, "-m", "pytest",
+        # No HTML report per save (addopts holds --html); the terminal is the output here
+        "-o", "addopts=",
+        "-v", "--warm-browser", *options, *nodeids,
+    ]
+    return subprocess.call(command, cwd=ROOT)
+
+
+def watch(config) -> int:
+    options, selection = child_args(config)
+    index = DependencyIndex()
+    hashes = index.hashes()
+    files = source_files()
+    mtimes = snapshot(files)
+
+    run_tests(options, selection)
+    print(f"\nwatching {', '.join(SOURCES)} for changes (Ctrl+C to stop)", flush=True)
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            files = source_files()
+            current = snapshot(files)
+            if current == mtimes:
+                continue
+            time.sleep(DEBOUNCE)
+            current = snapshot(source_files())
+            for path in set(current) | set(mtimes):
+                if current.get(path) != mtimes.get(path):
+                    index.update(path)
+            mtimes = current
+
+            new_hashes = index.hashes()
+            changed = changed_symbols(hashes, new_hashes)
+            hashes = new_hashes
+            if not changed:
+                continue
+            changes = ", ".join(sorted(f"{path}:{symbol}" for path, symbol in changed))
+            if any(is_hook(path, symbol) for path, symbol in changed):
+                print(f"\nchanged {changes}: pytest hook, re-running the selection", flush=True)
+                run_tests(options, selection)
+                continue
+            nodeids = [nodeid for nodeid in index.affected(changed) if in_selection(nodeid, selection)]
+            if not nodeids:
+                print(f"\nchanged {changes}: no affected tests", flush=True)
+                continue
+            print(f"\nchanged {changes}: re-running {len(nodeids)} affected tests", flush=True)
+            run_tests(options, nodeids)
+    except KeyboardInterrupt:
+        return 0
+
+
+# ──────────────────────────────────────────────
+# PYTEST PLUGIN
+# ──────────────────────────────────────────────
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("watch", "watch mode")
+    group.addoption(
+        "--watch", action="store_true", default=False,
+        help="Re-run the tests affected by each change to pages/, tests/, utils/, conftest.py or the journey steps",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    if config.option.watch:
+        return watch(config)
+    return None
@@ -0,0 +1,64 @@
+"""
+Automated test cases for caching headers, compression and payload sizes.
+
+Each of the four pages is visited once while its network log is recorded
+(plugins/caching.py): the page's document, stylesheets, scripts, images
+and the API JSON its form posts, until the page navigates elsewhere.
+Every response of the app is then checked from the log, without extra
+requests: text responses are compressed, static assets and documents
+carry Cache-Control/ETag headers a browser can reuse, API JSON is not
+stored by shared caches, and every payload stays within its budget.
+"""
+
+from pages.forgot_password_page import ForgotPasswordPage
+from pages.login_page import LoginPage
+from pages.register_page import RegisterPage
+from utils.test_data import VALID_USER, random_email
+
+
+def assert_visit_conforms(network_audit, name: str):
+    responses = network_audit.visits[name]
+    assert any(response.kind == "document" for response in responses), f"No document recorded for {name}"
+    findings = network_audit.findings(name)
+    assert not findings, f"{len(findings)} caching/compression findings on {name}:\n" + "\n".join(findings)
+
+
+class TestCachingHeaders:
+    """Compression, caching headers and payload budgets of each page's responses."""
+
+    def test_register_page_responses(self, page, network_audit):
+        """TC-CH01: Registration page and its /api/register response conform."""
+        register = RegisterPage(page)
+        with network_audit.visit("register.html"):
+            register.open()
+            register.fill_registration_form(**{**VALID_USER, "email": random_email()}, accept_terms=True)
+            register.submit_registration()
+
+        assert_visit_conforms(network_audit, "register.html")
+
+    def test_login_page_responses(self, page, registered_user, network_audit):
+        """TC-CH02: Login page and its /api/login response conform."""
+        login = LoginPage(page)
+        with network_audit.visit("index.html"):
+            login.open()
+            login.login(registered_user["email"], registered_user["password"])
+            page.wait_for_url("**/dashboard.html**", timeout=10000)
+
+        assert_visit_conforms(network_audit, "index.html")
+
+    def test_forgot_password_page_responses(self, page, network_audit):
+        """TC-CH03: Forgot password page responses conform."""
+        forgot = ForgotPasswordPage(page)
+        with network_audit.visit("forgot-password.html"):
+            forgot.open()
+            forgot.fill_email(random_email()).click_send_reset()
+
+        assert_visit_conforms(network_audit, "forgot-password.html")
+
+    def test_dashboard_page_responses(self, authenticated_page, network_audit):
+        """TC-CH04: Dashboard responses conform."""
+        dashboard, _ = authenticated_page
+        with network_audit.visit("dashboard.html"):
+            dashboard.open()
+
+        assert_visit_conforms(network_audit, "dashboard.html")
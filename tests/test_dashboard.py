@@ -11,6 +11,8 @@ Known bugs tested:
 """
 
 import pytest
+from pages.dashboard_page import DashboardPage
+from plugins.journeys import SIGNED_IN
 
 
 class TestDashboardAuthentication:
@@ -101,48 +103,49 @@ class TestDashboardLogout:
         )
 
 
+@pytest.mark.journey(SIGNED_IN)
 class TestDashboardElements:
     """Test dashboard UI elements."""
 
-    def test_stat_cards_visible(self, authenticated_page):
+    def test_stat_cards_visible(self, journey):
         """TC-D07: Dashboard shows stat cards."""
-        dashboard, user = authenticated_page
+        dashboard = journey.on(DashboardPage)
 
         count = dashboard.get_stat_card_count()
         assert count >= 3, f"Expected at least 3 stat cards, got {count}"
 
-    def test_action_buttons_present(self, authenticated_page):
+    def test_action_buttons_present(self, journey):
         """TC-D08: Dashboard has action buttons."""
-        dashboard, user = authenticated_page
+        dashboard = journey.on(DashboardPage)
 
         count = dashboard.get_action_button_count()
         assert count >= 3, f"Expected at least 3 action buttons, got {count}"
 
-    def test_activity_list_present(self, authenticated_page):
+    def test_activity_list_present(self, journey):
         """TC-D09: Dashboard shows recent activity."""
-        dashboard, user = authenticated_page
+        dashboard = journey.on(DashboardPage)
 
         count = dashboard.get_activity_count()
         assert count >= 2, f"Expected at least 2 activity items, got {count}"
 
-    def test_action_button_shows_toast(self, authenticated_page):
+    def test_action_button_shows_toast(self, journey):
         """TC-D10: Clicking action button shows toast message."""
-        dashboard, user = authenticated_page
+        dashboard = journey.on(DashboardPage)
 
         dashboard.click_action_button(0)  # "Update Profile"
 
         msg = dashboard.get_toast_message()
         assert msg != "", "Action button should show a toast message"
 
-    def test_page_title(self, authenticated_page):
+    def test_page_title(self, journey):
         """TC-D11: Dashboard page title is correct."""
-        dashboard, user = authenticated_page
+        dashboard = journey.on(DashboardPage)
 
         assert "Dashboard" in dashboard.page.title()
 
-    def test_last_login_displayed(self, authenticated_page):
+    def test_last_login_displayed(self, journey):
         """TC-D12: Last login timestamp is displayed."""
-        dashboard, user = authenticated_page
+        dashboard = journey.on(DashboardPage)
 
         last_login = dashboard.get_last_login()
         assert last_login != "", "Last login should be displayed"
@@ -0,0 +1,51 @@
+"""
+Async test cases for the Forgot Password page (forgot-password.html).
+
+Written against the async page objects in pages/aio/, these run together
+as concurrent tabs of one browser (plugins/tabs.py) before the sync tests,
+at most `--tabs` at a time. They cover the page's main paths; the full
+suite, including the known bugs, is in test_forgot_password.py.
+"""
+
+from pages.aio.forgot_password_page import ForgotPasswordPage
+
+
+class TestForgotPasswordAsync:
+    """Forgot password flow, run in concurrent tabs."""
+
+    async def test_reset_with_valid_email(self, apage):
+        """TC-FPA01: Submitting valid email shows success message."""
+        forgot_password_page = await ForgotPasswordPage(apage).open()
+        await forgot_password_page.fill_email("existing@example.com")
+        await forgot_password_page.click_send_reset()
+
+        assert await forgot_password_page.has_success_message()
+        assert "reset link" in (await forgot_password_page.get_message()).lower()
+
+    async def test_empty_email_rejected(self, apage):
+        """TC-FPA02: Empty email should not submit."""
+        forgot_password_page = await ForgotPasswordPage(apage).open()
+        await forgot_password_page.click_send_reset()
+
+        assert not await forgot_password_page.has_success_message()
+
+    async def test_security_question_has_correct_options(self, apage):
+        """TC-FPA03: Security question dropdown has expected options."""
+        forgot_password_page = await ForgotPasswordPage(apage).open()
+        options = await forgot_password_page.get_security_question_options()
+
+        assert "Select a question" in options
+        assert "What was your first pet's name?" in options
+
+    async def test_back_to_login_link(self, apage):
+        """TC-FPA04: 'Back to Login' link navigates to login page."""
+        forgot_password_page = await ForgotPasswordPage(apage).open()
+        await forgot_password_page.click_login_link()
+        await forgot_password_page.page.wait_for_load_state("networkidle")
+
+        assert "index.html" in await forgot_password_page.get_url()
+
+    async def test_page_title(self, apage):
+        """TC-FPA05: Page title should mention Forgot Password."""
+        forgot_password_page = await ForgotPasswordPage(apage).open()
+        assert "Forgot Password" in await forgot_password_page.get_title()
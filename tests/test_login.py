@@ -128,3 +128,17 @@ class TestLoginUIElements:
         """TC-L13: Remember Me checkbox exists on the page."""
         checkbox = login_page.page.locator(login_page.REMEMBER_ME)
         assert checkbox.count() > 0, "Remember Me checkbox should exist"
+
+
+class TestLoginDeviceProfiles:
+    """Login under throttled device profiles (plugins/devices.py)."""
+
+    @pytest.mark.device("slow-phone")
+    def test_login_redirects_to_dashboard_on_slow_phone(self, login_page, registered_user):
+        """TC-L14: Login redirects to dashboard on a slow phone (Fast 3G, CPU 6x)."""
+        login_page.login(registered_user["email"], registered_user["password"])
+        login_page.page.wait_for_url("**/dashboard.html**", timeout=10000)
+
+        assert "dashboard.html" in login_page.get_url(), (
+            "Expected redirect to dashboard after login on a slow phone"
+        )
@@ -543,3 +543,26 @@ class TestDuplicateRegistration:
         assert register_page.has_error_message(), (
             "Duplicate email registration should show error message"
         )
+
+
+# ──────────────────────────────────────────────
+# DEVICE PROFILE TESTS
+# ──────────────────────────────────────────────
+
+
+class TestRegistrationDeviceProfiles:
+    """Registration under throttled device profiles (plugins/devices.py)."""
+
+    @pytest.mark.device("slow-phone")
+    def test_registration_redirects_to_login_on_slow_phone(self, register_page):
+        """TC-026: Registration redirects to login on a slow phone (Fast 3G, CPU 6x)."""
+        register_page.fill_registration_form(
+            **{**VALID_USER, "email": random_email()},
+            accept_terms=True,
+        )
+        register_page.submit_registration()
+        register_page.page.wait_for_url("**/index.html**", timeout=10000)
+
+        assert "index.html" in register_page.get_url(), (
+            "Expected redirect to login page after registration on a slow phone"
+        )
@@ -0,0 +1,75 @@
+"""
+Automated test cases for repeat visits: warm vs cold page loads.
+
+Each of the four pages is loaded cold, in a new browser context with an
+empty HTTP cache, and then warm, by navigating to it again in the same
+context. Both loads are recorded (requests, transferred bytes, cache hits,
+DOMContentLoaded and load time; see plugins/caching.py), and the warm
+load has to benefit from HTTP caching: fewer bytes over the network and
+at least one response served from the cache.
+
+The pages come from contexts of their own, which the stand-in
+(plugins/stand_in.py) does not route - and routing a context turns off
+its HTTP cache, so nothing could be compared. The tests are therefore
+skipped under --app-url. For the same reason tracing and failure
+screenshots, which follow the `page` fixture, do not see these pages.
+"""
+
+import pytest
+from pages.dashboard_page import DashboardPage
+from pages.forgot_password_page import ForgotPasswordPage
+from pages.login_page import LoginPage
+from pages.register_page import RegisterPage
+from plugins.journeys import Checkpoint, JourneyState
+
+pytestmark = pytest.mark.skipif(
+    "config.option.app_url", reason="repeat visits need the HTTP cache, which routing to --app-url disables",
+)
+
+
+def assert_warm_load_cached(name: str, cold: dict, warm: dict):
+    assert warm["transferred"] < cold["transferred"], (
+        f"Warm load of {name} transferred {warm['transferred']} bytes, "
+        f"cold load {cold['transferred']}: nothing was cached"
+    )
+    assert warm["from_cache"] > 0, (
+        f"Warm load of {name} got none of its {warm['requests']} responses from the HTTP cache"
+    )
+
+
+class TestRepeatVisits:
+    """A second visit to a page is served partly from the HTTP cache."""
+
+    @pytest.mark.parametrize("page_class", [
+        pytest.param(RegisterPage, id="register"),
+        pytest.param(LoginPage, id="login"),
+        pytest.param(ForgotPasswordPage, id="forgot-password"),
+    ])
+    def test_warm_load_uses_http_cache(self, page_class, new_context, load_comparison):
+        """TC-RV01: Loading a public page again in the same context transfers less than the first load."""
+        visit = page_class(new_context().new_page())
+
+        cold = visit.open().get_load_metrics()
+        warm = visit.open().get_load_metrics()
+
+        name = page_class.URL.rsplit("/", 1)[-1]
+        load_comparison(name, cold, warm)
+        assert_warm_load_cached(name, cold, warm)
+
+    def test_dashboard_warm_load_uses_http_cache(self, authenticated_page, new_context, load_comparison):
+        """TC-RV02: Loading the dashboard again in the same context transfers less than the first load.
+
+        The signed-in session is copied into a new context (plugins/journeys.py);
+        its sessionStorage is seeded on a blank document, so the dashboard's
+        first load there still starts from an empty cache.
+        """
+        dashboard, _ = authenticated_page
+        state = Checkpoint(JourneyState(dashboard.page.context, dashboard.page)).fork(new_context)
+        visit = state.on(DashboardPage)
+
+        cold = visit.get_load_metrics()
+        warm = visit.open().get_load_metrics()
+
+        assert "dashboard.html" in visit.get_url(), "The copied session should stay signed in"
+        load_comparison("dashboard.html", cold, warm)
+        assert_warm_load_cached("dashboard.html", cold, warm)
@@ -19,9 +19,9 @@ Known bugs tested:
 
 import pytest
 from pages.register_page import RegisterPage
-from pages.login_page import LoginPage
 from pages.forgot_password_page import ForgotPasswordPage
-from utils.test_data import MOBILE_VIEWPORT, TABLET_VIEWPORT, random_email
+from plugins.journeys import SIGNED_IN, set_viewport
+from utils.test_data import MOBILE_VIEWPORT, TABLET_VIEWPORT
 
 
 class TestMobileRegistration:
@@ -160,111 +160,42 @@ class TestMobileLogin:
 class TestTabletDashboard:
     """Test tablet viewport issues on dashboard page."""
 
-    def test_rewards_card_not_overlaid_on_tablet(self, page):
+    @pytest.mark.journey(SIGNED_IN.then(set_viewport(TABLET_VIEWPORT)))
+    def test_rewards_card_not_overlaid_on_tablet(self, journey):
         """TC-R07: BUG - Rewards card has overlay on tablet.
 
         The .mobile-hidden-card class shows overlay-image-rewards on tablet viewports.
         Requires authenticated access to dashboard.
         """
-        # Register and login to access dashboard
-        email = random_email()
-        reg = RegisterPage(page)
-        reg.open()
-        reg.fill_registration_form(
-            first_name="Test", last_name="User", email=email,
-            phone="0911234567", address="123 St", city="Split",
-            zip_code="21000", password="SecurePass123!",
-            confirm_password="SecurePass123!", accept_terms=True,
-        )
-        reg.submit_registration()
-        page.wait_for_url("**/index.html**", timeout=10000)
-
-        login = LoginPage(page)
-        login.open()
-        login.login(email, "SecurePass123!")
-        page.wait_for_url("**/dashboard.html**", timeout=10000)
-        page.wait_for_load_state("networkidle")
-
-        # Set tablet viewport and check for overlay
-        page.set_viewport_size(TABLET_VIEWPORT)
-        page.reload()
-        page.wait_for_load_state("networkidle")
-
-        overlay = page.locator(".mobile-hidden-card .overlay-image-rewards")
+        overlay = journey.page.locator(".mobile-hidden-card .overlay-image-rewards")
         overlay_visible = overlay.is_visible()
 
         assert not overlay_visible, (
             "BUG: Rewards card has an overlay covering it on tablet viewport"
         )
 
-    def test_activity_item_not_overlaid_on_tablet(self, page):
+    @pytest.mark.journey(SIGNED_IN.then(set_viewport(TABLET_VIEWPORT)))
+    def test_activity_item_not_overlaid_on_tablet(self, journey):
         """TC-R08: BUG - Activity list item has overlay on tablet.
 
         The .tablet-hidden-activity class shows overlay-image-activity on tablet viewports.
         Requires authenticated access to dashboard.
         """
-        # Register and login to access dashboard
-        email = random_email()
-        reg = RegisterPage(page)
-        reg.open()
-        reg.fill_registration_form(
-            first_name="Test", last_name="User", email=email,
-            phone="0911234567", address="123 St", city="Split",
-            zip_code="21000", password="SecurePass123!",
-            confirm_password="SecurePass123!", accept_terms=True,
-        )
-        reg.submit_registration()
-        page.wait_for_url("**/index.html**", timeout=10000)
-
-        login = LoginPage(page)
-        login.open()
-        login.login(email, "SecurePass123!")
-        page.wait_for_url("**/dashboard.html**", timeout=10000)
-        page.wait_for_load_state("networkidle")
-
-        # Set tablet viewport and check for overlay
-        page.set_viewport_size(TABLET_VIEWPORT)
-        page.reload()
-        page.wait_for_load_state("networkidle")
-
-        overlay = page.locator(".tablet-hidden-activity .overlay-image-activity")
+        overlay = journey.page.locator(".tablet-hidden-activity .overlay-image-activity")
         overlay_visible = overlay.is_visible()
 
         assert not overlay_visible, (
             "BUG: Activity list item has an overlay covering it on tablet viewport"
         )
 
-    def test_dashboard_card_not_overlaid_on_tablet(self, page):
+    @pytest.mark.journey(SIGNED_IN.then(set_viewport(TABLET_VIEWPORT)))
+    def test_dashboard_card_not_overlaid_on_tablet(self, journey):
         """TC-R09: BUG - Dashboard stat card has overlay on tablet.
 
         The .tablet-hidden-card class shows overlay-image-dashboard on tablet viewports.
         Requires authenticated access to dashboard.
         """
-        # Register and login to access dashboard
-        email = random_email()
-        reg = RegisterPage(page)
-        reg.open()
-        reg.fill_registration_form(
-            first_name="Test", last_name="User", email=email,
-            phone="0911234567", address="123 St", city="Split",
-            zip_code="21000", password="SecurePass123!",
-            confirm_password="SecurePass123!", accept_terms=True,
-        )
-        reg.submit_registration()
-        page.wait_for_url("**/index.html**", timeout=10000)
-
-        login = LoginPage(page)
-        login.open()
-        login.login(email, "SecurePass123!")
-        page.wait_for_url("**/dashboard.html**", timeout=10000)
-        page.wait_for_load_state("networkidle")
-
-        # Set tablet viewport and check for overlay
-        page.set_viewport_size(TABLET_VIEWPORT)
-        page.reload()
-        page.wait_for_load_state("networkidle")
-
-        overlay = page.locator(".tablet-hidden-card .overlay-image-dashboard")
+        overlay = journey.page.locator(".tablet-hidden-card .overlay-image-dashboard")
         overlay_visible = overlay.is_visible()
 
         assert not overlay_visible, (
@@ -275,37 +206,14 @@ class TestTabletDashboard:
 class TestMobileDashboard:
     """Test mobile viewport issues on dashboard page."""
 
-    def test_download_report_button_not_overlaid_on_mobile(self, page):
+    @pytest.mark.journey(SIGNED_IN.then(set_viewport(MOBILE_VIEWPORT)))
+    def test_download_report_button_not_overlaid_on_mobile(self, journey):
         """TC-R10: BUG - Download Report button has overlay on mobile.
 
         The .mobile-hidden-action class shows a button-overlay on mobile viewports.
         Requires authenticated access to dashboard.
         """
-        # Register and login to access dashboard
-        email = random_email()
-        reg = RegisterPage(page)
-        reg.open()
-        reg.fill_registration_form(
-            first_name="Test", last_name="User", email=email,
-            phone="0911234567", address="123 St", city="Split",
-            zip_code="21000", password="SecurePass123!",
-            confirm_password="SecurePass123!", accept_terms=True,
-        )
-        reg.submit_registration()
-        page.wait_for_url("**/index.html**", timeout=10000)
-
-        login = LoginPage(page)
-        login.open()
-        login.login(email, "SecurePass123!")
-        page.wait_for_url("**/dashboard.html**", timeout=10000)
-        page.wait_for_load_state("networkidle")
-
-        # Set mobile viewport and check for overlay
-        page.set_viewport_size(MOBILE_VIEWPORT)
-        page.reload()
-        page.wait_for_load_state("networkidle")
-
-        overlay = page.locator(".mobile-hidden-action .button-overlay")
+        overlay = journey.page.locator(".mobile-hidden-action .button-overlay")
         overlay_visible = overlay.is_visible()
 
         assert not overlay_visible, (
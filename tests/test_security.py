@@ -18,17 +18,15 @@ from utils.test_data import random_email, SQL_INJECTION, XSS_PAYLOAD
 class TestConsoleSensitiveData:
     """Test that sensitive data is not logged to browser console."""
 
-    def test_login_logs_email_to_console(self, page):
+    def test_login_logs_email_to_console(self, page, sensitive_capture):
         """TC-S01: BUG - Login process logs email to console.
 
         app.js contains: console.log('Attempting login for:', email)
         and console.log('User stored in sessionStorage:', data.user.email)
         Sensitive data should never be logged to console.
         """
-        console_messages = []
-        page.on("console", lambda msg: console_messages.append(msg.text))
-
         email = random_email()
+        sensitive_capture.watch(email)
 
         # Register
         reg = RegisterPage(page)
@@ -55,22 +53,18 @@ class TestConsoleSensitiveData:
         page.wait_for_url("**/dashboard.html**", timeout=10000)
 
         # Check if email was logged to console
-        email_logged = any(email in msg for msg in console_messages)
-        assert not email_logged, (
-            f"BUG: User email '{email}' was logged to browser console. "
-            "Console messages containing email: "
-            + str([m for m in console_messages if email in m])
+        sensitive_capture.assert_clean(
+            f"BUG: User email '{email}' was logged to browser console",
+            sources=("console",),
         )
 
-    def test_registration_logs_email_to_console(self, page):
+    def test_registration_logs_email_to_console(self, page, sensitive_capture):
         """TC-S02: BUG - Registration logs email to console.
 
         app.js contains: console.log('Attempting to register user:', email)
         """
-        console_messages = []
-        page.on("console", lambda msg: console_messages.append(msg.text))
-
         email = random_email()
+        sensitive_capture.watch(email)
         reg = RegisterPage(page)
         reg.open()
         reg.fill_registration_form(
@@ -88,9 +82,9 @@ class TestConsoleSensitiveData:
         reg.submit_registration()
         page.wait_for_url("**/index.html**", timeout=10000)
 
-        email_logged = any(email in msg for msg in console_messages)
-        assert not email_logged, (
-            f"BUG: Registration logs email '{email}' to console"
+        sensitive_capture.assert_clean(
+            f"BUG: Registration logs email '{email}' to console",
+            sources=("console",),
         )
 
 
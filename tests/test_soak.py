@@ -0,0 +1,60 @@
+"""
+Soak test for the Dashboard page (dashboard.html).
+
+Repeats a full session - log in, reload the dashboard, click every
+action button, log out - for --soak-minutes, sampling JS heap, DOM
+nodes, event listeners and web storage after a forced GC at every step
+(see plugins/soak.py). Skipped unless --soak-minutes is given:
+
+    python -m pytest tests/test_soak.py --soak-minutes 240 --app-url http://127.0.0.1:8000
+"""
+
+from functools import partial
+
+import pytest
+from pages.dashboard_page import DashboardPage
+from pages.login_page import LoginPage
+
+
+@pytest.mark.soak
+class TestDashboardSoak:
+    """Memory over many repeated dashboard sessions."""
+
+    def test_dashboard_memory_does_not_grow(self, page, registered_user, soak):
+        """TC-SK01: JS heap, DOM nodes, listeners and storage stay flat over repeated sessions.
+
+        Each cycle: log in -> reload dashboard -> click each .btn-action -> log out.
+        Steady growth of a metric from cycle to cycle is reported as a leak,
+        naming the first step after which it grows.
+        """
+        login = LoginPage(page)
+        dashboard = DashboardPage(page)
+
+        def log_in():
+            login.open()
+            login.login(registered_user["email"], registered_user["password"])
+            page.wait_for_url("**/dashboard.html**", timeout=10000)
+
+        def reload_dashboard():
+            page.reload(wait_until="networkidle")
+
+        def log_out():
+            dashboard.click_logout()
+            page.wait_for_url("**/index.html**", timeout=10000)
+
+        # One session to find the action buttons
+        log_in()
+        buttons = page.locator(DashboardPage.ACTION_BUTTONS).all_inner_texts()
+        log_out()
+
+        steps = [
+            ("log in", log_in),
+            ("reload dashboard", reload_dashboard),
+            *((f"click {name.strip()}", partial(dashboard.click_action_button, index))
+              for index, name in enumerate(buttons)),
+            ("log out", log_out),
+        ]
+        result = soak.run(page, steps)
+
+        assert result.cycles, f"No soak cycle completed: {result.failed[-1:]}"
+        assert not result.leaks, f"Memory grows over repeated sessions: {result.describe()}"
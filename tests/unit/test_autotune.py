@@ -0,0 +1,107 @@
+"""
+Unit tests for the --tabs auto concurrency tuner (plugins/autotune.py).
+
+The tuner gets a fake clock and resource sampler, so each window's
+throughput, CPU and memory are set by the test.
+"""
+
+from plugins.autotune import WINDOW_TESTS_PER_TAB, ConcurrencyTuner
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Sampler:
+    """Reports `cpu` and `memory` until the test changes them."""
+
+    def __init__(self):
+        self.cpu_share = 0.5
+        self.memory = 0.5
+
+    def cpu(self) -> float:
+        return self.cpu_share
+
+    def memory_available(self) -> float:
+        return self.memory
+
+
+def tuner(total: int = 1000, max_level: int = 8):
+    clock, sampler = Clock(), Sampler()
+    return ConcurrencyTuner(total, max_level, sampler=sampler, clock=clock), clock, sampler
+
+
+def run_window(tuner, clock, seconds: float, failures: int = 0) -> int:
+    """Finish one window's tests at the current level, spread over `seconds`."""
+    tests = WINDOW_TESTS_PER_TAB * tuner.level
+    start = clock.now
+    for i in range(tests):
+        clock.now = start + seconds * (i + 1) / tests
+        level = tuner.record(1.0, i < failures)
+    return level
+
+
+class TestClimb:
+    """The level goes up while throughput improves."""
+
+    def test_climbs_one_tab_per_window(self):
+        t, clock, _ = tuner()
+        assert t.level == 2
+        assert run_window(t, clock, 4) == 3
+        assert run_window(t, clock, 3) == 4
+        assert [w.decision for w in t.windows] == ["up", "up"]
+        assert not t.settled
+
+    def test_stops_at_maximum(self):
+        t, clock, _ = tuner(max_level=3)
+        run_window(t, clock, 4)
+        assert run_window(t, clock, 3) == 3
+        assert t.settled and t.windows[-1].decision == "hold: maximum"
+
+
+class TestHold:
+    """Without a gain the best level so far is kept."""
+
+    def test_no_gain_keeps_best_level(self):
+        t, clock, _ = tuner()
+        run_window(t, clock, 2.5)
+        assert run_window(t, clock, 3.75) == 2
+        assert t.settled and t.windows[-1].decision == "hold: no gain"
+
+    def test_settles_after_tuning_share(self):
+        t, clock, _ = tuner(total=8)
+        assert run_window(t, clock, 4) == 2
+        assert t.settled and t.reason == "tuning budget used"
+
+
+class TestBackOff:
+    """CPU, memory or failures push the level down."""
+
+    def test_cpu_overload_steps_down(self):
+        t, clock, sampler = tuner()
+        run_window(t, clock, 4)
+        sampler.cpu_share = 0.95
+        assert run_window(t, clock, 3) == 2
+        assert t.windows[-1].decision == "down: CPU 95%"
+        assert t.settled
+
+    def test_failures_step_down(self):
+        t, clock, _ = tuner()
+        run_window(t, clock, 4)
+        assert run_window(t, clock, 3, failures=3) == 2
+        assert t.windows[-1].decision.startswith("down: failure rate")
+
+    def test_overloaded_window_is_never_best(self):
+        t, clock, sampler = tuner()
+        sampler.memory = 0.05
+        # High throughput, but out of memory at 2 tabs
+        assert run_window(t, clock, 2.5) == 1
+        assert t.windows[-1].decision == "down: memory 5% available"
+        sampler.memory = 0.5
+        assert run_window(t, clock, 4) == 1
+        assert t.windows[-1].decision == "hold: throughput fell"
+        assert t.best() is t.windows[-1]
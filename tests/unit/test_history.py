@@ -0,0 +1,104 @@
+"""
+Unit tests for the test history store and its flakiness math (plugins/history.py).
+"""
+
+import pytest
+from plugins.history import HistoryStore, failure_rate, final_outcome, flakiness_score
+
+
+class Report:
+    """Stand-in for a TestReport: phase and outcome."""
+
+    def __init__(self, when: str, outcome: str):
+        self.when = when
+        self.outcome = outcome
+        self.failed = outcome == "failed"
+        self.skipped = outcome == "skipped"
+
+
+def result(nodeid: str, outcome: str, duration: float = 1.0) -> dict:
+    return {"nodeid": nodeid, "outcome": outcome, "duration": duration,
+            "category": "Login", "bug_id": None, "retries": 0}
+
+
+class TestFlakinessScore:
+    """Share of consecutive runs whose outcome flipped."""
+
+    def test_stable_outcomes(self):
+        assert flakiness_score(["passed"] * 5) == 0.0
+        assert flakiness_score(["failed"] * 5) == 0.0
+
+    def test_alternating_outcomes(self):
+        assert flakiness_score(["passed", "failed", "passed", "failed"]) == 1.0
+
+    def test_one_flip(self):
+        assert flakiness_score(["passed", "passed", "failed"]) == 0.5
+
+    def test_skipped_runs_are_ignored(self):
+        assert flakiness_score(["passed", "skipped", "passed"]) == 0.0
+
+    def test_error_counts_as_failure(self):
+        assert flakiness_score(["failed", "error"]) == 0.0
+
+    def test_too_few_runs(self):
+        assert flakiness_score([]) == 0.0
+        assert flakiness_score(["failed"]) == 0.0
+
+
+class TestFailureRate:
+    """Share of failed or errored runs."""
+
+    def test_mixed(self):
+        assert failure_rate(["passed", "failed", "error", "passed"]) == 0.5
+
+    def test_skipped_runs_are_ignored(self):
+        assert failure_rate(["skipped", "failed"]) == 1.0
+        assert failure_rate(["skipped"]) == 0.0
+
+
+class TestFinalOutcome:
+    """Collapsing setup/call/teardown into one outcome."""
+
+    def test_passed(self):
+        phases = [Report("setup", "passed"), Report("call", "passed"), Report("teardown", "passed")]
+        assert final_outcome(phases) == "passed"
+
+    def test_teardown_failure_is_an_error(self):
+        phases = [Report("setup", "passed"), Report("call", "passed"), Report("teardown", "failed")]
+        assert final_outcome(phases) == "error"
+
+    def test_rerun_reports_are_skipped_over(self):
+        phases = [Report("call", "rerun"), Report("call", "passed")]
+        assert final_outcome(phases) == "passed"
+
+    def test_skipped_in_setup(self):
+        assert final_outcome([Report("setup", "skipped")]) == "skipped"
+
+
+class TestHistoryStore:
+    """Window queries and eviction on a scratch database."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = HistoryStore(str(tmp_path / "history.sqlite"), max_runs=3)
+        yield store
+        store.close()
+
+    def record_runs(self, store, outcomes: list[str]):
+        for outcome in outcomes:
+            store.record(store.start_run({}), [result("t", outcome)])
+
+    def test_flakiness_over_window(self, store):
+        self.record_runs(store, ["passed", "passed", "failed", "passed"])
+        assert store.flakiness(window=20) == {"t": 2 / 3}
+        assert store.flakiness(window=2) == {"t": 1.0}
+
+    def test_recent_is_oldest_first(self, store):
+        for duration in (1.0, 2.0, 3.0):
+            store.record(store.start_run({}), [result("t", "passed", duration)])
+        assert [d for _, d in store.recent()["t"]] == [1.0, 2.0, 3.0]
+
+    def test_evict_keeps_newest_runs(self, store):
+        self.record_runs(store, ["failed", "passed", "passed", "passed"])
+        store.evict()
+        assert store.failure_rates() == {"t": 0.0}
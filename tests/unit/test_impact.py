@@ -0,0 +1,110 @@
+"""
+Unit tests for diff parsing and affected test selection (plugins/impact.py).
+"""
+
+import textwrap
+
+import pytest
+from plugins.impact import SourceModel, affected_tests, changed_lines, changed_symbols
+
+PAGE = textwrap.dedent("""\
+    class DemoPage:
+        TITLE = "#title"
+
+        def open(self):
+            pass
+
+        def title(self):
+            return self.TITLE
+""")
+
+TESTS = textwrap.dedent("""\
+    class TestDemo:
+        def test_open(self):
+            pass
+
+        def test_title(self):
+            pass
+""")
+
+INDEX = {"tests": {
+    "tests/test_demo.py::TestDemo::test_open": ["pages/demo_page.py:DemoPage.open"],
+    "tests/test_demo.py::TestDemo::test_title": [
+        "pages/demo_page.py:DemoPage.title", "pages/demo_page.py:DemoPage.TITLE",
+    ],
+}}
+
+
+def diff(path: str, hunk: str, new: str | None = None) -> str:
+    """A one-hunk git diff of `path`; `new="/dev/null"` deletes it."""
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ {new or 'b/' + path}\n{hunk}\n"
+
+
+@pytest.fixture(scope="module")
+def model(tmp_path_factory):
+    root = tmp_path_factory.mktemp("project")
+    (root / "pages").mkdir()
+    (root / "tests").mkdir()
+    (root / "pages" / "demo_page.py").write_text(PAGE)
+    (root / "tests" / "test_demo.py").write_text(TESTS)
+    return SourceModel(root)
+
+
+class TestChangedLines:
+    """New-side line numbers from unified diff hunks."""
+
+    def test_hunk_range(self):
+        assert changed_lines(diff("pages/demo_page.py", "@@ -7,2 +7,3 @@")) == {"pages/demo_page.py": {7, 8, 9}}
+
+    def test_single_line_hunk(self):
+        assert changed_lines(diff("a.py", "@@ -3 +3 @@")) == {"a.py": {3}}
+
+    def test_pure_deletion_touches_its_position(self):
+        assert changed_lines(diff("a.py", "@@ -4,2 +3,0 @@")) == {"a.py": {3}}
+
+    def test_deleted_file(self):
+        assert changed_lines(diff("a.py", "@@ -1,3 +0,0 @@", new="/dev/null")) == {"a.py": None}
+
+    def test_several_files(self):
+        both = diff("a.py", "@@ -1 +1 @@") + diff("b.py", "@@ -5,0 +6,2 @@")
+        assert changed_lines(both) == {"a.py": {1}, "b.py": {6, 7}}
+
+
+class TestChangedSymbols:
+    """Changed lines mapped to the symbols that contain them."""
+
+    def test_member(self, model):
+        changed, everything = changed_symbols(model, diff("pages/demo_page.py", "@@ -2 +2 @@"))
+        assert changed == {"pages/demo_page.py:DemoPage.TITLE"} and everything is None
+
+    def test_ignored_files(self, model):
+        changed, everything = changed_symbols(model, diff("docs/test_report.md", "@@ -1 +1 @@"))
+        assert changed == set() and everything is None
+
+    def test_other_python_file_selects_everything(self, model):
+        _, everything = changed_symbols(model, diff("plugins/history.py", "@@ -1 +1 @@"))
+        assert everything == "plugins/history.py changed"
+
+    def test_deleted_file(self, model):
+        changed, _ = changed_symbols(model, diff("pages/demo_page.py", "@@ -1,8 +0,0 @@", new="/dev/null"))
+        assert changed == {"pages/demo_page.py:*"}
+
+
+class TestAffectedTests:
+    """Index lookup of the tests using a changed symbol."""
+
+    def test_only_users_of_the_symbol(self, model):
+        selected, _ = affected_tests(INDEX, model, diff("pages/demo_page.py", "@@ -4,2 +4,2 @@"))
+        assert selected == ["tests/test_demo.py::TestDemo::test_open"]
+
+    def test_deleted_file_affects_all_its_users(self, model):
+        selected, _ = affected_tests(INDEX, model, diff("pages/demo_page.py", "@@ -1,8 +0,0 @@", new="/dev/null"))
+        assert selected == sorted(INDEX["tests"])
+
+    def test_tests_missing_from_the_index_are_selected(self, model):
+        index = {"tests": {"tests/test_demo.py::TestDemo::test_open": ["pages/demo_page.py:DemoPage.open"]}}
+        selected, _ = affected_tests(index, model, diff("docs/test_report.md", "@@ -1 +1 @@"))
+        assert selected == ["tests/test_demo.py::TestDemo::test_title"]
+
+    def test_empty_index_selects_everything(self, model):
+        assert affected_tests({"tests": {}}, model, "") == (None, "no impact index recorded yet")
@@ -0,0 +1,113 @@
+"""
+Unit tests for the run journal and --resume (plugins/journal.py).
+"""
+
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+from plugins.journal import Journal, RunJournal, read_journal
+
+
+class Item:
+    """Stand-in for a collected item: just the node id."""
+
+    def __init__(self, nodeid: str):
+        self.nodeid = nodeid
+
+
+def make_config(path, resume: bool = False, seed: int | None = None):
+    return SimpleNamespace(option=SimpleNamespace(journal=str(path), resume=resume, seed=seed))
+
+
+def session(attempt: int, seed: int, order: list[str]) -> dict:
+    return {"type": "session", "attempt": attempt, "seed": seed, "order": order}
+
+
+def result(attempt: int, nodeid: str, outcome: str = "passed") -> dict:
+    return {"type": "result", "attempt": attempt, "nodeid": nodeid,
+            "outcome": outcome, "duration": 1.0, "longrepr": None}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "journal.jsonl"
+
+
+def write_records(path, records: list[dict]):
+    journal = Journal(str(path), truncate=True)
+    for record in records:
+        journal.write(record)
+    journal.close()
+
+
+class TestReadJournal:
+    """Reading back records written before a crash."""
+
+    def test_missing_file(self, path):
+        assert read_journal(str(path)) == []
+
+    def test_round_trip(self, path):
+        records = [session(1, 7, ["a", "b"]), result(1, "a")]
+        write_records(path, records)
+        assert read_journal(str(path)) == records
+
+    def test_torn_last_line_is_ignored(self, path):
+        write_records(path, [session(1, 7, ["a"]), result(1, "a")])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result(1, "b"))[:20])
+        assert [r["type"] for r in read_journal(str(path))] == ["session", "result"]
+
+
+class TestResume:
+    """State a resumed run takes over from the journal."""
+
+    def test_fresh_run_truncates(self, path):
+        write_records(path, [session(1, 7, ["a"]), result(1, "a")])
+        journal = RunJournal(make_config(path, seed=3))
+        journal.journal.close()
+        assert journal.attempt == 1 and journal.seed == 3
+        assert read_journal(str(path)) == []
+
+    def test_resume_takes_order_seed_and_results(self, path):
+        write_records(path, [session(1, 7, ["a", "b", "c"]), result(1, "a"), result(1, "b", "failed")])
+        journal = RunJournal(make_config(path, resume=True))
+        journal.journal.close()
+        assert journal.attempt == 2
+        assert journal.seed == 7
+        assert journal.order == ["a", "b", "c"]
+        assert journal.replays(Item("a")) and journal.replays(Item("b"))
+        assert not journal.replays(Item("c"))
+
+    def test_later_attempts_are_counted(self, path):
+        write_records(path, [session(1, 7, ["a", "b"]), result(1, "a"), session(2, 7, ["a", "b"])])
+        journal = RunJournal(make_config(path, resume=True))
+        journal.journal.close()
+        assert journal.attempt == 3
+        assert list(journal.completed) == ["a"]
+
+
+class TestSeeding:
+    """Per-test data seed."""
+
+    def draw(self, journal: RunJournal, nodeid: str) -> float:
+        journal.pytest_runtest_setup(Item(nodeid))
+        return random.random()
+
+    def test_same_seed_same_data(self, path):
+        first = RunJournal(make_config(path, seed=7))
+        second = RunJournal(make_config(path, seed=7))
+        first.journal.close()
+        second.journal.close()
+        assert self.draw(first, "a") == self.draw(second, "a")
+        assert self.draw(first, "a") != self.draw(first, "b")
+
+    def test_resumed_attempt_gets_fresh_data(self, path):
+        fresh = RunJournal(make_config(path, seed=7))
+        fresh.journal.close()
+        before = self.draw(fresh, "b")
+        write_records(path, [session(1, 7, ["a", "b"]), result(1, "a")])
+        resumed = RunJournal(make_config(path, resume=True))
+        resumed.journal.close()
+        assert self.draw(resumed, "b") != before
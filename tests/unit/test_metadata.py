@@ -0,0 +1,68 @@
+"""
+Unit tests for the test metadata lookups (plugins/metadata.py).
+
+Every BUG id in the test case tables of docs/test_report.md has to
+resolve from the test that case names, so the history, the report and
+--time-budget see which bugs a test covers.
+"""
+
+import importlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from plugins.metadata import TC_ID_PATTERN, case_bug_ids, item_bug_id
+
+TESTS = Path(__file__).resolve().parent.parent
+
+
+class Case:
+    """Stand-in for a collected item: the function and its parameter index."""
+
+    def __init__(self, function, index: int | None = None):
+        self.function = function
+        self.markers = getattr(function, "pytestmark", [])
+        params = [mark.args[0] for mark in self.markers if mark.name == "parametrize"]
+        self.callspec = SimpleNamespace(indices={params[0]: index}) if index is not None else None
+
+    def iter_markers(self, name: str):
+        return [mark for mark in self.markers if mark.name == name]
+
+
+def functions_by_case() -> dict:
+    """{TC id: test function} of the browser and API test modules."""
+    functions = {}
+    for path in sorted(TESTS.glob("test_*.py")):
+        module = importlib.import_module(f"tests.{path.stem}")
+        for cls in vars(module).values():
+            if not (isinstance(cls, type) and cls.__name__.startswith("Test")):
+                continue
+            for name, function in vars(cls).items():
+                tc_match = TC_ID_PATTERN.match((function.__doc__ or "").strip()) if name.startswith("test") else None
+                if tc_match:
+                    functions[tc_match.group(0)] = function
+    return functions
+
+
+class TestBugIds:
+    """BUG ids come from the TC tables of docs/test_report.md."""
+
+    def test_documented_bugs_resolve(self):
+        functions = functions_by_case()
+        bugs = case_bug_ids()
+        assert bugs, "No BUG ids found in docs/test_report.md"
+        for tc_id, bug_id in bugs.items():
+            case = TC_ID_PATTERN.match(tc_id).group(0)
+            assert case in functions, f"{tc_id} ({bug_id}) names no test"
+            letter = tc_id[len(case):]
+            index = ord(letter) - ord("a") if letter else None
+            assert item_bug_id(Case(functions[case], index)) == bug_id, tc_id
+
+    @pytest.mark.parametrize("tc_id, index, bug_id", [
+        ("TC-FP02", None, "BUG-012"),
+        ("TC-004", 4, "BUG-001"),
+        ("TC-004", 0, ""),
+        ("TC-L01", None, ""),
+    ])
+    def test_bug_id_of_case(self, tc_id, index, bug_id):
+        assert item_bug_id(Case(functions_by_case()[tc_id], index)) == bug_id
@@ -0,0 +1,59 @@
+"""
+Unit tests for screenshot deduplication and recompression (plugins/screenshots.py).
+"""
+
+import struct
+import zlib
+
+import pytest
+from plugins.screenshots import ScreenshotStore, pixel_digest, recompress_png
+
+
+def png(rows: list[bytes], level: int = 1) -> bytes:
+    """A grayscale 8-bit PNG with the given pixel rows, deflated at `level`."""
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+    header = struct.pack(">IIBBBBB", len(rows[0]), len(rows), 8, 0, 0, 0, 0)
+    image = zlib.compress(b"".join(b"\0" + row for row in rows), level)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", image) + chunk(b"IEND", b"")
+
+
+BLANK = png([b"\xff" * 64] * 64)
+DOT = png([b"\xff" * 64] * 63 + [b"\xff" * 63 + b"\0"])
+
+
+class TestPixelDigest:
+    """Digest of the decoded image, independent of the encoding."""
+
+    def test_recompression_keeps_the_digest(self):
+        recompressed = recompress_png(BLANK)
+        assert recompressed != BLANK
+        assert pixel_digest(recompressed) == pixel_digest(BLANK)
+
+    def test_one_pixel_changes_the_digest(self):
+        assert pixel_digest(DOT) != pixel_digest(BLANK)
+
+
+class TestScreenshotStore:
+    """Storing each distinct screenshot once, across runs."""
+
+    @pytest.fixture
+    def directory(self, tmp_path):
+        return str(tmp_path / "screenshots")
+
+    def test_identical_pixels_are_reused(self, directory):
+        store = ScreenshotStore(directory)
+        first = store.add(BLANK)
+        assert store.add(png([b"\xff" * 64] * 64, level=6)) == first
+        assert store.add(DOT) != first
+        store.close()
+        assert (store.stored, store.reused) == (2, 1)
+
+    def test_index_survives_runs(self, directory):
+        store = ScreenshotStore(directory)
+        name = store.add(BLANK)
+        store.close()
+        again = ScreenshotStore(directory)
+        assert again.add(BLANK) == name and again.reused == 1
+        again.close()
@@ -0,0 +1,116 @@
+"""
+Unit tests for time-budgeted test selection (plugins/selection.py).
+"""
+
+import pytest
+from plugins.selection import (
+    BUG_COVERAGE_VALUE,
+    UNKNOWN_FAILURE_PROBABILITY,
+    Candidate,
+    failure_probability,
+    parse_budget,
+    select,
+)
+
+
+class Item:
+    """Stand-in for a collected item: node id, file and docstring."""
+
+    def __init__(self, nodeid: str, doc: str = ""):
+        self.nodeid = nodeid
+        self.location = (nodeid.split("::")[0], 0, nodeid)
+
+        def function():
+            pass
+
+        function.__doc__ = doc
+        self.function = function
+
+    def iter_markers(self, name: str):
+        return []
+
+
+PASSED = [("passed", 2.0)] * 5
+
+
+def selected_ids(selected) -> list[str]:
+    return [c.item.nodeid for c in selected]
+
+
+class TestParseBudget:
+    """--time-budget accepts seconds, minutes and hours."""
+
+    @pytest.mark.parametrize("value, seconds", [
+        ("90", 90), ("60s", 60), ("2m", 120), ("1m30s", 90), ("1h", 3600), ("1.5m", 90),
+    ])
+    def test_valid(self, value, seconds):
+        assert parse_budget(value) == seconds
+
+    @pytest.mark.parametrize("value", ["", "soon", "1d", "m5"])
+    def test_invalid(self, value):
+        with pytest.raises(pytest.UsageError):
+            parse_budget(value)
+
+
+class TestFailureProbability:
+    """Recency-weighted failure rate of a test's history."""
+
+    def test_no_history(self):
+        assert failure_probability([]) == UNKNOWN_FAILURE_PROBABILITY
+        assert failure_probability(["skipped"]) == UNKNOWN_FAILURE_PROBABILITY
+
+    def test_recent_failure_weighs_more(self):
+        assert failure_probability(["passed", "failed"]) == pytest.approx(1 / 1.8)
+        assert failure_probability(["failed", "passed"]) == pytest.approx(0.8 / 1.8)
+
+    def test_skips_ignored(self):
+        assert failure_probability(["failed", "skipped"]) == 1.0
+
+
+class TestBugCoverage:
+    """Covering a BUG id not yet selected adds value."""
+
+    def test_documented_case_has_bug_id(self):
+        c = Candidate(0, Item("tests/test_forgot_password.py::T::a", "TC-FP02: Fake success."), PASSED)
+        assert c.bug_id == "BUG-012"
+        assert c.value(set(), {c.category}) == pytest.approx(c.value({"BUG-012"}, {c.category}) + BUG_COVERAGE_VALUE)
+
+    def test_budget_prefers_uncovered_bug(self):
+        items = [
+            Item("tests/test_forgot_password.py::T::plain", "TC-FP01: Valid email."),
+            Item("tests/test_forgot_password.py::T::bug", "TC-FP02: Fake success."),
+        ]
+        selected, skipped, estimate = select(items, {item.nodeid: PASSED for item in items}, budget=3)
+        assert selected_ids(selected) == ["tests/test_forgot_password.py::T::bug"]
+        assert selected_ids(skipped) == ["tests/test_forgot_password.py::T::plain"]
+        assert estimate == 2.0
+
+    def test_second_test_of_a_bug_is_worth_less(self):
+        items = [
+            Item("tests/test_security.py::T::s1", "TC-S01: Logs email."),
+            Item("tests/test_security.py::T::s2", "TC-S02: Logs email."),
+            Item("tests/test_security.py::T::s3", "TC-S03: Session storage."),
+        ]
+        selected, _, _ = select(items, {item.nodeid: PASSED for item in items}, budget=4)
+        assert selected_ids(selected) == ["tests/test_security.py::T::s1", "tests/test_security.py::T::s3"]
+
+
+class TestSelect:
+    """Greedy selection within the budget."""
+
+    def test_previously_failed_first(self):
+        items = [Item("tests/test_login.py::T::a"), Item("tests/test_login.py::T::b")]
+        history = {"tests/test_login.py::T::a": PASSED, "tests/test_login.py::T::b": PASSED[:-1] + [("failed", 2.0)]}
+        selected, _, _ = select(items, history, budget=10)
+        assert selected_ids(selected) == ["tests/test_login.py::T::b", "tests/test_login.py::T::a"]
+
+    def test_stays_within_budget(self):
+        items = [Item(f"tests/test_api.py::T::t{i}") for i in range(10)]
+        selected, skipped, estimate = select(items, {item.nodeid: PASSED for item in items}, budget=7)
+        assert len(selected) == 3 and len(skipped) == 7
+        assert estimate <= 7
+
+    def test_unknown_tests_get_median_duration(self):
+        items = [Item("tests/test_api.py::T::known"), Item("tests/test_api.py::T::new")]
+        selected, _, _ = select(items, {"tests/test_api.py::T::known": [("passed", 4.0)] * 3}, budget=100)
+        assert [c.duration for c in selected] == [4.0, 4.0]
@@ -0,0 +1,57 @@
+"""
+Unit tests for duration-balanced sharding (plugins/shard.py).
+"""
+
+import argparse
+
+import pytest
+from plugins.selection import DEFAULT_DURATION
+from plugins.shard import expected_durations, parse_shard, split
+
+
+class TestParseShard:
+    """`--shard i/n` values."""
+
+    def test_valid(self):
+        assert parse_shard("2/3") == (2, 3)
+
+    @pytest.mark.parametrize("value", ["3", "a/3", "0/3", "4/3"])
+    def test_invalid(self, value):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
+
+
+class TestExpectedDurations:
+    """Median history durations, with the median of medians as fallback."""
+
+    def test_median_of_history(self):
+        history = {"a": [("passed", 1.0), ("passed", 9.0), ("failed", 2.0)]}
+        assert expected_durations(["a"], history) == {"a": 2.0}
+
+    def test_unknown_test_gets_median_of_known(self):
+        history = {"a": [("passed", 1.0)], "b": [("passed", 3.0)], "c": [("passed", 8.0)]}
+        assert expected_durations(["a", "b", "c", "new"], history)["new"] == 3.0
+
+    def test_no_history_at_all(self):
+        assert expected_durations(["a", "b"], {}) == {"a": DEFAULT_DURATION, "b": DEFAULT_DURATION}
+
+
+class TestSplit:
+    """Longest-first greedy split."""
+
+    def test_balances_by_duration_not_count(self):
+        shards = split({"long": 10.0, "a": 4.0, "b": 3.0, "c": 3.0}, 2)
+        assert shards == [["long"], ["a", "b", "c"]]
+
+    def test_every_test_lands_on_exactly_one_shard(self):
+        durations = {f"t{i}": float(i % 7 + 1) for i in range(40)}
+        shards = split(durations, 3)
+        assert sorted(n for shard in shards for n in shard) == sorted(durations)
+
+    def test_ties_are_broken_by_node_id(self):
+        durations = {"b": 1.0, "a": 1.0, "d": 1.0, "c": 1.0}
+        assert split(durations, 2) == [["a", "c"], ["b", "d"]]
+        assert split(dict(reversed(durations.items())), 2) == split(durations, 2)
+
+    def test_more_shards_than_tests(self):
+        assert split({"a": 1.0}, 3) == [["a"], [], []]
@@ -0,0 +1,79 @@
+"""
+Unit tests for operation keys and learned timeouts (plugins/timeouts.py).
+"""
+
+import re
+
+import pytest
+from plugins.timeouts import (
+    MAX_TIMEOUT_MS,
+    MIN_SAMPLES,
+    MIN_TIMEOUT_MS,
+    TimeoutManager,
+    operation_key,
+    p99,
+)
+
+
+class TestOperationKey:
+    """Method name plus wait target."""
+
+    @pytest.mark.parametrize("name, args, kwargs, expected", [
+        ("wait_for_url", ("**/dashboard.html**",), {}, "wait_for_url **/dashboard.html**"),
+        ("goto", (), {"url": "http://localhost/"}, "goto http://localhost/"),
+        ("wait_for_selector", ("#loginMessage",), {"state": "visible"}, "wait_for_selector #loginMessage (visible)"),
+        ("wait_for_selector", ("#loginMessage",), {}, "wait_for_selector #loginMessage"),
+        ("wait_for_load_state", (), {}, "wait_for_load_state load"),
+        ("wait_for_load_state", ("networkidle",), {}, "wait_for_load_state networkidle"),
+        ("wait_for_url", (re.compile(r".*/index\.html"),), {}, r"wait_for_url .*/index\.html"),
+    ])
+    def test_key(self, name, args, kwargs, expected):
+        assert operation_key(name, args, kwargs) == expected
+
+    def test_callable_target_uses_its_name(self):
+        def on_dashboard(url):
+            return "dashboard" in url
+
+        assert operation_key("wait_for_url", (on_dashboard,), {}) == "wait_for_url on_dashboard"
+
+
+class TestP99:
+    """Inclusive 99th percentile."""
+
+    def test_uniform(self):
+        assert p99([float(i) for i in range(101)]) == pytest.approx(99.0)
+
+    def test_outlier_dominates_small_samples(self):
+        assert p99([1.0] * 19 + [10.0]) > 5.0
+
+
+class TestTimeout:
+    """Learned timeout: multiplier x p99, clamped."""
+
+    def test_unlearned_operation_keeps_coded_timeout(self):
+        manager = TimeoutManager({"goto a": [1.0] * (MIN_SAMPLES - 1)}, multiplier=3.0)
+        assert manager.timeout("goto a") is None
+        assert manager.timeout("goto b") is None
+
+    def test_multiplier_times_p99(self):
+        manager = TimeoutManager({"goto a": [2.0] * MIN_SAMPLES}, multiplier=3.0)
+        assert manager.timeout("goto a") == pytest.approx(6000)
+
+    def test_clamped(self):
+        manager = TimeoutManager({"fast": [0.01] * MIN_SAMPLES, "slow": [100.0] * MIN_SAMPLES}, multiplier=3.0)
+        assert manager.timeout("fast") == MIN_TIMEOUT_MS
+        assert manager.timeout("slow") == MAX_TIMEOUT_MS
+
+    def test_learned_timeout_replaces_coded_one(self):
+        manager = TimeoutManager({"wait_for_url **/x**": [2.0] * MIN_SAMPLES}, multiplier=3.0)
+        kwargs = {"timeout": 10000}
+        manager._before("wait_for_url", ("**/x**",), kwargs)
+        assert kwargs["timeout"] == pytest.approx(6000)
+
+    def test_device_scope_scales_coded_timeout(self):
+        manager = TimeoutManager({"wait_for_url **/x**": [2.0] * MIN_SAMPLES}, multiplier=3.0)
+        manager.scope, manager.scale = "slow-phone", 3.3
+        kwargs = {"timeout": 10000}
+        operation, timeout = manager._before("wait_for_url", ("**/x**",), kwargs)
+        assert operation == "[slow-phone] wait_for_url **/x**"
+        assert timeout is None and kwargs["timeout"] == pytest.approx(33000)